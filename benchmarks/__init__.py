@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Reproducible decoder and service benchmarks (not shipped with the package).
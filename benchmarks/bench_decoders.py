@@ -0,0 +1,164 @@
+# benchmarks/bench_decoders.py
+# comments in English only
+# Throughput, latency, memory and success rate of the core decoders per scale ladder.
+#
+# Usage:
+#   python -m benchmarks.bench_decoders --preset small --out .bench/decoders.json
+#   python -m benchmarks.bench_decoders --ladders "1.5,3,5;3.5,5;2" --repeat 3 --baseline old.json
+#
+# Every (decoder, ladder) variant runs in a fresh process, so peak RSS belongs
+# to that variant alone. Files are read into memory first; timings cover
+# extract_from_bytes only.
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks import corpus
+from benchmarks.stats import environment, pct_change, peak_rss_mb, percentile
+
+DEFAULT_LADDERS = "1.5,3,5;3.5,5;2"
+
+
+def _parse_ladders(raw: str) -> List[tuple[float, ...]]:
+    return [tuple(float(x) for x in part.split(",") if x.strip()) for part in raw.split(";") if part.strip()]
+
+
+def run_variant(kind: str, ladder: tuple[float, ...], corpus_dir: str, items: List[dict],
+                repeat: int, settings: Dict[str, object]) -> dict:
+    """Pool job: decode every item `repeat` times with one decoder and one ladder."""
+    from qrparser.core import DecodeSettings, PdfBarcodeDecoder
+    from qrparser.core.image_decoder import ImageBarcodeDecoder
+
+    decode_settings = DecodeSettings(scales=ladder, **settings)
+    decoder = PdfBarcodeDecoder(decode_settings) if kind == "pdf" else ImageBarcodeDecoder(decode_settings)
+    docs = [(Path(corpus_dir, i["path"]).read_bytes(), i) for i in items]
+    rss_before = peak_rss_mb()
+    if docs:
+        decoder.extract_from_bytes(docs[0][0])  # warm-up: imports, pdfium init, zxing tables
+
+    latencies: list[float] = []
+    pages = hits = expected = 0
+    ok_docs = 0
+    t_start = time.perf_counter()
+    for _ in range(repeat):
+        for data, item in docs:
+            t0 = time.perf_counter()
+            try:
+                codes = decoder.extract_from_bytes(data)
+            except Exception:
+                codes = []
+            latencies.append((time.perf_counter() - t0) * 1000)
+            pages += item["pages"]
+            want = set(item["expected"])
+            got = set(codes)
+            hits += len(want & got)
+            expected += len(want)
+            ok_docs += int(got == want)
+    wall = time.perf_counter() - t_start
+
+    return {
+        "decoder": kind,
+        "ladder": list(ladder),
+        "docs": len(latencies),
+        "pages": pages,
+        "wall_s": round(wall, 3),
+        "pages_per_sec": round(pages / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "max_ms": round(max(latencies, default=0.0), 2),
+        # codes found / codes expected, and documents decoded exactly (no misses, no extras)
+        "code_recall": round(hits / expected, 4) if expected else 1.0,
+        "doc_success_rate": round(ok_docs / len(latencies), 4) if latencies else 0.0,
+        "rss_before_mb": rss_before,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run(corpus_dir: Path, spec: corpus.CorpusSpec, ladders: List[tuple[float, ...]], repeat: int,
+        decoders: List[str], settings: Dict[str, object]) -> dict:
+    items = corpus.ensure(corpus_dir, spec)
+    by_kind = {
+        "pdf": [asdict(i) for i in items if i.mime == "application/pdf"],
+        "image": [asdict(i) for i in items if i.mime != "application/pdf"],
+    }
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    for kind in decoders:
+        for ladder in ladders:
+            # a fresh process per variant keeps peak RSS attributable
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+                res = ex.submit(run_variant, kind, ladder, str(corpus_dir), by_kind[kind], repeat, settings).result()
+            results.append(res)
+            print(
+                f"{kind:5s} ladder={','.join(map(str, ladder)):12s} "
+                f"pages/s={res['pages_per_sec']:8.2f} p50={res['p50_ms']:8.2f}ms p95={res['p95_ms']:8.2f}ms "
+                f"rss={res['peak_rss_mb']}MB recall={res['code_recall']:.3f}"
+            )
+    return {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": environment(),
+        "corpus": asdict(spec),
+        "repeat": repeat,
+        "settings": settings,
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> List[dict]:
+    """Per-variant relative changes of the headline numbers (positive = larger)."""
+    def key(r: dict) -> tuple:
+        return r["decoder"], tuple(r["ladder"])
+
+    old = {key(r): r for r in baseline.get("results", [])}
+    rows = []
+    for r in current["results"]:
+        b = old.get(key(r))
+        if b is None:
+            continue
+        rows.append({
+            "decoder": r["decoder"],
+            "ladder": r["ladder"],
+            "pages_per_sec_pct": pct_change(r["pages_per_sec"], b["pages_per_sec"]),
+            "p95_ms_pct": pct_change(r["p95_ms"], b["p95_ms"]),
+            "peak_rss_mb_pct": pct_change(r["peak_rss_mb"] or 0, b["peak_rss_mb"] or 0),
+            "code_recall_delta": round(r["code_recall"] - b["code_recall"], 4),
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Benchmark PdfBarcodeDecoder and ImageBarcodeDecoder")
+    ap.add_argument("--corpus", type=Path, default=Path(".bench/corpus"), help="Corpus directory (generated if needed)")
+    ap.add_argument("--preset", choices=sorted(corpus.PRESETS), default="small")
+    ap.add_argument("--ladders", default=DEFAULT_LADDERS, help="';'-separated scale ladders, e.g. '1.5,3,5;2'")
+    ap.add_argument("--decoders", default="pdf,image", help="Subset of pdf,image")
+    ap.add_argument("--repeat", type=int, default=1, help="Passes over the corpus per variant")
+    ap.add_argument("--no-embedded", action="store_true", help="Always render PDF pages (embedded_images=False)")
+    ap.add_argument("--rgb", action="store_true", help="Decode RGB instead of grayscale")
+    ap.add_argument("--out", type=Path, default=Path(".bench/decoders.json"))
+    ap.add_argument("--baseline", type=Path, default=None, help="Earlier result file to compare with")
+    args = ap.parse_args(argv)
+
+    settings: Dict[str, object] = {"embedded_images": not args.no_embedded, "grayscale": not args.rgb}
+    report = run(
+        args.corpus, corpus.PRESETS[args.preset], _parse_ladders(args.ladders), max(1, args.repeat),
+        [d.strip() for d in args.decoders.split(",") if d.strip()], settings,
+    )
+    if args.baseline is not None:
+        report["comparison"] = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")))
+        for row in report["comparison"]:
+            print(json.dumps(row))
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
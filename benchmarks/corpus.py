@@ -0,0 +1,196 @@
+# benchmarks/corpus.py
+# comments in English only
+# Deterministic synthetic documents with known codes, for decoder benchmarks.
+#
+# Usage:
+#   python -m benchmarks.corpus --out .bench/corpus --preset small
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pypdfium2 as pdfium
+import zxingcpp
+from PIL import Image
+
+A4_IN = (8.27, 11.69)
+A4_PT = (595.0, 842.0)
+MANIFEST = "manifest.json"
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Axes of the corpus; every combination becomes one PDF and one image."""
+    seed: int = 1234
+    page_counts: tuple[int, ...] = (1, 4)
+    module_px: tuple[int, ...] = (2, 4)        # QR module size in pixels at the page DPI
+    dpis: tuple[int, ...] = (150, 300)
+    noise: tuple[float, ...] = (0.0, 0.08)     # gaussian sigma as a fraction of full scale
+    rotations: tuple[float, ...] = (0.0, 12.0)
+    blank_every: int = 3                       # every n-th PDF page carries no code (0 = never)
+    blank_images: int = 2                      # extra images without any code
+
+
+PRESETS = {
+    "tiny": CorpusSpec(page_counts=(2,), module_px=(3,), dpis=(150,), noise=(0.0,), rotations=(0.0,), blank_images=1),
+    "small": CorpusSpec(),
+    "full": CorpusSpec(
+        page_counts=(1, 5, 20),
+        module_px=(2, 3, 5),
+        dpis=(100, 200, 300),
+        noise=(0.0, 0.05, 0.12),
+        rotations=(0.0, 7.0, 90.0),
+    ),
+}
+
+
+@dataclass
+class CorpusItem:
+    """One generated file and the codes a correct decoder returns for it."""
+    path: str                 # relative to the corpus directory
+    mime: str
+    pages: int
+    expected: List[str] = field(default_factory=list)
+    params: dict = field(default_factory=dict)
+
+
+def _qr(text: str, module_px: int) -> Image.Image:
+    arr = np.array(zxingcpp.create_barcode(text, zxingcpp.BarcodeFormat.QRCode).to_image(scale=module_px))
+    return Image.fromarray(np.pad(arr, 4 * module_px, constant_values=255)).convert("L")
+
+
+def _distort(img: Image.Image, rotation: float, noise: float, rng: np.random.Generator) -> Image.Image:
+    if rotation:
+        img = img.rotate(rotation, expand=True, fillcolor=255, resample=Image.BILINEAR)
+    if noise:
+        arr = np.asarray(img, dtype=np.float32)
+        arr = arr + rng.normal(0.0, noise * 255, arr.shape)
+        img = Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+    return img
+
+
+def _page(text: Optional[str], dpi: int, module_px: int, rotation: float, noise: float,
+          rng: np.random.Generator) -> Image.Image:
+    """A white A4 page at `dpi` with one code at a random spot (or none)."""
+    w, h = int(A4_IN[0] * dpi), int(A4_IN[1] * dpi)
+    page = Image.new("L", (w, h), 255)
+    if text is not None:
+        code = _distort(_qr(text, module_px), rotation, 0.0, rng)
+        x = int(rng.integers(0, max(1, w - code.width)))
+        y = int(rng.integers(0, max(1, h - code.height)))
+        page.paste(code, (x, y))
+    # noise over the whole page, like a scanner would add
+    return _distort(page, 0.0, noise, rng)
+
+
+def _texts(prefix: str, pages: int, blank_every: int) -> List[Optional[str]]:
+    return [
+        None if blank_every and (i + 1) % blank_every == 0 else f"{prefix}-P{i + 1:03d}"
+        for i in range(pages)
+    ]
+
+
+def _write_scan_pdf(dst: Path, pages: List[Image.Image], dpi: int) -> None:
+    """Every page is one full-page raster image (scanner output)."""
+    pages[0].save(dst, format="PDF", save_all=True, append_images=pages[1:], resolution=dpi)
+
+
+def _write_placed_pdf(dst: Path, texts: List[Optional[str]], dpi: int, module_px: int, rotation: float,
+                      noise: float, rng: np.random.Generator) -> None:
+    """Blank A4 pages with the code placed as a small image object (generated documents)."""
+    pdf = pdfium.PdfDocument.new()
+    try:
+        for text in texts:
+            page = pdf.new_page(*A4_PT)
+            if text is not None:
+                code = _distort(_qr(text, module_px), rotation, noise, rng).convert("RGB")
+                w_pt, h_pt = code.width / dpi * 72, code.height / dpi * 72
+                x = float(rng.uniform(36, A4_PT[0] - 36 - w_pt))
+                y = float(rng.uniform(36, A4_PT[1] - 36 - h_pt))
+                obj = pdfium.PdfImage.new(pdf)
+                obj.set_bitmap(pdfium.PdfBitmap.from_pil(code))
+                obj.set_matrix(pdfium.PdfMatrix().scale(w_pt, h_pt).translate(x, y))
+                page.insert_obj(obj)
+                page.gen_content()
+            page.close()
+        pdf.save(str(dst))
+    finally:
+        pdf.close()
+
+
+def generate(spec: CorpusSpec, out_dir: Path) -> List[CorpusItem]:
+    """Write the corpus and its manifest into out_dir; same spec, same bytes."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(spec.seed)
+    items: list[CorpusItem] = []
+
+    combos = itertools.product(spec.page_counts, spec.module_px, spec.dpis, spec.noise, spec.rotations)
+    for n, (pages, module_px, dpi, noise, rotation) in enumerate(combos):
+        params = {"pages": pages, "module_px": module_px, "dpi": dpi, "noise": noise, "rotation": rotation}
+        texts = _texts(f"D{n:03d}", pages, spec.blank_every)
+        expected = [t for t in texts if t is not None]
+
+        name = f"scan-{n:03d}.pdf"
+        _write_scan_pdf(
+            out_dir / name, [_page(t, dpi, module_px, rotation, noise, rng) for t in texts], dpi
+        )
+        items.append(CorpusItem(name, "application/pdf", pages, expected, {**params, "layout": "scan"}))
+
+        name = f"placed-{n:03d}.pdf"
+        _write_placed_pdf(out_dir / name, texts, dpi, module_px, rotation, noise, rng)
+        items.append(CorpusItem(name, "application/pdf", pages, expected, {**params, "layout": "placed"}))
+
+        # one photo-like image per combination, alternating PNG/JPEG
+        fmt, ext, mime = ("PNG", "png", "image/png") if n % 2 == 0 else ("JPEG", "jpg", "image/jpeg")
+        text = f"D{n:03d}-IMG"
+        name = f"image-{n:03d}.{ext}"
+        _page(text, dpi, module_px, rotation, noise, rng).save(out_dir / name, format=fmt)
+        items.append(CorpusItem(name, mime, 1, [text], {**params, "pages": 1, "layout": "image"}))
+
+    for k in range(spec.blank_images):
+        name = f"blank-{k:03d}.png"
+        _page(None, spec.dpis[0], 1, 0.0, spec.noise[-1], rng).save(out_dir / name, format="PNG")
+        items.append(CorpusItem(name, "image/png", 1, [], {"dpi": spec.dpis[0], "layout": "blank"}))
+
+    manifest = {"spec": asdict(spec), "items": [asdict(i) for i in items]}
+    (out_dir / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return items
+
+
+def load(out_dir: Path) -> tuple[dict, List[CorpusItem]]:
+    """Read a corpus written by generate(): (spec as dict, items)."""
+    manifest = json.loads((out_dir / MANIFEST).read_text(encoding="utf-8"))
+    return manifest["spec"], [CorpusItem(**i) for i in manifest["items"]]
+
+
+def ensure(out_dir: Path, spec: CorpusSpec) -> List[CorpusItem]:
+    """Reuse an existing corpus built from the same spec, otherwise (re)generate it."""
+    if (out_dir / MANIFEST).exists():
+        stored, items = load(out_dir)
+        if stored == json.loads(json.dumps(asdict(spec))):
+            return items
+    return generate(spec, out_dir)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Generate the synthetic benchmark corpus")
+    ap.add_argument("--out", type=Path, default=Path(".bench/corpus"))
+    ap.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    ap.add_argument("--seed", type=int, default=None, help="Override the preset seed")
+    args = ap.parse_args()
+
+    spec = PRESETS[args.preset]
+    if args.seed is not None:
+        spec = CorpusSpec(**{**asdict(spec), "seed": args.seed})
+    items = generate(spec, args.out)
+    pages = sum(i.pages for i in items)
+    print(f"wrote {len(items)} files ({pages} pages) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
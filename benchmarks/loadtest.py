@@ -0,0 +1,287 @@
+# benchmarks/loadtest.py
+# comments in English only
+# HTTP load generator and regression gate for the qrparser service.
+#
+# Usage:
+#   python -m benchmarks.loadtest run --workers 2 --concurrency 16 --duration 30 --out .bench/load.json
+#   python -m benchmarks.loadtest run --baseline .bench/load-main.json   # run, then gate
+#   python -m benchmarks.loadtest compare .bench/load-main.json .bench/load.json
+#
+# `run` starts uvicorn on qrparser.web.main:create_app (or targets --url),
+# replays a weighted mix of corpus PDFs/images to /v1/parse from
+# --concurrency clients and probes /health on the side: /health does no work,
+# so its latency is the event-loop stall a request would see.
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+
+from benchmarks import corpus
+from benchmarks.stats import environment, pct_change, percentile
+
+HEALTH_PROBE_INTERVAL = 0.05
+STARTUP_TIMEOUT = 30.0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int, workers: int, env: dict[str, str]) -> subprocess.Popen:
+    """uvicorn with the app factory in a child process; logs are discarded."""
+    cmd = [
+        sys.executable, "-m", "uvicorn", "qrparser.web.main:create_app", "--factory",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+        "--log-level", "warning", "--no-access-log",
+    ]
+    return subprocess.Popen(
+        cmd, env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def wait_ready(url: str, proc: Optional[subprocess.Popen], timeout: float = STARTUP_TIMEOUT) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {url} not ready after {timeout}s")
+
+
+def _parse_mix(raw: str) -> dict[str, float]:
+    """'pdf=3,image=1' -> weights per family."""
+    mix: dict[str, float] = {}
+    for part in raw.split(","):
+        if part.strip():
+            name, _, weight = part.partition("=")
+            mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def load_payloads(corpus_dir: Path, spec: corpus.CorpusSpec, mix: dict[str, float]) -> List[tuple[str, bytes, str, float]]:
+    """(file name, bytes, mime, weight) for every corpus file in a family with non-zero weight."""
+    payloads = []
+    for item in corpus.ensure(corpus_dir, spec):
+        family = "pdf" if item.mime == "application/pdf" else "image"
+        weight = mix.get(family, 0.0)
+        if weight > 0:
+            payloads.append((item.path, (corpus_dir / item.path).read_bytes(), item.mime, weight))
+    if not payloads:
+        raise SystemExit("the --mix selects no corpus files")
+    return payloads
+
+
+def _retry_after(res: httpx.Response, default: float = 1.0) -> float:
+    """Seconds from a Retry-After header (delta-seconds form only)."""
+    try:
+        return max(0.0, float(res.headers.get("Retry-After", default)))
+    except ValueError:
+        return default
+
+
+async def _drive(url: str, payloads: list, concurrency: int, duration: float, max_requests: Optional[int],
+                 seed: int, params: dict) -> dict:
+    rng = random.Random(seed)
+    weights = [p[3] for p in payloads]
+    latencies: list[float] = []
+    probe: list[float] = []
+    statuses: Counter[str] = Counter()
+    sent = 0
+    stop_at = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=url, timeout=120.0, limits=limits) as client:
+        def more() -> bool:
+            return time.perf_counter() < stop_at and (max_requests is None or sent < max_requests)
+
+        async def user() -> None:
+            nonlocal sent
+            while more():
+                sent += 1
+                name, data, mime, _ = rng.choices(payloads, weights)[0]
+                t0 = time.perf_counter()
+                try:
+                    res = await client.post("/v1/parse", params=params, files={"file": (name, data, mime)})
+                    statuses[str(res.status_code)] += 1
+                except httpx.HTTPError as e:
+                    statuses[type(e).__name__] += 1
+                    res = None
+                if res is not None and res.status_code == 503:
+                    # admission rejection: not decode latency; back off as told, like a real client
+                    await asyncio.sleep(min(_retry_after(res), max(0.0, stop_at - time.perf_counter())))
+                    continue
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+        async def prober() -> None:
+            while more():
+                t0 = time.perf_counter()
+                try:
+                    await client.get("/health")
+                except httpx.HTTPError:
+                    pass
+                probe.append((time.perf_counter() - t0) * 1000)
+                await asyncio.sleep(HEALTH_PROBE_INTERVAL)
+
+        t_start = time.perf_counter()
+        await asyncio.gather(prober(), *(user() for _ in range(concurrency)))
+        wall = time.perf_counter() - t_start
+
+    total = sum(statuses.values())
+    ok = statuses.get("200", 0)
+    rejected = statuses.get("503", 0)
+    return {
+        "requests": total,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(ok / wall, 2) if wall else 0.0,
+        # 503s are load shedding, not failures; reported on their own
+        "error_rate": round((total - ok - rejected) / total, 4) if total else 0.0,
+        "rejection_rate": round(rejected / total, 4) if total else 0.0,
+        "statuses": dict(statuses),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(max(latencies, default=0.0), 2),
+        },
+        "health_ms": {
+            "p50": round(percentile(probe, 50), 2),
+            "p95": round(percentile(probe, 95), 2),
+            "max": round(max(probe, default=0.0), 2),
+        },
+    }
+
+
+def compare(baseline: dict, current: dict, max_p95_regression: float, max_throughput_regression: float) -> List[str]:
+    """Return the list of regressions past the thresholds (percent); empty means pass."""
+    failures = []
+    p95 = pct_change(current["latency_ms"]["p95"], baseline["latency_ms"]["p95"])
+    if p95 is not None and p95 > max_p95_regression:
+        failures.append(f"p95 latency +{p95}% (limit +{max_p95_regression}%)")
+    rps = pct_change(current["throughput_rps"], baseline["throughput_rps"])
+    if rps is not None and -rps > max_throughput_regression:
+        failures.append(f"throughput {rps}% (limit -{max_throughput_regression}%)")
+    return failures
+
+
+def _gate(baseline_path: Path, current: dict, args: argparse.Namespace) -> int:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    failures = compare(baseline, current, args.max_p95_regression, args.max_throughput_regression)
+    for line in failures:
+        print(f"REGRESSION: {line}")
+    if not failures:
+        print("no regression against", baseline_path)
+    return 1 if failures else 0
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    payloads = load_payloads(args.corpus, corpus.PRESETS[args.preset], _parse_mix(args.mix))
+    env = {
+        "QR_CONCURRENCY": str(args.pool_workers),
+        "QR_CACHE_ENABLED": "false",  # every request must really decode
+        # measure decode latency, not fast 503s: the gate compares p95/throughput of real work
+        "QR_ADMISSION_ENABLED": "false",
+        "QR_LOG_LEVEL": "WARNING",  # Settings only read QR_-prefixed variables
+    }
+    proc = None
+    url = args.url
+    if url is None:
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}"
+        proc = start_server(port, args.workers, env)
+    try:
+        wait_ready(url, proc)
+        params = {"scales": args.scales} if args.scales else {}
+        result = asyncio.run(
+            _drive(url, payloads, args.concurrency, args.duration, args.requests, args.seed, params)
+        )
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    result = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": environment(),
+        "config": {
+            "workers": args.workers if args.url is None else None,
+            "pool_workers": args.pool_workers if args.url is None else None,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "requests": args.requests,
+            "mix": args.mix,
+            "preset": args.preset,
+            "scales": args.scales,
+        },
+        **result,
+    }
+    keys = ("requests", "throughput_rps", "error_rate", "rejection_rate", "latency_ms", "health_ms")
+    print(json.dumps({k: result[k] for k in keys}))
+    if args.out is not None:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    return _gate(args.baseline, result, args) if args.baseline is not None else 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    return _gate(args.baseline, json.loads(args.current.read_text(encoding="utf-8")), args)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Load-test /v1/parse and gate on regressions")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    def gate_opts(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--max-p95-regression", type=float, default=20.0, help="Allowed p95 increase, percent")
+        p.add_argument("--max-throughput-regression", type=float, default=10.0, help="Allowed throughput drop, percent")
+
+    run = sub.add_parser("run", help="Start the service (or use --url) and replay the corpus")
+    run.add_argument("--url", default=None, help="Target a running service instead of starting one")
+    run.add_argument("--workers", type=int, default=1, help="uvicorn worker processes (QR_HTTP_WORKERS)")
+    run.add_argument("--pool-workers", type=int, default=2, help="Decode pool size per worker (QR_CONCURRENCY)")
+    run.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    run.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    run.add_argument("--requests", type=int, default=None, help="Stop after this many requests")
+    run.add_argument("--mix", default="pdf=1,image=1", help="Family weights, e.g. pdf=3,image=1")
+    run.add_argument("--scales", default=None, help="Scale ladder query parameter, e.g. 1.5,3,5")
+    run.add_argument("--corpus", type=Path, default=Path(".bench/corpus"))
+    run.add_argument("--preset", choices=sorted(corpus.PRESETS), default="small")
+    run.add_argument("--seed", type=int, default=7)
+    run.add_argument("--out", type=Path, default=None)
+    run.add_argument("--baseline", type=Path, default=None, help="Fail (exit 1) on regression against this run")
+    gate_opts(run)
+    run.set_defaults(fn=cmd_run)
+
+    cmp_ = sub.add_parser("compare", help="Gate a saved run against a saved baseline")
+    cmp_.add_argument("baseline", type=Path)
+    cmp_.add_argument("current", type=Path)
+    gate_opts(cmp_)
+    cmp_.set_defaults(fn=cmd_compare)
+
+    args = ap.parse_args(argv)
+    return args.fn(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
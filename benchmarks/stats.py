@@ -0,0 +1,54 @@
+# benchmarks/stats.py
+# comments in English only
+# Small helpers shared by the benchmark scripts (no numpy needed).
+from __future__ import annotations
+
+import math
+import platform
+import sys
+from typing import Optional, Sequence
+
+try:
+    import resource  # POSIX only
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100); 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return float(ordered[min(rank, len(ordered)) - 1])
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def environment() -> dict:
+    """What a result depends on besides the code: interpreter, machine, key libraries."""
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+    for mod in ("pypdfium2", "zxingcpp", "PIL", "numpy"):
+        try:
+            info[mod] = getattr(__import__(mod), "__version__", "unknown")
+        except ImportError:
+            info[mod] = None
+    return info
+
+
+def pct_change(new: float, old: float) -> Optional[float]:
+    """Relative change in percent; None when the baseline is zero."""
+    if not old:
+        return None
+    return round((new - old) / old * 100, 1)
@@ -1,7 +1,8 @@
 from pathlib import Path
-import time, uuid, pathlib, argparse
+import json, sys, time, uuid, pathlib, argparse
 
-from qrparser.core import PdfBarcodeDecoder, DecodeSettings
+from qrparser.config.settings import get_settings
+from qrparser.core import PdfBarcodeDecoder, DecodeSettings, DecodeReport
 
 from qrparser.observability.logging import (
     setup_logging, get_logger, set_request_context,
@@ -16,18 +17,56 @@ def main() -> None:
     ap.add_argument("pdf", type=Path, help="Path to PDF")
     ap.add_argument("--scale", type=float, default=3.5)
     ap.add_argument("--fallback-scale", type=float, default=5.0)
+    ap.add_argument(
+        "--scales", type=str, default=None,
+        help="Comma-separated scale ladder tried cheapest-first (overrides --scale/--fallback-scale)",
+    )
+    ap.add_argument("--target-dpi", type=float, default=None, help="Resolution of the 1.0 rung, e.g. 100")
+    ap.add_argument(
+        "--max-megapixels", type=float, default=None, help="Clamp each page render to this many megapixels"
+    )
+    ap.add_argument("--roi", action="store_true", help="Re-render only code-like regions on fallback rungs")
+    ap.add_argument("--max-codes", type=int, default=None, help="Stop once this many codes were found")
+    ap.add_argument("--first", action="store_true", help="Stop after the first code (same as --max-codes 1)")
+    ap.add_argument(
+        "--formats", type=str, default=None,
+        help="Comma-separated symbologies, e.g. QRCode,DataMatrix (default: all)",
+    )
+    ap.add_argument("--fast", action="store_true", help="Skip zxing rotate/downscale/invert passes")
+    ap.add_argument("--workers", type=int, default=1, help="Decode page ranges in N processes")
+    ap.add_argument("--pages", type=str, default=None, help="Pages to decode, 1-based, e.g. 1-3,last")
+    ap.add_argument(
+        "--max-pages", type=int, default=get_settings().MAX_PAGES,
+        help="Decode at most N pages (default: QR_MAX_PAGES)",
+    )
+    ap.add_argument("--report", action="store_true", help="Print the per-page decode report as JSON to stderr")
     args = ap.parse_args()
 
     set_request_context(request_id=str(uuid.uuid4()))
     t0 = time.perf_counter()
-    log_request_start(method="CLI", path=str(args.pdf), scale=args.scale, fallback_scale=args.fallback_scale)
+    log_request_start(
+        method="CLI", path=str(args.pdf), scale=args.scale,
+        fallback_scale=args.fallback_scale, scales=args.scales, workers=args.workers,
+    )
 
     try:
         from qrparser.core.pdf_decoder import PdfBarcodeDecoder, DecodeSettings
-        dec = PdfBarcodeDecoder(DecodeSettings(scale=args.scale, fallback_scale=args.fallback_scale))
-        values = dec.decode(args.pdf)
+        scales = tuple(float(x) for x in args.scales.split(",")) if args.scales else None
+        dec = PdfBarcodeDecoder(DecodeSettings(
+            scale=args.scale, fallback_scale=args.fallback_scale, scales=scales,
+            target_dpi=args.target_dpi, max_megapixels=args.max_megapixels,
+            roi=args.roi, max_codes=args.max_codes, stop_after_first=args.first,
+            page_workers=args.workers, pages=args.pages, max_pages=args.max_pages,
+            formats=tuple(x.strip() for x in args.formats.split(",")) if args.formats else None,
+            try_harder=not args.fast,
+        ))
+        report = DecodeReport()
+        values = dec.extract_from_file(args.pdf, report=report)
         dur = (time.perf_counter() - t0) * 1000
-        log_request_end(status=0, duration_ms=dur, found=len(values))
+        summary = dec.page_summary(args.pdf, dec.settings)
+        log_request_end(status=0, duration_ms=dur, found=len(values), **summary)
+        if args.report:
+            print(json.dumps(report.as_log(), indent=2), file=sys.stderr)
         for v in values:
             print(v)
     except Exception:
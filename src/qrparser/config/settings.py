@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Literal, Optional
+from typing import Annotated, Literal, Optional
 
-from pydantic import AnyUrl, Field
+from pydantic import AnyUrl, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -36,11 +36,97 @@ class Settings(BaseSettings):
     FALLBACK_SCALE: float = Field(
         default=5.0, ge=0.1, le=10.0, description="Fallback resize scale factor."
     )
+    DECODE_SCALES: tuple[Annotated[float, Field(ge=0.1, le=10.0)], ...] = Field(
+        default=(1.5, 3.0, 5.0),
+        description="Scale ladder tried cheapest-first; empty falls back to (DECODE_SCALE, FALLBACK_SCALE).",
+    )
+    TARGET_DPI: Optional[float] = Field(
+        default=None, gt=0,
+        description="Resolution of the 1.0 rung (PDF pages; images map onto an A4 page); unset keeps raw factors.",
+    )
+    MAX_BITMAP_MEGAPIXELS: float = Field(
+        default=64.0, ge=0,
+        description="Render scales are clamped and larger embedded images skipped so no bitmap exceeds this; 0 disables.",
+    )
+    LARGE_IMAGE_MEGAPIXELS: float = Field(
+        default=2.0, ge=0,
+        description="Images above this are decoded reduced first (JPEG via DCT scaling), never upscaled; 0 disables.",
+    )
+    DECODE_GRAYSCALE: bool = Field(
+        default=True, description="Render/decode 8-bit grayscale instead of RGB."
+    )
+    EMBEDDED_IMAGES: bool = Field(
+        default=True, description="Decode images embedded in PDF pages natively before rendering."
+    )
+    ROI_ENABLED: bool = Field(
+        default=False,
+        description="After a failed first rung, re-render only code-like regions of PDF pages at higher rungs.",
+    )
+
+    # --- zxing reader options ---
+    DECODE_FORMATS: tuple[str, ...] = Field(
+        default=("QRCode", "MicroQRCode", "DataMatrix"),
+        description="Symbologies searched for (zxing names); empty searches every format.",
+    )
+    ZXING_TRY_HARDER: bool = Field(
+        default=True, description="Master switch for the rotate/downscale/invert passes."
+    )
+    ZXING_TRY_ROTATE: bool = Field(default=True, description="Also try 90/180/270 degree rotations.")
+    ZXING_TRY_DOWNSCALE: bool = Field(default=True, description="Also scan a downscaled image pyramid.")
+    ZXING_TRY_INVERT: bool = Field(default=True, description="Also try inverted (light-on-dark) codes.")
+    ZXING_BINARIZER: Literal["LocalAverage", "GlobalHistogram", "FixedThreshold", "BoolCast"] = Field(
+        default="LocalAverage", description="zxing binarizer."
+    )
+    ZXING_IS_PURE: bool = Field(
+        default=False, description="Inputs are perfectly aligned, unrotated codes only (fast path)."
+    )
+
     MAX_PAGES: int = Field(
-        default=50, ge=1, description="Max pages to scan in a PDF to prevent abuse."
+        default=50, ge=1, description="Max pages decoded per PDF; later pages are skipped and reported."
     )
     CONCURRENCY: int = Field(
-        default=4, ge=1, description="Worker threads/processes used for parsing."
+        default=4, ge=1, description="Decode pool worker processes (per HTTP worker)."
+    )
+    DEADLINE_SECONDS: float = Field(
+        default=30.0, gt=0,
+        description="Per-request decode deadline; codes found by then are returned with partial=true.",
+    )
+    DEADLINE_MAX_SECONDS: float = Field(
+        default=120.0, gt=0, description="Upper bound for deadlines requested via timeout / X-Request-Timeout."
+    )
+    ADMISSION_ENABLED: bool = Field(
+        default=True, description="Bound parse requests per process; overflow gets 503 with Retry-After."
+    )
+    ADMISSION_QUEUE_PER_WORKER: int = Field(
+        default=2, ge=0, description="Parse requests allowed to wait per CONCURRENCY slot."
+    )
+    ADMISSION_MAX_WAIT_SECONDS: float = Field(
+        default=10.0, ge=0, description="Max time a parse request waits for a slot before a 503."
+    )
+    ADMISSION_MEGAPIXELS: float = Field(
+        default=2000.0, ge=0,
+        description="Estimated megapixels (pages x largest rung) decoded at once per process; 0 disables.",
+    )
+    ADMISSION_RETRY_AFTER_SECONDS: int = Field(
+        default=2, ge=1, description="Retry-After sent with admission rejections and decodes lost with a crashed worker."
+    )
+    PDF_PAGE_WORKERS: int = Field(
+        default=1, ge=1, description="Split a PDF into this many page ranges decoded in parallel (1 = sequential)."
+    )
+
+    # --- Result cache (keyed by file hash + decode settings) ---
+    CACHE_ENABLED: bool = Field(default=True, description="Cache decode results in memory.")
+    CACHE_MAX_ENTRIES: int = Field(
+        default=1024, ge=1, description="Max results kept in the in-process LRU."
+    )
+    CACHE_TTL_SECONDS: float = Field(
+        default=3600.0, gt=0, description="Cached result lifetime in seconds."
+    )
+    CACHE_DIR: Optional[str] = Field(
+        default=None, description="Optional on-disk cache directory shared by workers on a host."
+    )
+    CACHE_SWEEP_INTERVAL_SECONDS: float = Field(
+        default=300.0, gt=0, description="How often expired files are deleted from CACHE_DIR."
     )
 
     # --- Accepted types (split by family) ---
@@ -61,6 +147,36 @@ class Settings(BaseSettings):
         default=6, ge=1, description="Max image size in megabytes."
     )
 
+    # --- Batch endpoint (/v1/parse/batch); per-file limits above still apply ---
+    BATCH_MAX_FILES: int = Field(default=20, ge=1, description="Max files per batch request.")
+    BATCH_MAX_TOTAL_MB: int = Field(
+        default=50, ge=1, description="Max total size of all files in a batch, in megabytes."
+    )
+    BATCH_MAX_PAGES: int = Field(
+        default=200, ge=1, description="Max total PDF pages in a batch."
+    )
+
+    # --- Async jobs (/v1/jobs); in-process queue, state shared via JOBS_DIR ---
+    JOBS_MAX_QUEUED: int = Field(default=100, ge=1, description="Max jobs waiting in the queue.")
+    JOBS_WORKERS: int = Field(
+        default=2, ge=1, description="Jobs dispatched to the decode pool at the same time."
+    )
+    JOBS_TTL_SECONDS: float = Field(
+        default=3600.0, gt=0, description="How long finished job results can be polled."
+    )
+    JOBS_CALLBACKS_ENABLED: bool = Field(
+        default=False, description="Allow callback_url on job submission (POSTs the result when done)."
+    )
+    JOBS_BUDGET_WAIT_SECONDS: float = Field(
+        default=600.0,
+        ge=0,
+        description="Max time a background job waits for the megapixel budget before it fails.",
+    )
+    JOBS_DIR: Optional[str] = Field(
+        default=None,
+        description="Job state directory shared by the HTTP workers of a host (needed with HTTP_WORKERS > 1).",
+    )
+
     # --- HTTP service ---
     HTTP_HOST: str = Field(default="0.0.0.0", description="Bind host.")
     HTTP_PORT: int = Field(default=8000, ge=1, le=65535, description="Bind port.")
@@ -90,7 +206,20 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    @field_validator("DECODE_FORMATS")
+    @classmethod
+    def _known_formats(cls, v: tuple[str, ...]) -> tuple[str, ...]:
+        from qrparser.core.symbology import parse_formats
+
+        parse_formats(v)  # ValueError on unknown names
+        return v
+
     # --- Convenience computed views ---
+    @property
+    def SCALE_LADDER(self) -> tuple[float, ...]:
+        """Effective scale ladder used by the web layer."""
+        return tuple(self.DECODE_SCALES) or (self.DECODE_SCALE, self.FALLBACK_SCALE)
+
     @property
     def ALL_ALLOWED_MIME(self) -> tuple[str, ...]:
         """Union of PDF and image MIME lists."""
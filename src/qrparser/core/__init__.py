@@ -1,3 +1,5 @@
-from .pdf_decoder import PdfBarcodeDecoder, DecodeSettings
+from .decode_settings import DecodeSettings
+from .report import DecodeReport, PageResult, PageStats
+from .pdf_decoder import PdfBarcodeDecoder
 
-__all__ = ["PdfBarcodeDecoder", "DecodeSettings"]
+__all__ = ["PdfBarcodeDecoder", "DecodeSettings", "DecodeReport", "PageResult", "PageStats"]
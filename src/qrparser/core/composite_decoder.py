@@ -3,6 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Iterable, Sequence
 
+from .report import DecodeReport
+
 class CompositeDecoder:
     def __init__(self, decoders: Sequence) -> None:
         self._decoders = list(decoders)
@@ -10,8 +12,22 @@ class CompositeDecoder:
     def can_handle(self, mime: str) -> bool:
         return any(d.can_handle(mime) for d in self._decoders)
 
-    def extract_from_file(self, path: Path, mime: str) -> Iterable[str]:
+    def decoder_for(self, mime: str):
         for d in self._decoders:
             if d.can_handle(mime):
-                return d.extract_from_file(path)
-        raise ValueError(f"No decoder for mime: {mime}")
\ No newline at end of file
+                return d
+        raise ValueError(f"No decoder for mime: {mime}")
+
+    def extract_from_file(
+        self, path: Path, mime: str, report: DecodeReport | None = None, deadline: float | None = None
+    ) -> Iterable[str]:
+        return self.decoder_for(mime).extract_from_file(path, report=report, deadline=deadline)
+
+    def extract_from_bytes(
+        self,
+        data: bytes | bytearray | memoryview,
+        mime: str,
+        report: DecodeReport | None = None,
+        deadline: float | None = None,
+    ) -> Iterable[str]:
+        return self.decoder_for(mime).extract_from_bytes(data, report=report, deadline=deadline)
@@ -0,0 +1,26 @@
+# src/qrparser/core/deadline.py
+# comments in English only
+# Cooperative per-request deadlines, checked between pages and scale rungs.
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+from .report import DecodeReport
+
+
+def deadline_in(seconds: Optional[float]) -> Optional[float]:
+    """Absolute deadline `seconds` from now (wall clock, so it survives a process hop)."""
+    return None if seconds is None else time.time() + seconds
+
+
+def expired(deadline: Optional[float], report: Optional[DecodeReport] = None) -> bool:
+    """True once the deadline has passed; flags the report as partial."""
+    if deadline is None or time.time() < deadline:
+        return False
+    if report is not None:
+        report.deadline_exceeded = True
+    return True
+
+
+__all__ = ["deadline_in", "expired"]
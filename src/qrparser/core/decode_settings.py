@@ -0,0 +1,69 @@
+# src/qrparser/core/decode_settings.py
+# comments in English only
+# Decode parameters shared by the PDF and image decoders.
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class DecodeSettings:
+    """Tunable, immutable decode parameters."""
+    scale: float = 3.5
+    fallback_scale: float = 5.0
+    # explicit scale ladder, tried cheapest-first until a rung finds codes;
+    # None keeps the classic (scale, fallback_scale) pair
+    scales: Optional[tuple[float, ...]] = None
+    # resolution the 1.0 rung stands for (PDF: dpi of the page; images: the
+    # pixel count of an A4 page at that dpi); None keeps rungs as raw factors
+    target_dpi: Optional[float] = None
+    # no single rendered/resized bitmap grows past this many megapixels (None = no cap)
+    max_megapixels: Optional[float] = None
+    # images above this size are decoded reduced to it first, then natively, and
+    # never upscaled; None treats every image as small (native, then the ladder)
+    large_image_megapixels: Optional[float] = 2.0
+    # zxing reader options; formats=None searches every symbology
+    formats: Optional[tuple[str, ...]] = None
+    try_harder: bool = True          # False disables rotate/downscale/invert passes at once
+    try_rotate: bool = True
+    try_downscale: bool = True
+    try_invert: bool = True
+    binarizer: str = "LocalAverage"  # LocalAverage | GlobalHistogram | FixedThreshold | BoolCast
+    is_pure: bool = False            # input is nothing but a perfectly aligned code
+    # render/decode 8-bit luminance instead of RGB (zxing only uses luminance)
+    grayscale: bool = True
+    # PDF only: decode embedded raster images (scans, pasted QR pictures) at
+    # their native resolution before rendering the page
+    embedded_images: bool = True
+    # region-of-interest mode (PDF only): when the first rung fails, locate
+    # code-like regions on that cheap render and re-render only those at higher rungs
+    roi: bool = False
+    roi_max_regions: int = 8
+    # early exit: stop rendering once this many codes were found
+    max_codes: Optional[int] = None
+    stop_after_first: bool = False
+    # >1 splits pages into that many contiguous ranges decoded in separate processes (PDF only)
+    page_workers: int = 1
+    # PDF only: 1-based page selection such as "1-3,last" (None = every page),
+    # and a hard cap on pages decoded per document (applied after the selection)
+    pages: Optional[str] = None
+    max_pages: Optional[int] = None
+
+    def code_limit(self) -> Optional[int]:
+        """Number of codes after which decoding stops (None = scan everything)."""
+        if self.stop_after_first:
+            return 1
+        return self.max_codes if self.max_codes and self.max_codes > 0 else None
+
+    def ladder(self) -> tuple[float, ...]:
+        """Effective scale rungs in the order they are tried (duplicates dropped)."""
+        rungs = self.scales if self.scales else (self.scale, self.fallback_scale)
+        out: list[float] = []
+        for s in rungs:
+            if s and s not in out:
+                out.append(float(s))
+        return tuple(out)
+
+
+__all__ = ["DecodeSettings"]
@@ -1,8 +1,18 @@
 # src/qrparser/core/decoder_base.py
 from __future__ import annotations
 from pathlib import Path
-from typing import Protocol, Iterable
+from typing import Protocol, Iterable, Optional
+
+from .report import DecodeReport
 
 class BarcodeDecoder(Protocol):
     def can_handle(self, mime: str) -> bool: ...
-    def extract_from_file(self, path: Path) -> Iterable[str]: ...
\ No newline at end of file
+    def extract_from_file(
+        self, path: Path, report: Optional[DecodeReport] = None, deadline: Optional[float] = None
+    ) -> Iterable[str]: ...
+    def extract_from_bytes(
+        self,
+        data: bytes | bytearray | memoryview,
+        report: Optional[DecodeReport] = None,
+        deadline: Optional[float] = None,
+    ) -> Iterable[str]: ...
@@ -2,26 +2,29 @@
 # comments in English only
 from __future__ import annotations
 
-from dataclasses import dataclass
+import io
+import time
 from pathlib import Path
-from typing import List
+from typing import Callable, List, Optional
 
 import numpy as np
 from PIL import Image, ImageOps
-import zxingcpp  # Python bindings for zxing-cpp
 
-
-@dataclass(frozen=True)
-class DecodeSettings:
-    """Tunable, immutable decode parameters for image decoding."""
-    scale: float = 3.5
-    fallback_scale: float = 5.0
+from .deadline import expired
+from .decode_settings import DecodeSettings
+from .report import DecodeReport
+from .scaling import SAME_SCALE_TOLERANCE, base_scale_image, clamp_scale, rung_scales
+from .symbology import read_texts
 
 
 class ImageBarcodeDecoder:
     """
     Decode QR/DataMatrix/etc barcodes from raster images.
     Single-frame only (PNG, JPEG, optional BMP). Stateless.
+
+    Size-aware: images above settings.large_image_megapixels (phone photos)
+    are decoded reduced first, then at native resolution, never upscaled;
+    smaller images go native first, then up the scale ladder.
     """
 
     SUPPORTED = {
@@ -37,48 +40,171 @@ class ImageBarcodeDecoder:
     def can_handle(self, mime: str) -> bool:
         return mime in self.SUPPORTED
 
+    @classmethod
+    def estimate_megapixels(cls, source: Path | str | bytes, settings: DecodeSettings) -> float:
+        """Cost estimate for admission: the image (header dimensions only) at its largest step."""
+        fp = io.BytesIO(source) if isinstance(source, (bytes, bytearray, memoryview)) else str(source)
+        with Image.open(fp) as im:
+            w, h = im.size
+        return w * h * max(scale for _, scale in cls.plan_steps(w, h, settings)) ** 2 / 1e6
+
+    @staticmethod
+    def plan_steps(width: int, height: int, settings: DecodeSettings) -> tuple[tuple[float, float], ...]:
+        """
+        (label, scale) steps for a width x height image, tried in order. Large
+        images: reduced to large_image_megapixels, then native. Others: native,
+        then the ladder rungs that enlarge it (target_dpi / max_megapixels apply).
+        """
+        native = clamp_scale(1.0, width, height, settings.max_megapixels)
+        large = settings.large_image_megapixels
+        if large and width * height > large * 1e6:
+            reduced = clamp_scale(native, width, height, large)
+            if native <= reduced * (1 + SAME_SCALE_TOLERANCE):
+                return ((1.0, native),)
+            return ((round(reduced, 3), reduced), (1.0, native))
+
+        steps = [(1.0, native)]
+        for rung, scale in rung_scales(width, height, settings, base_scale_image(width, height, settings)):
+            if scale > steps[-1][1] * (1 + SAME_SCALE_TOLERANCE):
+                steps.append((rung, scale))
+        return tuple(steps)
+
     @staticmethod
     def _pil_to_rgb_np(img: Image.Image) -> np.ndarray:
         """Convert PIL image to RGB numpy array."""
         return np.array(img.convert("RGB"), copy=False)
 
+    def _pil_to_np(self, img: Image.Image) -> np.ndarray:
+        """Hand zxing one byte per pixel in grayscale mode, RGB otherwise."""
+        if self.settings.grayscale:
+            return np.asarray(img if img.mode == "L" else img.convert("L"))
+        return self._pil_to_rgb_np(img)
+
+    def _load(self, im: Image.Image, size: Optional[tuple[int, int]] = None) -> Image.Image:
+        """
+        Decode pixels in the cheapest usable form. In grayscale mode libjpeg is
+        asked for luminance directly (draft mode), so no RGB frame is ever built.
+        With `size`, a JPEG is also scaled down in the DCT domain (1/2, 1/4 or
+        1/8, never below `size`) instead of being decoded at full resolution.
+        """
+        if im.format == "JPEG" and (size is not None or self.settings.grayscale):
+            im.draft("L" if self.settings.grayscale else im.mode, size or im.size)
+        # Apply EXIF orientation if present (common for JPEGs from phones);
+        # exif_transpose copies the frame even when there is nothing to do
+        if im.getexif().get(0x0112, 1) != 1:
+            im = ImageOps.exif_transpose(im)
+        im.load()  # ensure loaded before resizing/convert
+        if self.settings.grayscale and im.mode != "L":
+            im = im.convert("L")
+        return im
+
     @staticmethod
     def _resize(img: Image.Image, factor: float) -> Image.Image:
-        """Resize PIL image by a scale factor using a high-quality filter."""
+        """
+        Resize PIL image by a scale factor. Bilinear is plenty for zxing's
+        binarizer; shrinking first box-reduces by whole factors (reducing_gap).
+        """
         if factor == 1.0:
             return img
         w, h = img.size
         nw, nh = max(1, int(round(w * factor))), max(1, int(round(h * factor)))
-        return img.resize((nw, nh), resample=Image.BICUBIC)
+        return img.resize((nw, nh), resample=Image.BILINEAR, reducing_gap=2.0 if factor < 1.0 else None)
 
-    @staticmethod
-    def _decode_all(img_rgb: np.ndarray) -> List[str]:
-        """Run zxing-cpp and return non-empty texts."""
-        results = zxingcpp.read_barcodes(img_rgb)
-        return [r.text for r in results if getattr(r, "text", None)]
+    def _decode_all(self, img: np.ndarray) -> List[str]:
+        """Run zxing-cpp (gray or RGB input) with the configured symbologies/options."""
+        return read_texts(img, self.settings)
 
-    def extract_from_file(self, img_path: Path | str) -> List[str]:
+    def extract_from_file(
+        self, img_path: Path | str, report: Optional[DecodeReport] = None, deadline: Optional[float] = None
+    ) -> List[str]:
         """
         Decode all barcodes from a single-frame image. Returns texts.
+        Past `deadline` (time.time() value) no further scale rung is tried.
         """
         p = Path(img_path)
         if not p.exists():
             raise FileNotFoundError(f"Image not found: {p}")
 
-        with Image.open(str(p)) as im:
-            # Apply EXIF orientation if present (common for JPEGs from phones)
-            im = ImageOps.exif_transpose(im)
-            im.load()  # ensure loaded before resizing/convert
-
-            # Primary try
-            primary = self._resize(im, self.settings.scale)
-            vals = self._decode_all(self._pil_to_rgb_np(primary))
-            if vals:
-                return vals
-
-            # Fallback try
-            if self.settings.fallback_scale and self.settings.fallback_scale != self.settings.scale:
-                fb = self._resize(im, self.settings.fallback_scale)
-                vals = self._decode_all(self._pil_to_rgb_np(fb))
+        return self._extract(lambda: Image.open(str(p)), report, deadline)
 
-            return vals
+    def extract_from_bytes(
+        self,
+        data: bytes | bytearray | memoryview,
+        report: Optional[DecodeReport] = None,
+        deadline: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Decode all barcodes from an in-memory image.
+        BytesIO shares the buffer of a bytes object, so nothing is copied.
+        """
+        return self._extract(lambda: Image.open(io.BytesIO(data)), report, deadline)
+
+    def _extract(
+        self,
+        open_image: Callable[[], Image.Image],
+        report: Optional[DecodeReport] = None,
+        deadline: Optional[float] = None,
+    ) -> List[str]:
+        with open_image() as im:
+            return self._walk(im, open_image, report, deadline)
+
+    def _walk(
+        self,
+        im: Image.Image,
+        open_image: Callable[[], Image.Image],
+        report: Optional[DecodeReport],
+        deadline: Optional[float],
+    ) -> List[str]:
+        """Try the planned steps in order (see plan_steps); stop at the first that finds codes."""
+        if report is not None:
+            report.start_page(0)
+        w, h = im.size  # header only, nothing decoded yet
+        steps = self.plan_steps(w, h, self.settings)
+        native: Optional[Image.Image] = None
+        unused = True  # `im` has not been decoded yet
+
+        t_fallback: Optional[float] = None
+        vals: List[str] = []
+        try:
+            for k, (rung, scale) in enumerate(steps):
+                if expired(deadline, report):
+                    return []
+                if k == 1:
+                    t_fallback = time.perf_counter()  # later rungs are fallback work
+                t0 = time.perf_counter()
+                if scale < 1.0 and unused and im.format == "JPEG":
+                    # reduced first pass straight out of libjpeg; full pixels are never decoded
+                    target = (max(1, round(w * scale)), max(1, round(h * scale)))
+                    frame = self._load(im, target)
+                    unused = False
+                    if frame.width * frame.height > target[0] * target[1] * (1 + SAME_SCALE_TOLERANCE):
+                        # libjpeg stops at the power of two above the target; finish with a resize
+                        frame = self._resize(frame, (target[0] * target[1] / (frame.width * frame.height)) ** 0.5)
+                else:
+                    if native is None:
+                        if unused:
+                            native, unused = self._load(im), False
+                        else:
+                            with open_image() as again:  # the draft pass consumed `im`
+                                native = self._load(again)
+                    frame = self._resize(native, scale)
+                arr = self._pil_to_np(frame)
+                del frame
+                t1 = time.perf_counter()
+                vals = self._decode_all(arr)
+                if report is not None:
+                    report.add_render((t1 - t0) * 1000, arr.nbytes)
+                    report.add_decode((time.perf_counter() - t1) * 1000)
+                del arr
+                if vals:
+                    if report is not None:
+                        report.record_scale(rung)
+                    limit = self.settings.code_limit()
+                    return vals if limit is None else vals[:limit]
+
+            if report is not None:
+                report.record_scale(None)
+            return []
+        finally:
+            if report is not None and t_fallback is not None:
+                report.record_fallback((time.perf_counter() - t_fallback) * 1000, hit=bool(vals))
@@ -0,0 +1,69 @@
+# src/qrparser/core/pages.py
+# comments in English only
+# Page selection: "1-3,last" style specs and the MAX_PAGES cap.
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+LAST = -1  # placeholder for the document's last page
+
+# 1-based inclusive bounds; LAST stands for the page count
+PageRange = Tuple[int, int]
+
+
+def _bound(token: str) -> int:
+    token = token.strip().lower()
+    if token == "last":
+        return LAST
+    if not token.isdigit() or int(token) < 1:
+        raise ValueError(f"Invalid page: {token!r}")
+    return int(token)
+
+
+@lru_cache(maxsize=256)
+def parse_page_spec(spec: str) -> tuple[PageRange, ...]:
+    """
+    '1-3,5,last' -> ((1, 3), (5, 5), (LAST, LAST)). Pages are 1-based;
+    'N-' and 'N-last' run to the end. Raises ValueError on bad input.
+    """
+    ranges: list[PageRange] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            a, b = _bound(lo), (_bound(hi) if hi.strip() else LAST)
+            if a == LAST and b != LAST:
+                raise ValueError(f"Invalid page range: {part!r}")
+            if a != LAST and b != LAST and b < a:
+                raise ValueError(f"Invalid page range: {part!r}")
+        else:
+            a = b = _bound(part)
+        ranges.append((a, b))
+    if not ranges:
+        raise ValueError("Empty page selection")
+    return tuple(ranges)
+
+
+def select_pages(n_pages: int, spec: Optional[str] = None, max_pages: Optional[int] = None) -> List[int]:
+    """
+    0-based indices to decode, in reading order: the pages named by `spec`
+    (all pages when None) that exist in the document, cut to the first `max_pages`.
+    """
+    if spec:
+        wanted: set[int] = set()
+        for a, b in parse_page_spec(spec):
+            lo = n_pages if a == LAST else a
+            hi = n_pages if b == LAST else min(b, n_pages)
+            wanted.update(range(lo - 1, hi))
+        selected = sorted(i for i in wanted if 0 <= i < n_pages)
+    else:
+        selected = list(range(n_pages))
+    if max_pages is not None and max_pages > 0:
+        del selected[max_pages:]
+    return selected
+
+
+__all__ = ["LAST", "parse_page_spec", "select_pages"]
@@ -3,21 +3,59 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import ctypes
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, Iterator, List, Optional, Union
 
 import numpy as np
 import pypdfium2 as pdfium
-from PIL import Image  # noqa: F401  # Pillow is used indirectly via pdfium's .to_pil()
-import zxingcpp  # Python bindings for zxing-cpp
+import pypdfium2.raw as pdfium_c
+from PIL import Image
 
+from .deadline import expired
+from .decode_settings import DecodeSettings
+from .pages import select_pages
+from .regions import Box, find_candidate_regions
+from .report import DecodeReport, PageResult
+from .scaling import base_scale_pdf, clamp_scale, rung_scales
+from .symbology import read_options, read_texts
 
-@dataclass(frozen=True)
-class DecodeSettings:
-    """Tunable, immutable decode parameters."""
-    scale: float = 3.5
-    fallback_scale: float = 5.0
+
+# A PDF given by path or held in memory
+PdfSource = Union[Path, str, bytes, bytearray, memoryview]
+
+# embedded-image fast path: what counts as a scan page or a code-sized picture
+DOMINANT_IMAGE_AREA = 0.5            # image covers at least half of the page
+CODE_IMAGE_MIN_PT = 20.0             # ~7 mm
+CODE_IMAGE_MAX_PT = 288.0            # 4 in
+MAX_EMBEDDED_CANDIDATES = 4
+
+
+def _as_pdfium_buffer(data: bytes | bytearray | memoryview) -> bytes | ctypes.Array:
+    """
+    Adapt an in-memory PDF for pdfium without copying where possible.
+    bytes (and views of a whole bytes object) are passed through; writable
+    buffers are wrapped as a ctypes array.
+    """
+    if isinstance(data, bytes):
+        return data
+    mv = memoryview(data)
+    if not mv.readonly and mv.contiguous:
+        return (ctypes.c_char * mv.nbytes).from_buffer(mv)
+    if isinstance(mv.obj, bytes) and mv.contiguous and mv.nbytes == len(mv.obj):
+        return mv.obj  # a view of a whole bytes object: pass the bytes themselves
+    return mv.tobytes()  # read-only foreign buffer or partial view: one unavoidable copy
+
+
+def decode_range_job(
+    decoder: "PdfBarcodeDecoder", source: PdfSource, start: int, stop: int, deadline: Optional[float] = None
+) -> tuple[List[str], DecodeReport]:
+    """Process-pool job: decode one page range and return codes plus its report."""
+    report = DecodeReport()
+    return decoder.extract_page_range(source, start, stop, report=report, deadline=deadline), report
 
 
 class PdfBarcodeDecoder:
@@ -32,38 +70,465 @@ class PdfBarcodeDecoder:
         self.settings = settings or DecodeSettings()
 
     @staticmethod
-    def _render_page_rgb(page: pdfium.PdfPage, scale: float) -> np.ndarray:
-        """Render a pdfium page to an RGB numpy array."""
-        pil = page.render(scale=scale).to_pil()
+    def _render_page_rgb(
+        page: pdfium.PdfPage, scale: float, crop: tuple[float, float, float, float] = (0, 0, 0, 0)
+    ) -> np.ndarray:
+        """Render a pdfium page (or a cropped part of it) to an RGB numpy array."""
+        pil = page.render(scale=scale, crop=crop).to_pil()
         return np.array(pil.convert("RGB"))
 
     @staticmethod
-    def _decode_all(img_rgb: np.ndarray) -> List[str]:
-        """Run zxing-cpp multi-symbology decode and return non-empty texts."""
-        results = zxingcpp.read_barcodes(img_rgb)
-        return [r.text for r in results if getattr(r, "text", None)]
+    def _render_page_gray(
+        page: pdfium.PdfPage, scale: float, crop: tuple[float, float, float, float] = (0, 0, 0, 0)
+    ) -> np.ndarray:
+        """
+        Render straight into an 8-bit grayscale pdfium bitmap and return a
+        numpy view of its buffer: one byte per pixel, no PIL, no copy.
+        """
+        arr = page.render(scale=scale, crop=crop, grayscale=True).to_numpy()
+        # the view keeps the bitmap alive; zxing needs rows without stride padding
+        return arr if arr.flags["C_CONTIGUOUS"] else np.ascontiguousarray(arr)
+
+    def _render_page(
+        self, page: pdfium.PdfPage, scale: float, crop: tuple[float, float, float, float] = (0, 0, 0, 0)
+    ) -> np.ndarray:
+        if self.settings.grayscale:
+            return self._render_page_gray(page, scale, crop)
+        return self._render_page_rgb(page, scale, crop)
+
+    @staticmethod
+    def _box_to_crop(box: Box, scale: float, img_shape: tuple[int, ...]) -> tuple[float, float, float, float]:
+        """
+        Convert a pixel box found on a render at `scale` into pdfium crop
+        amounts (left, bottom, right, top) in canvas units, with a quiet-zone margin.
+        """
+        width, height = img_shape[1] / scale, img_shape[0] / scale
+        x0, y0, x1, y1 = (v / scale for v in box)
+        pad = max(4.0, 0.15 * max(x1 - x0, y1 - y0))
+        return (
+            max(0.0, x0 - pad),
+            max(0.0, height - y1 - pad),
+            max(0.0, width - x1 - pad),
+            max(0.0, y0 - pad),
+        )
+
+    def _decode_all(self, img: np.ndarray) -> List[str]:
+        """Run zxing-cpp (gray or RGB input) with the configured symbologies/options."""
+        return read_texts(img, self.settings)
+
+    def _timed_render(
+        self,
+        page: pdfium.PdfPage,
+        scale: float,
+        report: Optional[DecodeReport],
+        crop: tuple[float, float, float, float] = (0, 0, 0, 0),
+    ) -> np.ndarray:
+        """_render_page that records its wall time and bitmap size in the report."""
+        t0 = time.perf_counter()
+        img = self._render_page(page, scale=scale, crop=crop)
+        if report is not None:
+            report.add_render((time.perf_counter() - t0) * 1000, img.nbytes)
+        return img
+
+    def _timed_decode(self, img: np.ndarray, report: Optional[DecodeReport], native: bool = False) -> List[str]:
+        """_decode_all that records its wall time; native=True also counts the bitmap (not rendered by us)."""
+        t0 = time.perf_counter()
+        vals = self._decode_all(img)
+        if report is not None:
+            report.add_decode((time.perf_counter() - t0) * 1000, img.nbytes if native else 0)
+        return vals
+
+    @staticmethod
+    def _open_document(source: PdfSource) -> pdfium.PdfDocument:
+        """Open a PDF from a path or straight from memory."""
+        if isinstance(source, (str, Path)):
+            return pdfium.PdfDocument(str(source))
+        return pdfium.PdfDocument(_as_pdfium_buffer(source))
+
+    @classmethod
+    def count_pages(cls, source: PdfSource) -> int:
+        """Return the number of pages without rendering anything."""
+        pdf = cls._open_document(source)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def select_pages(self, n_pages: int) -> List[int]:
+        """0-based pages this decoder visits: settings.pages, capped at settings.max_pages."""
+        return select_pages(n_pages, self.settings.pages, self.settings.max_pages)
+
+    @classmethod
+    def page_summary(cls, source: PdfSource, settings: DecodeSettings) -> dict:
+        """Page count and how many pages the selection/cap leaves out (opens the document only)."""
+        n_pages = cls.count_pages(source)
+        selected = len(select_pages(n_pages, settings.pages, settings.max_pages))
+        return {"pages_total": n_pages, "pages_skipped": n_pages - selected}
+
+    @classmethod
+    def estimate_megapixels(cls, source: PdfSource, settings: DecodeSettings) -> float:
+        """
+        Cost estimate for admission: megapixels of the selected pages rendered at
+        their largest (clamped) rung, plus as much again for embedded images
+        decoded at native size (bounded by max_megapixels). Reads page sizes
+        only: no page is loaded, so this stays cheap in the HTTP worker.
+        """
+        base = base_scale_pdf(settings)
+        pixels = 0.0
+        pdf = cls._open_document(source)
+        try:
+            for i in select_pages(len(pdf), settings.pages, settings.max_pages):
+                w, h = pdf.get_page_size(i)
+                steps = rung_scales(w, h, settings, base)
+                render = w * h * steps[-1][1] ** 2 if steps else 0.0
+                pixels += render
+                if settings.embedded_images:
+                    # upper bound without walking page objects (the pool worker does that)
+                    cap = settings.max_megapixels * 1e6 if settings.max_megapixels else render
+                    pixels += min(render, cap)
+        finally:
+            pdf.close()
+        return pixels / 1e6
+
+    def plan_page_ranges(self, n_pages: int) -> List[tuple[int, int]]:
+        """
+        Split the selected pages of an n_pages document into contiguous
+        (start, stop) ranges of positions in that selection, one per page worker.
+        """
+        n_pages = len(self.select_pages(n_pages))
+        parts = max(1, min(self.settings.page_workers, n_pages))
+        size, rest = divmod(n_pages, parts)
+        ranges: list[tuple[int, int]] = []
+        start = 0
+        for k in range(parts):
+            stop = start + size + (1 if k < rest else 0)
+            ranges.append((start, stop))
+            start = stop
+        return ranges
+
+    @staticmethod
+    def _embedded_candidates(
+        page: pdfium.PdfPage, max_megapixels: Optional[float] = None
+    ) -> List[pdfium.PdfImage]:
+        """
+        Image objects worth decoding natively: a dominant image (scanner
+        output) or square-ish pictures of plausible code size. Largest first.
+        Images of more than max_megapixels pixels are left to the clamped page render.
+        """
+        page_w, page_h = page.get_size()
+        page_area = max(page_w * page_h, 1.0)
+        found: list[tuple[float, pdfium.PdfImage]] = []
+        for obj in page.get_objects(filter=(pdfium_c.FPDF_PAGEOBJ_IMAGE,), max_depth=2):
+            left, bottom, right, top = obj.get_bounds()
+            w, h = right - left, top - bottom
+            if w <= 0 or h <= 0:
+                continue
+            area = w * h / page_area
+            code_sized = (
+                0.5 <= w / h <= 2.0
+                and min(w, h) >= CODE_IMAGE_MIN_PT
+                and max(w, h) <= CODE_IMAGE_MAX_PT
+            )
+            if area < DOMINANT_IMAGE_AREA and not code_sized:
+                continue
+            if max_megapixels:
+                px_w, px_h = obj.get_px_size()
+                if px_w * px_h > max_megapixels * 1e6:
+                    continue
+            found.append((area, obj))
+        found.sort(key=lambda x: x[0], reverse=True)
+        return [obj for _, obj in found[:MAX_EMBEDDED_CANDIDATES]]
+
+    @staticmethod
+    def _count_drawn_objects(page: pdfium.PdfPage) -> int:
+        """Page objects that can put ink on the page (form containers and invisible text left out)."""
+        n = 0
+        for obj in page.get_objects(max_depth=2):
+            if obj.type == pdfium_c.FPDF_PAGEOBJ_FORM:
+                continue
+            if (
+                obj.type == pdfium_c.FPDF_PAGEOBJ_TEXT
+                and pdfium_c.FPDFTextObj_GetTextRenderMode(obj.raw) == pdfium_c.FPDF_TEXTRENDERMODE_INVISIBLE
+            ):
+                continue  # OCR layer of a scan
+            n += 1
+        return n
+
+    def _decode_embedded(
+        self, page: pdfium.PdfPage, report: Optional[DecodeReport] = None
+    ) -> tuple[List[str], bool]:
+        """
+        Decode candidate image objects at their native resolution (no page
+        render). Returns (codes, whole_page): whole_page is True when the page
+        draws nothing but the images that yielded codes, so a render cannot add any.
+        """
+        vals: list[str] = []
+        decoded = 0
+        for obj in self._embedded_candidates(page, self.settings.max_megapixels):
+            try:
+                arr = obj.get_bitmap(render=False).to_numpy()
+            except Exception:
+                continue  # unsupported filter/colorspace: the page render will cover it
+            if arr.ndim == 3 and arr.shape[2] == 4:
+                arr = arr[..., :3]  # BGRA/BGRx -> BGR
+            if arr.ndim == 3 and self.settings.grayscale:
+                arr = np.asarray(Image.fromarray(np.ascontiguousarray(arr[..., ::-1])).convert("L"))
+            if not arr.flags["C_CONTIGUOUS"]:
+                arr = np.ascontiguousarray(arr)
+            found = self._timed_decode(arr, report, native=True)
+            decoded += bool(found)
+            for v in found:
+                if v not in vals:
+                    vals.append(v)
+        return vals, bool(vals) and decoded == self._count_drawn_objects(page)
+
+    def _decode_page(
+        self, page: pdfium.PdfPage, report: Optional[DecodeReport] = None, deadline: Optional[float] = None
+    ) -> List[str]:
+        """
+        Try embedded images natively first (if enabled); unless they are all
+        the page draws, also walk the scale ladder and merge its codes after
+        theirs, so vector codes next to a picture are not lost.
+        """
+        vals: list[str] = []
+        if self.settings.embedded_images:
+            vals, whole_page = self._decode_embedded(page, report)
+            if vals:
+                if report is not None:
+                    report.record_embedded()
+                if whole_page:
+                    return vals
+        for v in self._decode_rendered(page, report, deadline, record_miss=not vals):
+            if v not in vals:
+                vals.append(v)
+        return vals
+
+    def _decode_rendered(
+        self,
+        page: pdfium.PdfPage,
+        report: Optional[DecodeReport] = None,
+        deadline: Optional[float] = None,
+        record_miss: bool = True,
+    ) -> List[str]:
+        """
+        Walk the scale ladder cheapest-first; stop at the first step that finds
+        codes, or before the next step once the deadline has passed. Rungs are
+        scaled to target_dpi and clamped to max_megapixels for this page's size.
+        record_miss=False: the page already has codes, a fruitless ladder is no miss.
+        """
+        width, height = page.get_size()
+        steps = rung_scales(width, height, self.settings, base_scale_pdf(self.settings))
+        if not steps or expired(deadline, report):
+            return []
 
-    def extract_from_file(self, pdf_path: Path | str) -> List[str]:
-        """Decode all barcodes from all pages. Returns texts in reading order."""
+        first_rung, first = steps[0]
+        img = self._timed_render(page, first, report)
+        vals = self._timed_decode(img, report)
+        if vals:
+            if report is not None:
+                report.record_scale(first_rung)
+            return vals
+        if len(steps) == 1:
+            if report is not None and record_miss:
+                report.record_scale(None)
+            return []
+        if expired(deadline, report):
+            return []
+
+        # everything from here on is fallback work
+        t0 = time.perf_counter()
+        try:
+            crops: list[tuple[float, float, float, float]] = []
+            if self.settings.roi:
+                boxes = find_candidate_regions(img, self.settings.roi_max_regions, read_options(self.settings))
+                crops = [self._box_to_crop(b, first, img.shape) for b in boxes]
+            del img  # keep only the small crops alive from here on
+            if crops:
+                vals = self._decode_regions(page, crops, steps[1:], report, deadline)
+                if vals:
+                    return vals
+            # nothing code-like on the cheap render, or the regions were false
+            # positives (a code cut by its crop): fall back to full pages
+            for rung, scale in steps[1:]:
+                if expired(deadline, report):
+                    return []
+                vals = self._timed_decode(self._timed_render(page, scale, report), report)
+                if vals:
+                    if report is not None:
+                        report.record_scale(rung)
+                    return vals
+            if report is not None and record_miss:
+                report.record_scale(None)
+            return []
+        finally:
+            if report is not None:
+                report.record_fallback((time.perf_counter() - t0) * 1000, hit=bool(vals))
+
+    def _decode_regions(
+        self,
+        page: pdfium.PdfPage,
+        crops: List[tuple[float, float, float, float]],
+        rungs: Iterable[tuple[float, float]],
+        report: Optional[DecodeReport],
+        deadline: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Re-render only the candidate regions, escalating through the remaining
+        (rung, scale) steps; [] (no miss recorded) when none of them decodes.
+        """
+        width, height = page.get_size()
+        for rung, scale in rungs:
+            if expired(deadline, report):
+                return []
+            vals: list[str] = []
+            for left, bottom, right, top in crops:
+                crop = (left, bottom, right, top)
+                crop_scale = clamp_scale(
+                    scale, width - left - right, height - bottom - top, self.settings.max_megapixels
+                )
+                for v in self._timed_decode(self._timed_render(page, crop_scale, report, crop), report):
+                    if v not in vals:  # overlapping margins may catch a symbol twice
+                        vals.append(v)
+            if vals:
+                if report is not None:
+                    report.record_scale(rung)
+                    report.roi_hits += 1
+                return vals
+        return []
+
+    def iter_pages(
+        self,
+        source: PdfSource,
+        start: int = 0,
+        stop: int | None = None,
+        report: Optional[DecodeReport] = None,
+        deadline: Optional[float] = None,
+    ) -> Iterator[PageResult]:
+        """
+        Decode the selected pages at positions [start, stop) of the selection
+        (see select_pages) lazily, yielding one PageResult per page as soon as
+        it is done. Closing the generator early closes the document, so a
+        consumer that has seen enough simply stops iterating. Past `deadline`
+        (time.time() value) no further page or rung is started.
+        """
+        pdf = self._open_document(source)
+        try:
+            selected = self.select_pages(len(pdf))
+            for i in selected[start:stop]:
+                if expired(deadline, report):
+                    break
+                t0 = time.perf_counter()
+                if report is not None:
+                    report.start_page(i)
+                codes = self._decode_page(pdf[i], report, deadline)
+                yield PageResult(i, codes, round((time.perf_counter() - t0) * 1000, 2))
+        finally:
+            pdf.close()
+
+    def extract_page_range(
+        self,
+        source: PdfSource,
+        start: int,
+        stop: int | None = None,
+        report: Optional[DecodeReport] = None,
+        deadline: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Decode selected pages [start, stop) in reading order (stop=None means to
+        the end). Opens its own PdfDocument, so it is safe to call from a separate process.
+        """
+        limit = self.settings.code_limit()
+        decoded: list[str] = []
+        pages = self.iter_pages(source, start, stop, report, deadline)
+        try:
+            for page in pages:
+                decoded.extend(page.codes)
+                if limit is not None and len(decoded) >= limit:
+                    # enough codes: do not render the remaining pages
+                    if report is not None:
+                        report.stopped_early = True
+                    break
+        finally:
+            pages.close()
+        return decoded if limit is None else decoded[:limit]
+
+    def extract_from_file(
+        self,
+        pdf_path: Path | str,
+        report: Optional[DecodeReport] = None,
+        deadline: Optional[float] = None,
+        *,
+        executor: Executor | None = None,
+    ) -> List[str]:
+        """
+        Decode all barcodes from the selected pages (settings.pages/max_pages,
+        every page by default). Returns texts in reading order.
+
+        With settings.page_workers > 1 page ranges are decoded in parallel on
+        `executor` (or on a temporary process pool when none is given).
+        A `deadline` (time.time() value) stops decoding between pages and rungs;
+        report.deadline_exceeded then marks the codes as partial.
+        """
         pdf_path = Path(pdf_path)
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
+        return self._extract(pdf_path, executor, report, deadline)
 
-        pdf = pdfium.PdfDocument(str(pdf_path))
-        decoded: list[str] = []
+    def extract_from_bytes(
+        self,
+        data: bytes | bytearray | memoryview,
+        report: Optional[DecodeReport] = None,
+        deadline: Optional[float] = None,
+        *,
+        executor: Executor | None = None,
+    ) -> List[str]:
+        """Same as extract_from_file, but pdfium reads the document straight from memory."""
+        return self._extract(data, executor, report, deadline)
 
-        for i in range(len(pdf)):
-            page = pdf[i]
-            img = self._render_page_rgb(page, scale=self.settings.scale)
-            vals = self._decode_all(img)
+    def _extract(
+        self,
+        source: PdfSource,
+        executor: Executor | None,
+        report: Optional[DecodeReport],
+        deadline: Optional[float] = None,
+    ) -> List[str]:
+        if self.settings.page_workers <= 1:
+            return self.extract_page_range(source, 0, report=report, deadline=deadline)
 
-            if not vals and self.settings.fallback_scale:
-                img2 = self._render_page_rgb(page, scale=self.settings.fallback_scale)
-                vals = self._decode_all(img2)
+        ranges = self.plan_page_ranges(self.count_pages(source))
+        if len(ranges) <= 1:
+            return self.extract_page_range(source, *ranges[0], report=report, deadline=deadline) if ranges else []
 
-            decoded.extend(vals)
+        if isinstance(source, memoryview):
+            source = source.tobytes()  # crosses a process boundary anyway; views do not pickle
 
-        return decoded
+        own_executor = executor is None
+        if own_executor:
+            # pdfium is not thread-safe: use processes, never threads
+            executor = ProcessPoolExecutor(
+                max_workers=len(ranges),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        limit = self.settings.code_limit()
+        try:
+            futures = [executor.submit(decode_range_job, self, source, a, b, deadline) for a, b in ranges]
+            decoded: list[str] = []
+            for k, fut in enumerate(futures):  # submission order == reading order
+                codes, part = fut.result()
+                decoded.extend(codes)
+                if report is not None:
+                    report.merge(part)
+                if limit is not None and len(decoded) >= limit:
+                    # later ranges are not needed; drop the ones that have not started
+                    for rest in futures[k + 1:]:
+                        rest.cancel()
+                    if report is not None:
+                        report.stopped_early = True
+                    return decoded[:limit]
+            return decoded
+        finally:
+            if own_executor:
+                executor.shutdown(wait=True, cancel_futures=True)
 
 
-__all__ = ["PdfBarcodeDecoder", "DecodeSettings"]
+__all__ = ["PdfBarcodeDecoder", "DecodeSettings", "DecodeReport", "PageResult", "decode_range_job"]
@@ -0,0 +1,106 @@
+# src/qrparser/core/regions.py
+# comments in English only
+# Cheap candidate-region search on a low-resolution render (region-of-interest mode).
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import zxingcpp  # Python bindings for zxing-cpp
+
+# (x0, y0, x1, y1) in pixels of the image the box was found in, x1/y1 exclusive
+Box = Tuple[int, int, int, int]
+
+TILE = 16                 # tile edge in pixels of the detection image
+CORE_DENSITY = 0.15       # min(horizontal, vertical) transition rate of a code-like tile
+EDGE_DENSITY = 0.08       # weaker tiles that may be attached to a core tile
+MIN_CORE_TILES = 2
+
+
+def zxing_regions(img: np.ndarray, options: Optional[Dict[str, Any]] = None) -> List[Box]:
+    """Symbols zxing located but could not decode (checksum/format errors)."""
+    boxes: list[Box] = []
+    for r in zxingcpp.read_barcodes(img, return_errors=True, **(options or {})):
+        pos = getattr(r, "position", None)
+        if pos is None:
+            continue
+        pts = (pos.top_left, pos.top_right, pos.bottom_right, pos.bottom_left)
+        xs, ys = [p.x for p in pts], [p.y for p in pts]
+        boxes.append((min(xs), min(ys), max(xs) + 1, max(ys) + 1))
+    return boxes
+
+
+def _tile_means(a: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    return a.reshape(rows, TILE, cols, TILE).mean(axis=(1, 3))
+
+
+def texture_regions(gray: np.ndarray, max_regions: int) -> List[Box]:
+    """
+    Finder-free heuristic: 2D codes are dense in black/white transitions in
+    *both* directions, unlike text lines or rules. Tiles passing that test are
+    grouped into connected components and returned as boxes, best first.
+    """
+    if gray.ndim == 3:
+        gray = gray.mean(axis=2)
+    rows, cols = gray.shape[0] // TILE, gray.shape[1] // TILE
+    if rows == 0 or cols == 0:
+        return []
+
+    b = gray[: rows * TILE, : cols * TILE] < 128
+    h = np.zeros_like(b)
+    v = np.zeros_like(b)
+    h[:, 1:] = b[:, 1:] != b[:, :-1]
+    v[1:, :] = b[1:, :] != b[:-1, :]
+    density = np.minimum(_tile_means(h, rows, cols), _tile_means(v, rows, cols))
+
+    core = density > CORE_DENSITY
+    grow = density > EDGE_DENSITY
+    seen = np.zeros_like(core)
+    found: list[tuple[float, Box]] = []
+
+    for r0, c0 in zip(*np.nonzero(core)):
+        if seen[r0, c0]:
+            continue
+        # flood fill over "grow" tiles starting from a core tile
+        stack = [(r0, c0)]
+        seen[r0, c0] = True
+        tiles: list[tuple[int, int]] = []
+        n_core = 0
+        while stack:
+            r, c = stack.pop()
+            tiles.append((r, c))
+            n_core += int(core[r, c])
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if 0 <= nr < rows and 0 <= nc < cols and grow[nr, nc] and not seen[nr, nc]:
+                    seen[nr, nc] = True
+                    stack.append((nr, nc))
+        if n_core < MIN_CORE_TILES:
+            continue
+        rs = [t[0] for t in tiles]
+        cs = [t[1] for t in tiles]
+        box = (int(min(cs)) * TILE, int(min(rs)) * TILE, (int(max(cs)) + 1) * TILE, (int(max(rs)) + 1) * TILE)
+        score = float(sum(density[t] for t in tiles))
+        found.append((score, box))
+
+    found.sort(key=lambda x: x[0], reverse=True)
+    return [box for _, box in found[:max_regions]]
+
+
+def find_candidate_regions(
+    img: np.ndarray, max_regions: int = 8, options: Optional[Dict[str, Any]] = None
+) -> List[Box]:
+    """zxing positions first (precise), then the texture heuristic."""
+    boxes = zxing_regions(img, options)
+    for box in texture_regions(img, max_regions):
+        if len(boxes) >= max_regions:
+            break
+        if not any(_overlaps(box, b) for b in boxes):
+            boxes.append(box)
+    return boxes[:max_regions]
+
+
+def _overlaps(a: Box, b: Box) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+__all__ = ["Box", "find_candidate_regions", "texture_regions", "zxing_regions"]
@@ -0,0 +1,160 @@
+# src/qrparser/core/report.py
+# comments in English only
+# Mutable per-call statistics filled in by the decoders.
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class PageStats:
+    """Where the time went on one page (or image)."""
+    index: int
+    render_ms: float = 0.0
+    decode_ms: float = 0.0
+    # bytes of every bitmap handed to zxing (renders, crops, resized frames)
+    bitmap_bytes: int = 0
+    # rung whose codes were returned; None for a miss or a page covered by its embedded images
+    scale: Optional[float] = None
+    embedded: bool = False
+    # rungs after the first one were tried
+    fallback: bool = False
+
+    def as_dict(self) -> dict:
+        d = asdict(self)
+        d["render_ms"] = round(self.render_ms, 2)
+        d["decode_ms"] = round(self.decode_ms, 2)
+        return d
+
+
+@dataclass
+class DecodeReport:
+    """
+    Optional side channel for decode statistics.
+
+    Pass an instance to extract_from_file/extract_from_bytes; decoders record
+    into it and the caller reads it afterwards. Picklable, so worker processes
+    can return it next to the codes.
+    """
+    # pages actually visited (early exit and page limits keep this below the page count)
+    pages: int = 0
+    # decoding stopped because the requested number of codes was reached
+    stopped_early: bool = False
+    # decoding stopped at the request deadline; the codes are what was found so far
+    deadline_exceeded: bool = False
+    # scale rung -> number of pages/images whose codes were found at that rung
+    scale_hits: Dict[float, int] = field(default_factory=dict)
+    # pages/images where no rung found anything
+    misses: int = 0
+    # pages decoded from region-of-interest crops instead of full renders
+    roi_hits: int = 0
+    # pages decoded straight from an embedded image, without rendering
+    embedded_hits: int = 0
+    # wall time spent producing bitmaps (pdfium render / Pillow resize) and in zxing
+    render_ms: float = 0.0
+    decode_ms: float = 0.0
+    bitmap_bytes: int = 0
+    # pages/images where the first rung found nothing, how many of those a later
+    # rung rescued, and the time spent on those later rungs
+    fallback_pages: int = 0
+    fallback_hits: int = 0
+    fallback_ms: float = 0.0
+    # one entry per visited page, in reading order
+    page_stats: List[PageStats] = field(default_factory=list)
+
+    @property
+    def _current(self) -> Optional[PageStats]:
+        return self.page_stats[-1] if self.page_stats else None
+
+    def start_page(self, index: int) -> None:
+        """Open the entry that the following add_*/record_* calls fill in."""
+        self.pages += 1
+        self.page_stats.append(PageStats(index))
+
+    def add_render(self, ms: float, nbytes: int) -> None:
+        self.render_ms += ms
+        self.bitmap_bytes += nbytes
+        page = self._current
+        if page is not None:
+            page.render_ms += ms
+            page.bitmap_bytes += nbytes
+
+    def add_decode(self, ms: float, nbytes: int = 0) -> None:
+        """zxing time; nbytes counts bitmaps that were not rendered by us (embedded images)."""
+        self.decode_ms += ms
+        self.bitmap_bytes += nbytes
+        page = self._current
+        if page is not None:
+            page.decode_ms += ms
+            page.bitmap_bytes += nbytes
+
+    def record_embedded(self) -> None:
+        self.embedded_hits += 1
+        page = self._current
+        if page is not None:
+            page.embedded = True
+
+    def record_scale(self, scale: Optional[float]) -> None:
+        if scale is None:
+            self.misses += 1
+        else:
+            self.scale_hits[scale] = self.scale_hits.get(scale, 0) + 1
+        page = self._current
+        if page is not None:
+            page.scale = scale
+
+    def record_fallback(self, ms: float, hit: bool) -> None:
+        self.fallback_pages += 1
+        self.fallback_hits += int(hit)
+        self.fallback_ms += ms
+        page = self._current
+        if page is not None:
+            page.fallback = True
+
+    def merge(self, other: "DecodeReport") -> None:
+        self.pages += other.pages
+        self.stopped_early = self.stopped_early or other.stopped_early
+        self.deadline_exceeded = self.deadline_exceeded or other.deadline_exceeded
+        for scale, n in other.scale_hits.items():
+            self.scale_hits[scale] = self.scale_hits.get(scale, 0) + n
+        self.misses += other.misses
+        self.roi_hits += other.roi_hits
+        self.embedded_hits += other.embedded_hits
+        self.render_ms += other.render_ms
+        self.decode_ms += other.decode_ms
+        self.bitmap_bytes += other.bitmap_bytes
+        self.fallback_pages += other.fallback_pages
+        self.fallback_hits += other.fallback_hits
+        self.fallback_ms += other.fallback_ms
+        self.page_stats.extend(other.page_stats)
+
+    def as_log(self) -> dict:
+        """Flat, JSON-friendly view for request logs."""
+        return {
+            "pages_decoded": self.pages,
+            "stopped_early": self.stopped_early,
+            "partial": self.deadline_exceeded,
+            "scale_hits": {str(k): v for k, v in sorted(self.scale_hits.items())},
+            "scale_misses": self.misses,
+            "roi_hits": self.roi_hits,
+            "embedded_hits": self.embedded_hits,
+            "render_ms": round(self.render_ms, 2),
+            "decode_ms": round(self.decode_ms, 2),
+            "bitmap_bytes": self.bitmap_bytes,
+            "fallback_pages": self.fallback_pages,
+            "fallback_hits": self.fallback_hits,
+            "fallback_ms": round(self.fallback_ms, 2),
+            "page_stats": [p.as_dict() for p in self.page_stats],
+        }
+
+
+@dataclass
+class PageResult:
+    """Codes of one page, yielded by the page iterator as soon as the page is done."""
+    index: int
+    codes: List[str] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+
+__all__ = ["DecodeReport", "PageResult", "PageStats"]
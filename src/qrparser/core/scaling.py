@@ -0,0 +1,61 @@
+# src/qrparser/core/scaling.py
+# comments in English only
+# Per-page/per-image render scales: target resolution and the bitmap size cap.
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+from .decode_settings import DecodeSettings
+
+PDF_POINTS_PER_INCH = 72.0
+# images have no physical size; target_dpi maps them onto an A4 page at that resolution
+REFERENCE_PAGE_IN = (8.27, 11.69)
+# rungs whose clamped scales differ by less than this would render the same bitmap
+SAME_SCALE_TOLERANCE = 0.01
+
+
+def base_scale_pdf(settings: DecodeSettings) -> float:
+    """Scale of the 1.0 rung for PDF pages: target_dpi, or 72 dpi (one pixel per point)."""
+    return settings.target_dpi / PDF_POINTS_PER_INCH if settings.target_dpi else 1.0
+
+
+def base_scale_image(width: int, height: int, settings: DecodeSettings) -> float:
+    """
+    Scale of the 1.0 rung for an image of width x height pixels: with
+    target_dpi, the one that gives it the pixel count of a reference page at
+    that resolution (small images grow, big photos shrink); else 1.0.
+    """
+    if not settings.target_dpi or width <= 0 or height <= 0:
+        return 1.0
+    ref = REFERENCE_PAGE_IN[0] * REFERENCE_PAGE_IN[1] * settings.target_dpi ** 2
+    return math.sqrt(ref / (width * height))
+
+
+def clamp_scale(scale: float, width: float, height: float, max_megapixels: Optional[float]) -> float:
+    """Largest scale <= `scale` at which a width x height source stays within max_megapixels."""
+    if not max_megapixels or width <= 0 or height <= 0:
+        return scale
+    # renderers round each side up, so solve (width*s + 1) * (height*s + 1) <= cap for s
+    cap, b = max_megapixels * 1e6, width + height
+    limit = (math.sqrt(b * b + 4 * width * height * (cap - 1)) - b) / (2 * width * height)
+    return min(scale, max(limit, 0.0))
+
+
+def rung_scales(
+    width: float, height: float, settings: DecodeSettings, base: float = 1.0
+) -> tuple[tuple[float, float], ...]:
+    """
+    (rung, effective scale) pairs to try for a source of width x height at
+    scale 1.0, cheapest first. Rungs clamped onto the previous one are dropped.
+    """
+    out: list[tuple[float, float]] = []
+    for rung in settings.ladder():
+        scale = clamp_scale(rung * base, width, height, settings.max_megapixels)
+        if out and scale <= out[-1][1] * (1 + SAME_SCALE_TOLERANCE):
+            continue
+        out.append((rung, scale))
+    return tuple(out)
+
+
+__all__ = ["base_scale_image", "base_scale_pdf", "clamp_scale", "rung_scales"]
@@ -0,0 +1,55 @@
+# src/qrparser/core/symbology.py
+# comments in English only
+# Translate DecodeSettings into zxing-cpp reader options.
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import zxingcpp  # Python bindings for zxing-cpp
+
+from .decode_settings import DecodeSettings
+
+BINARIZERS = ("LocalAverage", "GlobalHistogram", "FixedThreshold", "BoolCast")
+
+
+def parse_formats(names: Optional[Iterable[str]]) -> Optional[zxingcpp.BarcodeFormats]:
+    """
+    'QRCode', 'DataMatrix', 'MicroQRCode', ... -> zxing BarcodeFormats.
+    None/empty means every format. Raises ValueError on unknown names.
+    """
+    names = [n.strip() for n in (names or ()) if n and n.strip()]
+    if not names:
+        return None
+    return zxingcpp.barcode_formats_from_str(",".join(names))
+
+
+@lru_cache(maxsize=64)
+def read_options(settings: DecodeSettings) -> Dict[str, Any]:
+    """
+    Keyword arguments for zxingcpp.read_barcodes. try_harder=False switches
+    off every extra pass (rotation, downscaled pyramid, inverted image).
+    """
+    if settings.binarizer not in BINARIZERS:
+        raise ValueError(f"Unknown binarizer: {settings.binarizer}")
+    opts: Dict[str, Any] = {
+        "try_rotate": settings.try_harder and settings.try_rotate,
+        "try_downscale": settings.try_harder and settings.try_downscale,
+        "try_invert": settings.try_harder and settings.try_invert,
+        "binarizer": getattr(zxingcpp.Binarizer, settings.binarizer),
+        "is_pure": settings.is_pure,
+    }
+    formats = parse_formats(settings.formats)
+    if formats is not None:
+        opts["formats"] = formats
+    return opts
+
+
+def read_texts(img: np.ndarray, settings: DecodeSettings) -> List[str]:
+    """Run zxing-cpp with the configured options and return non-empty texts."""
+    results = zxingcpp.read_barcodes(img, **read_options(settings))
+    return [r.text for r in results if getattr(r, "text", None)]
+
+
+__all__ = ["BINARIZERS", "parse_formats", "read_options", "read_texts"]
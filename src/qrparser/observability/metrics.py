@@ -0,0 +1,185 @@
+# src/qrparser/observability/metrics.py
+# comments in English only
+# Prometheus metrics (optional: needs prometheus-client, enabled by QR_ENABLE_PROMETHEUS).
+from __future__ import annotations
+
+import os
+from typing import Any, Iterable, Optional
+
+from qrparser.observability.logging import get_logger
+
+logger = get_logger(__name__)
+
+# standard prometheus_client switch for multiprocess mode (one file set per process)
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# request latency buckets (seconds); decode stages share them
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _Metrics:
+    """Metric objects; created once per process because the registry rejects duplicates."""
+
+    def __init__(self) -> None:
+        from prometheus_client import Counter, Gauge, Histogram
+
+        self.requests = Counter(
+            "qrparser_requests_total", "HTTP requests by endpoint, status and upload MIME type.",
+            ["endpoint", "status", "mime"],
+        )
+        self.request_seconds = Histogram(
+            "qrparser_request_duration_seconds", "End-to-end request latency.",
+            ["endpoint"], buckets=LATENCY_BUCKETS,
+        )
+        self.upload_read_seconds = Histogram(
+            "qrparser_upload_read_seconds", "Time spent receiving an upload body.",
+            buckets=LATENCY_BUCKETS,
+        )
+        self.render_seconds = Histogram(
+            "qrparser_render_seconds", "Per-document time spent rendering/resizing bitmaps.",
+            buckets=LATENCY_BUCKETS,
+        )
+        self.decode_seconds = Histogram(
+            "qrparser_zxing_decode_seconds", "Per-document time spent in zxing.",
+            buckets=LATENCY_BUCKETS,
+        )
+        self.fallback_seconds = Histogram(
+            "qrparser_fallback_seconds", "Per-document time spent on rungs after the first one.",
+            buckets=LATENCY_BUCKETS,
+        )
+        self.pages = Counter("qrparser_pages_processed_total", "PDF pages and images decoded.")
+        self.fallback_pages = Counter(
+            "qrparser_fallback_pages_total", "Pages/images where the first rung found nothing."
+        )
+        self.fallback_hits = Counter(
+            "qrparser_fallback_hits_total", "Fallback pages/images where a later rung found codes."
+        )
+        self.admission_rejected = Counter(
+            "qrparser_admission_rejected_total", "Parse requests turned away with 503 by admission control.",
+            ["reason"],
+        )
+        # livesum: add up the values of processes that are still alive
+        self.pool_queue_depth = Gauge(
+            "qrparser_pool_queue_depth", "Decode jobs waiting for a pool worker.",
+            multiprocess_mode="livesum",
+        )
+        self.decodes_in_flight = Gauge(
+            "qrparser_decodes_in_flight", "Decode jobs running in pool workers.",
+            multiprocess_mode="livesum",
+        )
+
+
+_metrics: Optional[_Metrics] = None
+
+
+def multiprocess_mode() -> bool:
+    """True when samples are aggregated across processes (uvicorn workers > 1)."""
+    return bool(os.environ.get(MULTIPROC_ENV))
+
+
+def setup_metrics() -> None:
+    """
+    Create the metric objects (idempotent). In multiprocess mode
+    PROMETHEUS_MULTIPROC_DIR must be set before this first runs, which
+    qrparser.web.serve does for HTTP_WORKERS > 1.
+    """
+    global _metrics
+    if _metrics is not None:
+        return
+    try:
+        _metrics = _Metrics()
+    except ImportError:
+        raise RuntimeError(
+            "QR_ENABLE_PROMETHEUS=true needs prometheus-client (pip install 'qrparser[metrics]')"
+        ) from None
+    logger.info("metrics_enabled", multiprocess=multiprocess_mode())
+
+
+def enabled() -> bool:
+    return _metrics is not None
+
+
+def observe_request(endpoint: str, status: int, mime: str, seconds: float) -> None:
+    if _metrics is None:
+        return
+    _metrics.requests.labels(endpoint=endpoint, status=str(status), mime=mime).inc()
+    _metrics.request_seconds.labels(endpoint=endpoint).observe(seconds)
+
+
+def observe_upload_read(seconds: float) -> None:
+    if _metrics is not None:
+        _metrics.upload_read_seconds.observe(seconds)
+
+
+def observe_report(report: Any) -> None:
+    """Record the stage timings and counters of one DecodeReport."""
+    if _metrics is None or report is None:
+        return
+    if not report.pages:
+        return  # cache hit or a decoder that does not fill a report
+    _metrics.pages.inc(report.pages)
+    _metrics.render_seconds.observe(report.render_ms / 1000)
+    _metrics.decode_seconds.observe(report.decode_ms / 1000)
+    if report.fallback_pages:
+        _metrics.fallback_pages.inc(report.fallback_pages)
+        _metrics.fallback_hits.inc(report.fallback_hits)
+        _metrics.fallback_seconds.observe(report.fallback_ms / 1000)
+
+
+def observe_rejection(reason: str) -> None:
+    if _metrics is not None:
+        _metrics.admission_rejected.labels(reason=reason).inc()
+
+
+def set_pool_load(pending: int, workers: int) -> None:
+    """Jobs submitted but not finished, split into running and queued for a FIFO pool."""
+    if _metrics is None:
+        return
+    _metrics.decodes_in_flight.set(min(pending, workers))
+    _metrics.pool_queue_depth.set(max(0, pending - workers))
+
+
+def mime_label(mime: Optional[str], allowed: Iterable[str]) -> str:
+    """Bound label cardinality: accepted types as-is, everything else as 'other'."""
+    if not mime:
+        return "none"
+    mime = mime.lower()
+    return mime if mime in allowed else "other"
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Exposition body and content type for the metrics endpoint."""
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+    if multiprocess_mode():
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop the live gauges of an exiting worker (multiprocess mode only)."""
+    if _metrics is None or not multiprocess_mode():
+        return
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(pid or os.getpid())
+
+
+__all__ = [
+    "MULTIPROC_ENV",
+    "enabled",
+    "mark_process_dead",
+    "mime_label",
+    "multiprocess_mode",
+    "observe_rejection",
+    "observe_report",
+    "observe_request",
+    "observe_upload_read",
+    "render_latest",
+    "set_pool_load",
+    "setup_metrics",
+]
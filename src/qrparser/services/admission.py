@@ -0,0 +1,176 @@
+# src/qrparser/services/admission.py
+# comments in English only
+# Admission control: bounded requests in flight and a megapixel budget for decodes.
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Literal, Optional
+
+RejectReason = Literal["queue_full", "queue_timeout", "budget_timeout"]
+
+
+class AdmissionRejected(Exception):
+    """Raised by acquire() when the request should be turned away (503 + Retry-After)."""
+
+    def __init__(self, reason: RejectReason, retry_after: int) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Per-process gate in front of the decode stage.
+
+    At most `capacity` requests hold a slot; up to `max_queued` more wait for
+    one in FIFO order, each for at most `max_wait` seconds. Anything beyond
+    that is rejected at once, so a load balancer can retry on another replica
+    instead of piling work onto this one. Single event loop, no locking.
+    """
+
+    def __init__(self, capacity: int, max_queued: int, max_wait: float, retry_after: int = 2) -> None:
+        self.capacity = capacity
+        self.max_queued = max_queued
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self.running = 0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> Optional["AdmissionController"]:
+        """None when QR_ADMISSION_ENABLED=false."""
+        if not settings.ADMISSION_ENABLED:
+            return None
+        return cls(
+            capacity=settings.CONCURRENCY,
+            max_queued=settings.CONCURRENCY * settings.ADMISSION_QUEUE_PER_WORKER,
+            max_wait=settings.ADMISSION_MAX_WAIT_SECONDS,
+            retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+        )
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in line if needed; raises AdmissionRejected."""
+        if self.running < self.capacity and not self._waiters:
+            self.running += 1
+            return
+        if len(self._waiters) >= self.max_queued:
+            raise AdmissionRejected("queue_full", self.retry_after)
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # shield: a timeout must not cancel a slot that release() just handed over
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done():
+                self.release()  # handed a slot at the last moment; pass it on
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise AdmissionRejected("queue_timeout", self.retry_after) from None
+
+    def release(self) -> None:
+        """Give the slot to the oldest waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"admission_running": self.running, "admission_waiting": self.waiting}
+
+
+class PixelBudget:
+    """
+    Per-process budget of estimated megapixels being decoded at once.
+
+    A decode reserves its cost estimate (pixels rendered at the largest rung)
+    and waits, FIFO, until it fits; a waiting big job is never overtaken by
+    small ones, so it cannot starve. A job larger than the whole budget runs
+    once nothing else does. Waiting longer than `max_wait` is rejected.
+    """
+
+    def __init__(self, megapixels: float, max_wait: float, retry_after: int = 2) -> None:
+        self.megapixels = megapixels
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self.in_flight = 0.0
+        self._waiters: Deque[tuple[float, asyncio.Future[None]]] = deque()
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> Optional["PixelBudget"]:
+        """None when QR_ADMISSION_MEGAPIXELS is 0 (or admission is disabled)."""
+        if not settings.ADMISSION_ENABLED or settings.ADMISSION_MEGAPIXELS <= 0:
+            return None
+        return cls(
+            megapixels=settings.ADMISSION_MEGAPIXELS,
+            max_wait=settings.ADMISSION_MAX_WAIT_SECONDS,
+            retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+        )
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, cost: float, max_wait: Optional[float] = None) -> float:
+        """
+        Reserve `cost` megapixels (capped at the budget); returns what to release().
+        `max_wait` overrides the budget's own wait (background jobs can wait longer).
+        """
+        cost = min(max(cost, 0.0), self.megapixels)
+        if not self._waiters and self.in_flight + cost <= self.megapixels:
+            self.in_flight += cost
+            return cost
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        entry = (cost, waiter)
+        self._waiters.append(entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait if max_wait is None else max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done():
+                self.release(cost)  # reserved for us at the last moment; give it back
+            else:
+                waiter.cancel()
+                self._waiters.remove(entry)
+                self._wake()  # whoever queued behind us may fit now
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise AdmissionRejected("budget_timeout", self.retry_after) from None
+        return cost
+
+    def release(self, cost: float) -> None:
+        self.in_flight = max(0.0, self.in_flight - cost)
+        self._wake()
+
+    def _wake(self) -> None:
+        # strict FIFO: stop at the first waiter that does not fit
+        while self._waiters and self.in_flight + self._waiters[0][0] <= self.megapixels:
+            cost, waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += cost
+                waiter.set_result(None)
+
+    @asynccontextmanager
+    async def reserve(self, cost: float, max_wait: Optional[float] = None) -> AsyncIterator[float]:
+        granted = await self.acquire(cost, max_wait)
+        try:
+            yield granted
+        finally:
+            self.release(granted)
+
+    def stats(self) -> Dict[str, float]:
+        return {"megapixels_in_flight": round(self.in_flight, 1), "budget_waiting": self.waiting}
+
+
+__all__ = ["AdmissionController", "AdmissionRejected", "PixelBudget"]
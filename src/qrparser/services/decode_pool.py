@@ -0,0 +1,290 @@
+# src/qrparser/services/decode_pool.py
+# comments in English only
+# Process pool that keeps CPU-bound pdfium/zxing work off the event loop.
+from __future__ import annotations
+
+import asyncio
+import inspect
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, List, Optional, TypeVar
+
+from qrparser.core.pdf_decoder import decode_range_job
+from qrparser.core.report import DecodeReport, PageResult
+from qrparser.observability import metrics
+from qrparser.observability.logging import get_logger
+
+T = TypeVar("T")
+
+# how often a streaming consumer re-checks whether its worker job died
+STREAM_POLL_SECONDS = 0.5
+
+# pdfium is not thread-safe: all pdfium work done in this process (thread-fallback
+# decodes, page counts, cost estimates) runs under this one lock
+PDFIUM_LOCK = threading.Lock()
+
+logger = get_logger(__name__)
+
+
+def decode_file(decoder: Any, path: Path, mime: str) -> List[str]:
+    """
+    Run a decoder against a file and return a plain list of texts.
+    Module-level so it can be pickled into pool workers.
+    """
+    if hasattr(decoder, "extract_from_file") and "mime" in decoder.extract_from_file.__code__.co_varnames:
+        return list(decoder.extract_from_file(path, mime))  # CompositeDecoder
+    return list(decoder.extract_from_pdf(path))  # backward compatibility if needed
+
+
+def _call_locked(fn: Callable[..., T], *args: Any) -> T:
+    with PDFIUM_LOCK:
+        return fn(*args)
+
+
+async def run_in_process(fn: Callable[..., T], /, *args: Any) -> T:
+    """
+    Run a short pdfium call (page count, page sizes) in a thread of this
+    process, serialized with all other in-process pdfium work.
+    """
+    return await asyncio.to_thread(_call_locked, fn, *args)
+
+
+def _accepts(fn: Callable[..., Any], name: str) -> bool:
+    try:
+        return name in inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def decode_bytes(
+    decoder: Any, data: bytes, mime: str, deadline: Optional[float] = None
+) -> tuple[List[str], DecodeReport]:
+    """
+    Run a decoder against an in-memory upload; returns (codes, report).
+    Decoders without extract_from_bytes get a temp file as before, and
+    decoders that do not fill a report (or honor a deadline) leave it empty.
+    """
+    report = DecodeReport()
+    if hasattr(decoder, "extract_from_bytes"):
+        kwargs: dict[str, Any] = {}
+        if _accepts(decoder.extract_from_bytes, "report"):
+            kwargs["report"] = report
+        if deadline is not None and _accepts(decoder.extract_from_bytes, "deadline"):
+            kwargs["deadline"] = deadline
+        return list(decoder.extract_from_bytes(data, mime, **kwargs)), report
+
+    suffix = ".pdf" if mime == "application/pdf" else ".bin"
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        tmp.write(data)
+        tmp_path = Path(tmp.name)
+    try:
+        return decode_file(decoder, tmp_path, mime), report
+    finally:
+        try: os.unlink(tmp_path)
+        except OSError: pass
+
+
+def stream_pages(
+    decoder: Any, data: bytes, mime: str, sink: Any, stop: Any = None, deadline: Optional[float] = None
+) -> None:
+    """
+    Pool job behind streaming responses: put ("page", PageResult) into `sink`
+    for every page as soon as it is decoded, then ("done", DecodeReport) or
+    ("error", message). `stop` (an Event) is checked between pages, `deadline`
+    between pages and scale rungs. Decoders without a page iterator produce a single page 0.
+    """
+    report = DecodeReport()
+    target = decoder.decoder_for(mime) if hasattr(decoder, "decoder_for") else decoder
+    try:
+        if hasattr(target, "iter_pages"):
+            limit = target.settings.code_limit()
+            found = 0
+            pages = target.iter_pages(data, report=report, deadline=deadline)
+            try:
+                for page in pages:
+                    if limit is not None and found + len(page.codes) >= limit:
+                        page.codes = page.codes[: limit - found]
+                        report.stopped_early = True
+                        sink.put(("page", page))
+                        break
+                    found += len(page.codes)
+                    sink.put(("page", page))
+                    if stop is not None and stop.is_set():
+                        break
+            finally:
+                pages.close()
+        else:
+            t0 = time.perf_counter()
+            codes, report = decode_bytes(decoder, data, mime, deadline)
+            sink.put(("page", PageResult(0, codes, round((time.perf_counter() - t0) * 1000, 2))))
+        sink.put(("done", report))
+    except Exception as e:
+        sink.put(("error", f"{type(e).__name__}: {e}"))
+
+
+class DecodePool:
+    """
+    Managed process pool for decode jobs.
+
+    Started/stopped by the app lifespan. When the pool is not running
+    (e.g. TestClient without lifespan) jobs fall back to a thread so the
+    event loop still stays responsive; those jobs are serialized under
+    PDFIUM_LOCK because pdfium is not thread-safe.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        # multiprocessing manager for cross-process result queues (streaming only)
+        self._manager: Any = None
+        self._manager_lock = threading.Lock()
+        # jobs submitted and not finished yet (running + waiting for a worker)
+        self.pending = 0
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def _track(self, delta: int) -> None:
+        self.pending += delta
+        # the thread fallback runs one job at a time
+        metrics.set_pool_load(self.pending, self.max_workers if self.started else 1)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # 'spawn' avoids forking a process that already holds pdfium/thread state
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = self._new_executor()
+            logger.info("decode_pool_started", workers=self.max_workers)
+
+    def shutdown(self) -> None:
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info("decode_pool_stopped")
+
+    async def run(self, fn: Callable[..., T], /, *args: Any) -> T:
+        """Execute fn(*args) in a worker process and await the result."""
+        self._track(1)
+        try:
+            if self._executor is None:
+                return await asyncio.to_thread(_call_locked, fn, *args)
+
+            loop = asyncio.get_running_loop()
+            executor = self._executor
+            try:
+                return await loop.run_in_executor(executor, partial(fn, *args))
+            except BrokenProcessPool:
+                # a worker died (OOM kill, segfault); replace the pool for the next request,
+                # unless another job that failed with it already did
+                if self._executor is executor:
+                    logger.error("decode_pool_broken", workers=self.max_workers)
+                    self._executor = self._new_executor()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        finally:
+            self._track(-1)
+
+    def _get_manager(self) -> Any:
+        with self._manager_lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+            return self._manager
+
+    async def stream(self, fn: Callable[..., None], /, *args: Any) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Run fn(*args, sink, stop) in a worker and yield the (kind, payload)
+        items it puts into sink until a "done" or "error" item. Closing the
+        iterator early sets `stop` so the worker can quit between pages.
+        """
+        if self._executor is None:
+            sink: Any = queue.Queue()
+            stop: Any = threading.Event()
+            job = asyncio.ensure_future(asyncio.to_thread(_call_locked, fn, *args, sink, stop))
+            self._track(1)
+            job.add_done_callback(lambda _t: self._track(-1))
+        else:
+            manager = await asyncio.to_thread(self._get_manager)
+            sink, stop = manager.Queue(), manager.Event()
+            job = asyncio.ensure_future(self.run(fn, *args, sink, stop))
+        try:
+            while True:
+                try:
+                    kind, payload = await asyncio.to_thread(sink.get, True, STREAM_POLL_SECONDS)
+                except queue.Empty:
+                    if job.done():
+                        job.result()  # re-raise a worker failure (e.g. BrokenProcessPool)
+                        return
+                    continue
+                yield kind, payload
+                if kind in ("done", "error"):
+                    return
+        finally:
+            stop.set()
+            # the job finishes on its own; keep its outcome from being reported as unretrieved
+            job.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def run_page_ranges(
+        self,
+        decoder: Any,
+        source: Path | bytes,
+        deadline: Optional[float] = None,
+        n_pages: Optional[int] = None,
+    ) -> tuple[List[str], DecodeReport]:
+        """
+        Fan a PDF out over the pool as contiguous page ranges (one task per
+        range, each worker opens its own document) and join in reading order.
+        Pass `n_pages` when the caller already knows it; otherwise the document
+        is counted on the pool first.
+        """
+        if n_pages is None:
+            n_pages = await self.run(decoder.count_pages, source)
+        ranges = decoder.plan_page_ranges(n_pages)
+        limit = decoder.settings.code_limit()
+        tasks = [
+            asyncio.ensure_future(self.run(decode_range_job, decoder, source, a, b, deadline))
+            for a, b in ranges
+        ]
+        report = DecodeReport()
+        codes: list[str] = []
+        try:
+            for task in tasks:  # reading order
+                part_codes, part_report = await task
+                codes.extend(part_codes)
+                report.merge(part_report)
+                if limit is not None and len(codes) >= limit:
+                    report.stopped_early = True
+                    return codes[:limit], report
+            return codes, report
+        finally:
+            # early exit or error: ranges still queued in the pool are not needed
+            for task in tasks:
+                task.cancel()
+
+def supports_page_ranges(decoder: Any) -> bool:
+    """True if the decoder can be split into independent page-range tasks."""
+    return (
+        hasattr(decoder, "extract_page_range")
+        and getattr(getattr(decoder, "settings", None), "page_workers", 1) > 1
+    )
+
+
+__all__ = [
+    "DecodePool", "decode_file", "decode_bytes", "run_in_process", "stream_pages", "supports_page_ranges",
+]
@@ -0,0 +1,102 @@
+# src/qrparser/services/decoding.py
+# comments in English only
+# One upload -> codes: result cache, in-flight coalescing and the decode pool.
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+from qrparser.core.deadline import expired
+from qrparser.core.decode_settings import DecodeSettings
+from qrparser.observability import metrics
+from .admission import PixelBudget
+from .decode_pool import DecodePool, decode_bytes, run_in_process, supports_page_ranges
+from .result_cache import ResultCache, cache_key, content_digest
+from .single_flight import SingleFlight
+
+
+async def page_summary(target: Any, content: bytes) -> dict:
+    """{"pages_total", "pages_skipped"} for decoders that select pages (PDF), else {}."""
+    if not hasattr(target, "page_summary"):
+        return {}
+    # pdfium in this process, next to other requests' calls: serialized
+    return await run_in_process(target.page_summary, content, target.settings)
+
+
+async def estimate_megapixels(target: Any, content: bytes) -> float:
+    """Admission cost of decoding `content`; 0.0 for decoders without an estimator."""
+    if not hasattr(target, "estimate_megapixels"):
+        return 0.0
+    # reads page sizes with pdfium in this process: serialized like page_summary
+    return await run_in_process(target.estimate_megapixels, content, target.settings)
+
+
+async def decode_content(
+    content: bytes,
+    mime: str,
+    decoder: Any,
+    decode_settings: DecodeSettings,
+    pool: DecodePool,
+    cache: Optional[ResultCache],
+    inflight: SingleFlight,
+    deadline: Optional[float] = None,
+    budget: Optional[PixelBudget] = None,
+    budget_wait: Optional[float] = None,
+) -> tuple[list[str], dict]:
+    """
+    Cache lookup, coalesced decode and cache fill for one upload; returns
+    (codes, log fields). log["partial"] is True when this call's deadline cut
+    decoding short; such results are not cached. With a budget, the decode first waits
+    for its estimated megapixels, up to `budget_wait` seconds (default: the
+    budget's max wait); AdmissionRejected when that takes too long.
+    """
+    log: dict = {}
+    target = decoder.decoder_for(mime) if hasattr(decoder, "decoder_for") else decoder
+    # pages left out by the selection / MAX_PAGES, reported even for cache hits
+    pages_info = await page_summary(target, content)
+    log.update(pages_info)
+    # content address: identical bytes + identical decode settings => identical result
+    key = cache_key(await asyncio.to_thread(content_digest, content), mime, decode_settings)
+    if cache is not None:
+        cached, tier = await cache.get(key)
+        log.update({"cache": tier, **cache.stats()})
+        if cached is not None:
+            log.update({"codes_found": len(cached), "partial": False})
+            return cached, log
+
+    async def _decode() -> tuple[list[str], bool]:
+        if budget is None:
+            return await _run()
+        cost = await estimate_megapixels(target, content)
+        log["megapixels_est"] = round(cost, 1)
+        async with budget.reserve(cost, budget_wait):
+            return await _run()
+
+    async def _run() -> tuple[list[str], bool]:
+        # decode in a worker process so the event loop keeps serving other requests;
+        # the upload goes to the decoder straight from memory (no temp file)
+        if pool.started and supports_page_ranges(target):
+            codes, report = await pool.run_page_ranges(
+                target, content, deadline, n_pages=pages_info.get("pages_total")
+            )
+        else:
+            codes, report = await pool.run(decode_bytes, decoder, content, mime, deadline)
+        # which ladder rung succeeded, for tuning DECODE_SCALES from production logs
+        log.update(report.as_log())
+        metrics.observe_report(report)
+        if cache is not None and not report.deadline_exceeded:
+            await cache.put(key, list(codes))
+        return list(codes), report.deadline_exceeded
+
+    # identical uploads already being decoded are awaited, not decoded again;
+    # a partial result cut short by someone else's deadline is not ours to
+    # return while our own deadline has time left: run (or join) again
+    while True:
+        (codes, partial), coalesced = await inflight.do(key, _decode)
+        if not (coalesced and partial) or expired(deadline):
+            break
+    log.update({"codes_found": len(codes), "coalesced": coalesced, "partial": partial})
+    return list(codes), log
+
+
+__all__ = ["decode_content", "estimate_megapixels", "page_summary"]
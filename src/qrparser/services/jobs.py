@@ -0,0 +1,241 @@
+# src/qrparser/services/jobs.py
+# comments in English only
+# In-process job queue for submit/poll decoding of large uploads (no external broker).
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import tempfile
+import time
+import urllib.request
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional
+
+from qrparser.observability.logging import get_logger
+
+logger = get_logger(__name__)
+
+JobStatus = Literal["queued", "running", "done", "failed"]
+CALLBACK_TIMEOUT_SECONDS = 10.0
+# job ids are uuid4 hex; anything else never names a state file
+JOB_ID_RE = re.compile(r"[0-9a-f]{32}")
+
+
+class JobQueueFull(Exception):
+    """Raised by submit() when the bounded queue has no free slot."""
+
+
+@dataclass
+class Job:
+    id: str
+    file_name: Optional[str] = None
+    status: JobStatus = "queued"
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    codes: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    callback_url: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["job_id"] = d.pop("id")
+        d.pop("callback_url")
+        return d
+
+
+def _post_json(url: str, payload: Dict[str, Any]) -> None:
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=CALLBACK_TIMEOUT_SECONDS):
+        pass
+
+
+class JobQueue:
+    """
+    Bounded FIFO of decode jobs served by a few asyncio consumers.
+
+    The consumers only await; the CPU work itself is whatever the submitted
+    coroutine does (normally a DecodePool job in a worker process). Finished
+    jobs are kept for ttl_seconds and then forgotten.
+
+    With jobs_dir, every state change is also written to one small JSON file
+    per job there, so any uvicorn worker on the host can answer a poll for a
+    job that another worker runs. Expired files are swept at most every
+    sweep_interval seconds.
+    """
+
+    def __init__(
+        self,
+        max_queued: int = 100,
+        workers: int = 2,
+        ttl_seconds: float = 3600.0,
+        jobs_dir: Optional[Path | str] = None,
+        sweep_interval: float = 60.0,
+    ) -> None:
+        self.max_queued = max_queued
+        self.workers = workers
+        self.ttl_seconds = ttl_seconds
+        self.jobs_dir = Path(jobs_dir) if jobs_dir else None
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        self._jobs: Dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue[tuple[Job, Callable[[], Awaitable[List[str]]]]]] = None
+        self._tasks: List[asyncio.Task[None]] = []
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "JobQueue":
+        return cls(
+            max_queued=settings.JOBS_MAX_QUEUED,
+            workers=settings.JOBS_WORKERS,
+            ttl_seconds=settings.JOBS_TTL_SECONDS,
+            jobs_dir=settings.JOBS_DIR,
+        )
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Create the queue and consumer tasks on the running event loop."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def submit(
+        self,
+        fn: Callable[[], Awaitable[List[str]]],
+        file_name: Optional[str] = None,
+        callback_url: Optional[str] = None,
+    ) -> Job:
+        """Enqueue fn (a coroutine factory returning codes); raises JobQueueFull when saturated."""
+        if self._queue is None:
+            raise RuntimeError("JobQueue is not started")
+        self._purge()
+        job = Job(id=uuid.uuid4().hex, file_name=file_name, callback_url=callback_url)
+        try:
+            self._queue.put_nowait((job, fn))
+        except asyncio.QueueFull:
+            raise JobQueueFull() from None
+        self._jobs[job.id] = job
+        self._save(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge()
+        job = self._jobs.get(job_id)
+        if job is None and self.jobs_dir is not None:
+            job = self._load(job_id)  # submitted to another worker
+            if job is not None and self._expired(job, time.time()):
+                return None
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        queued = self._queue.qsize() if self._queue is not None else 0
+        return {"jobs_queued": queued, "jobs_known": len(self._jobs)}
+
+    def _expired(self, job: Job, now: float) -> bool:
+        return job.finished_at is not None and now - job.finished_at > self.ttl_seconds
+
+    def _purge(self) -> None:
+        now = time.time()
+        expired = [k for k, j in self._jobs.items() if self._expired(j, now)]
+        for k in expired:
+            del self._jobs[k]
+        if self.jobs_dir is not None and time.monotonic() >= self._next_sweep:
+            self._next_sweep = time.monotonic() + self.sweep_interval
+            self._sweep(now)
+
+    # ---- shared state directory (tiny files, written on status changes only) ----
+    def _path(self, job_id: str) -> Path:
+        assert self.jobs_dir is not None
+        return self.jobs_dir / f"{job_id}.json"
+
+    def _save(self, job: Job) -> None:
+        if self.jobs_dir is None:
+            return
+        path = self._path(job.id)
+        try:
+            self.jobs_dir.mkdir(parents=True, exist_ok=True)
+            # write-then-rename so a poll from another worker never sees a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.jobs_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(asdict(job), fh, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError:
+            logger.warning("job_state_write_failed", job_id=job.id, path=str(path))
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        if not JOB_ID_RE.fullmatch(job_id):
+            return None
+        try:
+            return Job(**json.loads(self._path(job_id).read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _sweep(self, now: float) -> None:
+        """Delete state files untouched for longer than the TTL (jobs of every worker)."""
+        assert self.jobs_dir is not None
+        for path in self.jobs_dir.glob("*"):
+            job = self._jobs.get(path.stem)
+            if job is not None and job.finished_at is None:
+                continue  # still running here, however long it takes
+            try:
+                if now - path.stat().st_mtime > self.ttl_seconds:
+                    path.unlink()
+            except OSError:
+                continue  # another worker swept it first
+
+    async def _consume(self) -> None:
+        assert self._queue is not None
+        while True:
+            job, fn = await self._queue.get()
+            try:
+                await self._run(job, fn)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job, fn: Callable[[], Awaitable[List[str]]]) -> None:
+        job.status = "running"
+        self._save(job)
+        t0 = time.perf_counter()
+        try:
+            job.codes = list(await fn())
+            job.status = "done"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = getattr(e, "detail", None) or "Invalid or unreadable file"
+        job.finished_at = time.time()
+        self._save(job)
+        logger.info(
+            "job_finished",
+            job_id=job.id,
+            status=job.status,
+            codes_found=len(job.codes),
+            duration_ms=round((time.perf_counter() - t0) * 1000, 2),
+        )
+        if job.callback_url:
+            try:
+                await asyncio.to_thread(_post_json, job.callback_url, job.as_dict())
+            except Exception:
+                logger.warning("job_callback_failed", job_id=job.id, url=job.callback_url)
+
+
+__all__ = ["Job", "JobQueue", "JobQueueFull", "JobStatus"]
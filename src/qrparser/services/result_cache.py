@@ -0,0 +1,173 @@
+# src/qrparser/services/result_cache.py
+# comments in English only
+# Content-addressed cache of decode results: in-process LRU + optional disk tier.
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional
+
+from qrparser.observability.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def content_digest(data: bytes | bytearray | memoryview) -> str:
+    """sha256 of the uploaded bytes (hashlib releases the GIL for large inputs)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def cache_key(digest: str, mime: str, decode_settings: Any = None) -> str:
+    """
+    Combine the content digest with everything that changes the result:
+    the MIME family and the effective DecodeSettings.
+    """
+    if dataclasses.is_dataclass(decode_settings):
+        params = dataclasses.asdict(decode_settings)
+    else:
+        params = {}
+    blob = json.dumps({"mime": mime, "settings": params}, sort_keys=True, default=str)
+    return f"{digest}-{hashlib.sha256(blob.encode()).hexdigest()[:16]}"
+
+
+class ResultCache:
+    """
+    Two-tier result cache.
+
+    - memory: LRU bounded by entry count, entries expire after ttl_seconds
+    - disk (optional): one JSON file per key under cache_dir, shared by all
+      uvicorn workers on the host; expiry by file mtime, and expired files
+      are swept at most every sweep_interval seconds so the directory stays
+      bounded by what was written within one TTL
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        cache_dir: Optional[Path | str] = None,
+        sweep_interval: float = 300.0,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.sweep_interval = sweep_interval
+        # first write sweeps, so files left by an earlier run do not linger
+        self._next_sweep = 0.0
+        self._mem: OrderedDict[str, tuple[float, List[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> Optional["ResultCache"]:
+        if not settings.CACHE_ENABLED:
+            return None
+        return cls(
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.CACHE_TTL_SECONDS,
+            cache_dir=settings.CACHE_DIR,
+            sweep_interval=settings.CACHE_SWEEP_INTERVAL_SECONDS,
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {"cache_hits": self.hits, "cache_misses": self.misses, "cache_entries": len(self._mem)}
+
+    # ---- memory tier ----
+    def _mem_get(self, key: str) -> Optional[List[str]]:
+        with self._lock:
+            item = self._mem.get(key)
+            if item is None:
+                return None
+            stored_at, codes = item
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._mem[key]
+                return None
+            self._mem.move_to_end(key)
+            return list(codes)
+
+    def _mem_put(self, key: str, codes: List[str]) -> None:
+        with self._lock:
+            self._mem[key] = (time.monotonic(), list(codes))
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+
+    # ---- disk tier ----
+    def _disk_path(self, key: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _disk_get(self, key: str) -> Optional[List[str]]:
+        path = self._disk_path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            return list(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            return None
+
+    def _disk_put(self, key: str, codes: List[str]) -> None:
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write-then-rename so concurrent workers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(codes, fh, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError:
+            logger.warning("result_cache_disk_write_failed", path=str(path))
+
+    def _disk_sweep(self) -> int:
+        """Delete expired entries (and temp files of crashed writers); returns how many."""
+        assert self.cache_dir is not None
+        now = time.time()
+        removed = 0
+        for path in self.cache_dir.glob("*/*"):
+            try:
+                if now - path.stat().st_mtime > self.ttl_seconds:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue  # another worker swept it first
+        return removed
+
+    # ---- public API ----
+    async def get(self, key: str) -> tuple[Optional[List[str]], str]:
+        """Return (codes, tier) where tier is 'memory', 'disk' or 'miss'."""
+        codes = self._mem_get(key)
+        if codes is not None:
+            self.hits += 1
+            return codes, "memory"
+        if self.cache_dir is not None:
+            codes = await asyncio.to_thread(self._disk_get, key)
+            if codes is not None:
+                self._mem_put(key, codes)
+                self.hits += 1
+                return codes, "disk"
+        self.misses += 1
+        return None, "miss"
+
+    async def put(self, key: str, codes: List[str]) -> None:
+        self._mem_put(key, codes)
+        if self.cache_dir is not None:
+            await asyncio.to_thread(self._disk_put, key, list(codes))
+            now = time.monotonic()
+            if now >= self._next_sweep:
+                self._next_sweep = now + self.sweep_interval
+                removed = await asyncio.to_thread(self._disk_sweep)
+                if removed:
+                    logger.info("result_cache_swept", removed=removed)
+
+
+__all__ = ["ResultCache", "cache_key", "content_digest"]
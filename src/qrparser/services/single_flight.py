@@ -0,0 +1,40 @@
+# src/qrparser/services/single_flight.py
+# comments in English only
+# Coalesce concurrent identical work into one execution (per process).
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    In-flight deduplication keyed by an arbitrary string.
+
+    The first caller for a key starts the work as a separate task; callers
+    arriving while it runs await the same task. The task is shielded, so a
+    disconnecting caller does not cancel the work the others wait for.
+    Errors are propagated to every waiter and nothing is remembered after
+    the task finishes (that is the result cache's job).
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, asyncio.Task[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Return (result, shared); shared is True if another caller's run was reused."""
+        task = self._tasks.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _t, k=key: self._tasks.pop(k, None))
+        return await asyncio.shield(task), shared
+
+
+__all__ = ["SingleFlight"]
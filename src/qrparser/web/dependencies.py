@@ -1,9 +1,19 @@
 from __future__ import annotations
+import time
 import uuid
-from fastapi import Header, Request
-from qrparser.core.pdf_decoder import PdfBarcodeDecoder
+from typing import Literal
+from fastapi import Depends, Header, HTTPException, Query, Request
+from qrparser.config.settings import Settings, get_settings
+from qrparser.core.pdf_decoder import PdfBarcodeDecoder, DecodeSettings
 from qrparser.core.image_decoder import ImageBarcodeDecoder
 from qrparser.core.composite_decoder import CompositeDecoder
+from qrparser.core.pages import parse_page_spec
+from qrparser.core.symbology import parse_formats
+from qrparser.services.admission import PixelBudget
+from qrparser.services.decode_pool import DecodePool
+from qrparser.services.jobs import JobQueue
+from qrparser.services.result_cache import ResultCache
+from qrparser.services.single_flight import SingleFlight
 
 async def get_request_id(request: Request, x_request_id: str | None = Header(default=None)) -> str:
     """Return request-scoped Request ID from middleware, falling back to header/UUID."""
@@ -14,6 +24,123 @@ async def get_request_id(request: Request, x_request_id: str | None = Header(def
     request.state.request_id = rid
     return rid
 
-def get_decoder() -> PdfBarcodeDecoder:
+def _parse_scales(raw: str) -> tuple[float, ...]:
+    try:
+        scales = tuple(float(x) for x in raw.split(",") if x.strip())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid scales")
+    if not scales or any(not 0.1 <= x <= 10.0 for x in scales):
+        raise HTTPException(status_code=400, detail="Invalid scales")
+    return scales
+
+def _parse_formats(raw: str) -> tuple[str, ...]:
+    formats = tuple(x.strip() for x in raw.split(",") if x.strip())
+    try:
+        parse_formats(formats)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid formats")
+    return formats
+
+def _parse_pages(raw: str) -> str:
+    try:
+        parse_page_spec(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid pages")
+    return raw.replace(" ", "")
+
+def get_decode_settings(
+    settings: Settings = Depends(get_settings),
+    scales: str | None = Query(
+        default=None,
+        description="Comma-separated scale ladder tried cheapest-first, e.g. 1.5,3,5",
+    ),
+    roi: bool | None = Query(
+        default=None,
+        description="Region-of-interest mode for PDFs; defaults to QR_ROI_ENABLED",
+    ),
+    max_codes: int | None = Query(
+        default=None, ge=1,
+        description="Stop rendering once this many codes were found",
+    ),
+    stop_after_first: bool = Query(
+        default=False, description="Shorthand for max_codes=1",
+    ),
+    formats: str | None = Query(
+        default=None,
+        description="Comma-separated symbologies, e.g. QRCode,DataMatrix; defaults to QR_DECODE_FORMATS",
+    ),
+    try_harder: bool | None = Query(
+        default=None, description="Enable rotate/downscale/invert passes; defaults to QR_ZXING_TRY_HARDER",
+    ),
+    try_rotate: bool | None = Query(default=None, description="Defaults to QR_ZXING_TRY_ROTATE"),
+    try_invert: bool | None = Query(default=None, description="Defaults to QR_ZXING_TRY_INVERT"),
+    binarizer: Literal["LocalAverage", "GlobalHistogram", "FixedThreshold", "BoolCast"] | None = Query(
+        default=None, description="Defaults to QR_ZXING_BINARIZER",
+    ),
+    pages: str | None = Query(
+        default=None,
+        description="PDF pages to decode, 1-based, e.g. 1-3,last; at most QR_MAX_PAGES are decoded",
+    ),
+) -> DecodeSettings:
+    """Effective decode parameters: app settings plus per-request overrides."""
+    return DecodeSettings(
+        scales=_parse_scales(scales) if scales else settings.SCALE_LADDER,
+        target_dpi=settings.TARGET_DPI,
+        max_megapixels=settings.MAX_BITMAP_MEGAPIXELS or None,
+        large_image_megapixels=settings.LARGE_IMAGE_MEGAPIXELS or None,
+        grayscale=settings.DECODE_GRAYSCALE,
+        embedded_images=settings.EMBEDDED_IMAGES,
+        roi=settings.ROI_ENABLED if roi is None else roi,
+        max_codes=max_codes,
+        stop_after_first=stop_after_first,
+        page_workers=settings.PDF_PAGE_WORKERS,
+        formats=_parse_formats(formats) if formats else (tuple(settings.DECODE_FORMATS) or None),
+        try_harder=settings.ZXING_TRY_HARDER if try_harder is None else try_harder,
+        try_rotate=settings.ZXING_TRY_ROTATE if try_rotate is None else try_rotate,
+        try_downscale=settings.ZXING_TRY_DOWNSCALE,
+        try_invert=settings.ZXING_TRY_INVERT if try_invert is None else try_invert,
+        binarizer=binarizer or settings.ZXING_BINARIZER,
+        is_pure=settings.ZXING_IS_PURE,
+        pages=_parse_pages(pages) if pages else None,
+        max_pages=settings.MAX_PAGES,
+    )
+
+def get_deadline(
+    request: Request,
+    settings: Settings = Depends(get_settings),
+    timeout: float | None = Query(
+        default=None, gt=0,
+        description="Seconds until decoding stops and partial results are returned; defaults to QR_DEADLINE_SECONDS",
+    ),
+    x_request_timeout: float | None = Header(default=None, gt=0),
+) -> float:
+    """Absolute (time.time()) decode deadline of this request, capped at QR_DEADLINE_MAX_SECONDS."""
+    seconds = min(timeout or x_request_timeout or settings.DEADLINE_SECONDS, settings.DEADLINE_MAX_SECONDS)
+    started = getattr(request.state, "received_at", None) or time.time()
+    return started + seconds
+
+def get_decoder(decode_settings: DecodeSettings = Depends(get_decode_settings)) -> CompositeDecoder:
     """Provide a stateless decoder instance per request."""
-    return CompositeDecoder(decoders=[PdfBarcodeDecoder(), ImageBarcodeDecoder()])
+    return CompositeDecoder(
+        decoders=[PdfBarcodeDecoder(decode_settings), ImageBarcodeDecoder(decode_settings)]
+    )
+
+def get_decode_pool(request: Request) -> DecodePool:
+    """Return the app-wide decode pool created in create_app()."""
+    return request.app.state.decode_pool
+
+def get_result_cache(request: Request) -> ResultCache | None:
+    """Return the app-wide result cache, or None when caching is disabled."""
+    return getattr(request.app.state, "result_cache", None)
+
+def get_pixel_budget(request: Request) -> PixelBudget | None:
+    """Return the app-wide megapixel budget, or None when it is disabled."""
+    return getattr(request.app.state, "pixel_budget", None)
+
+def get_inflight(request: Request) -> SingleFlight:
+    """Return the app-wide in-flight decode registry."""
+    return request.app.state.inflight
+
+def get_job_queue(request: Request) -> JobQueue:
+    """Return the app-wide async job queue."""
+    return request.app.state.jobs
@@ -1,9 +1,35 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
+from qrparser.config.settings import get_settings
+from qrparser.observability import metrics
 from qrparser.observability.logging import setup_logging, get_logger
+from qrparser.services.admission import AdmissionController, PixelBudget
+from qrparser.services.decode_pool import DecodePool
+from qrparser.services.jobs import JobQueue
+from qrparser.services.result_cache import ResultCache
+from qrparser.services.single_flight import SingleFlight
 from .routers import api_router
-from .middleware import RequestLoggingMiddleware
+from .routers.metrics import metrics_endpoint
+from .middleware import AdmissionMiddleware, RequestLoggingMiddleware, UploadLimitMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # start worker processes with the app and stop them on shutdown
+    pool: DecodePool = app.state.decode_pool
+    jobs: JobQueue = app.state.jobs
+    pool.start()
+    jobs.start()
+    try:
+        yield
+    finally:
+        await jobs.stop()
+        pool.shutdown()
+        metrics.mark_process_dead()
 
 
 def create_app() -> FastAPI:
@@ -12,18 +38,49 @@ def create_app() -> FastAPI:
     logger = get_logger(__name__)
     logger.info("Creating FastAPI application")
 
+    settings = get_settings()
+
     app = FastAPI(
         title="QR Parser Service",
         description="Microservice for parsing QR codes from PDF files",
         version="0.1.0",
+        lifespan=lifespan,
     )
 
+    # decode pool sized by settings; started in lifespan
+    app.state.decode_pool = DecodePool(max_workers=settings.CONCURRENCY)
+    # None when QR_CACHE_ENABLED=false
+    app.state.result_cache = ResultCache.from_settings(settings)
+    # coalesces concurrent identical uploads into one decode
+    app.state.inflight = SingleFlight()
+    # submit/poll jobs; consumers started in lifespan
+    app.state.jobs = JobQueue.from_settings(settings)
+    if settings.HTTP_WORKERS > 1 and app.state.jobs.jobs_dir is None:
+        # polls landing on another worker would not find the job
+        logger.warning("jobs_dir_not_shared", workers=settings.HTTP_WORKERS, hint="set QR_JOBS_DIR")
+
+    # None when QR_ADMISSION_ENABLED=false
+    app.state.admission = AdmissionController.from_settings(settings)
+    # estimated megapixels decoded at once; None when QR_ADMISSION_MEGAPIXELS=0
+    app.state.pixel_budget = PixelBudget.from_settings(settings)
+
+    # bound parse requests in flight; innermost, so 413s never take a slot
+    if app.state.admission is not None:
+        app.add_middleware(AdmissionMiddleware, controller=app.state.admission)
+
+    # reject oversized bodies before they are read (inner, so it gets logged)
+    app.add_middleware(UploadLimitMiddleware)
+
     # add middleware for request logging
     app.add_middleware(RequestLoggingMiddleware)
 
     # include routes
     app.include_router(api_router)
 
+    if settings.ENABLE_PROMETHEUS:
+        metrics.setup_metrics()
+        app.add_api_route(settings.METRICS_PATH, metrics_endpoint, methods=["GET"], include_in_schema=False)
+
     return app
 
 
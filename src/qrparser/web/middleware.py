@@ -1,9 +1,15 @@
 import time
 import uuid
-from fastapi import Request, Response
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from qrparser.config.settings import get_settings
+from qrparser.observability import metrics
+from qrparser.services.admission import AdmissionController, AdmissionRejected
 
 from qrparser.observability.logging import (
     set_request_context,
@@ -21,6 +27,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         request.state.request_id = req_id
         # prepare container for handler-provided extras
         request.state.extra_log = {}  # type: ignore[attr-defined]
+        # wall clock, so decode deadlines count from arrival (upload time included)
+        request.state.received_at = time.time()
         start = time.perf_counter()
 
         set_request_context(request_id=req_id, method=request.method, path=str(request.url.path))
@@ -35,8 +43,18 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             # re-raise after logging in finally
             raise
         finally:
-            duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            elapsed = time.perf_counter() - start
+            duration_ms = round(elapsed * 1000, 2)
             extra = getattr(request.state, "extra_log", {}) or {}
+            if metrics.enabled():
+                # route template, not the raw path, to keep label cardinality bounded
+                route = request.scope.get("route")
+                metrics.observe_request(
+                    endpoint=getattr(route, "path", "unmatched"),
+                    status=status_code,
+                    mime=metrics.mime_label(extra.get("content_type"), get_settings().ALL_ALLOWED_MIME),
+                    seconds=elapsed,
+                )
             log_request_end(
                 status=status_code,
                 duration_ms=duration_ms,
@@ -56,3 +74,118 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             response = JSONResponse({"detail": "Internal Server Error"}, status_code=status_code)
             response.headers["X-Request-ID"] = req_id
         return response
+
+
+# room for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadLimitMiddleware:
+    """
+    Reject oversized upload bodies before they are buffered.
+
+    The per-family limit is only known once the multipart part is parsed, so
+    this enforces the largest family limit: first via Content-Length (no body
+    read at all), then by counting received bytes for chunked/lying clients.
+    """
+
+    def __init__(self, app: ASGIApp, path_prefixes: tuple[str, ...] = ("/v1/parse", "/v1/jobs")) -> None:
+        self.app = app
+        self.path_prefixes = path_prefixes
+
+    @staticmethod
+    def max_body_bytes(path: str = "") -> int:
+        s = get_settings()
+        if path.startswith("/v1/parse/batch"):
+            return s.BATCH_MAX_TOTAL_MB * 1024 * 1024 + s.BATCH_MAX_FILES * MULTIPART_OVERHEAD_BYTES
+        return max(s.MAX_FILE_SIZE_MB_PDF, s.MAX_FILE_SIZE_MB_IMG) * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope.get("method") != "POST"
+            or not str(scope.get("path", "")).startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.max_body_bytes(str(scope.get("path", "")))
+        detail = f"Request body too large. Max size is {limit // (1024 * 1024)} MB"
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            state = scope.setdefault("state", {})
+            state.setdefault("extra_log", {}).update(
+                {"error": "body_too_large", "content_length": int(content_length), "max_bytes": limit}
+            )
+            response = JSONResponse({"detail": detail}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+        started: Optional[float] = None
+
+        async def limited_receive() -> Message:
+            nonlocal received, started
+            if started is None:
+                started = time.perf_counter()
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI re-raises HTTPException from body parsing as-is
+                    raise HTTPException(status_code=413, detail=detail)
+                if not message.get("more_body", False):
+                    metrics.observe_upload_read(time.perf_counter() - started)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class AdmissionMiddleware:
+    """
+    Admission control for parse requests, before any of the body is read.
+
+    A request holds a slot of the controller until its response (including a
+    streamed one) is sent. When the wait line is full, or the slot does not
+    free up within the max wait, the client gets 503 with Retry-After at once.
+    """
+
+    def __init__(
+        self, app: ASGIApp, controller: AdmissionController, path_prefixes: tuple[str, ...] = ("/v1/parse",)
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.path_prefixes = path_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope.get("method") != "POST"
+            or not str(scope.get("path", "")).startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        extra_log = state.setdefault("extra_log", {})
+        started = time.perf_counter()
+        try:
+            await self.controller.acquire()
+        except AdmissionRejected as e:
+            extra_log.update({"error": "overloaded", "admission": e.reason, **self.controller.stats()})
+            metrics.observe_rejection(e.reason)
+            response = JSONResponse(
+                {"detail": "Server is busy, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        extra_log["admission_wait_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
@@ -0,0 +1,10 @@
+# comments in English only
+from fastapi import Response
+
+from qrparser.observability.metrics import render_latest
+
+
+async def metrics_endpoint() -> Response:
+    """Prometheus exposition; mounted at QR_METRICS_PATH when QR_ENABLE_PROMETHEUS is on."""
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Request, Response
+
+from ...schemas import JobResponse, ErrorResponse
+from ...dependencies import (
+    get_decoder, get_decode_settings, get_decode_pool, get_result_cache, get_inflight, get_job_queue,
+    get_pixel_budget,
+)
+from qrparser.core.decode_settings import DecodeSettings
+from qrparser.observability import metrics
+from ...uploads import (
+    UploadTooLarge, decode_error_detail, max_upload_bytes, read_upload_limited, too_large_detail,
+)
+from qrparser.services.admission import AdmissionRejected, PixelBudget
+from qrparser.services.decode_pool import DecodePool
+from qrparser.services.decoding import decode_content
+from qrparser.services.jobs import JobQueue, JobQueueFull
+from qrparser.services.result_cache import ResultCache
+from qrparser.services.single_flight import SingleFlight
+
+from qrparser.config.settings import get_settings, Settings
+from .parse import BUSY_DETAIL
+
+router = APIRouter(prefix="/v1", tags=["jobs"])
+
+
+@router.post(
+    "/jobs",
+    status_code=202,
+    response_model=JobResponse,
+    responses={400: {"model": ErrorResponse}, 413: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+    summary="Submit a PDF or image for background decoding",
+)
+async def submit_job(
+    request: Request,
+    response: Response,
+    file: UploadFile = File(..., description="PDF or image to parse"),
+    callback_url: str | None = Form(default=None, description="POST the finished job here (if enabled)"),
+    decoder = Depends(get_decoder),  # CompositeDecoder
+    decode_settings: DecodeSettings = Depends(get_decode_settings),
+    settings: Settings = Depends(get_settings),
+    pool: DecodePool = Depends(get_decode_pool),
+    cache: ResultCache | None = Depends(get_result_cache),
+    inflight: SingleFlight = Depends(get_inflight),
+    jobs: JobQueue = Depends(get_job_queue),
+    budget: PixelBudget | None = Depends(get_pixel_budget),
+) -> JobResponse:
+    if not hasattr(request.state, "extra_log"):
+        request.state.extra_log = {}
+    log = request.state.extra_log
+    log.update({"file_name": file.filename, "content_type": file.content_type})
+
+    mime = (file.content_type or "").lower()
+    if mime not in settings.ALL_ALLOWED_MIME:
+        log["error"] = "unsupported_mime"
+        raise HTTPException(status_code=400, detail="Unsupported file type")
+
+    if callback_url is not None:
+        if not settings.JOBS_CALLBACKS_ENABLED:
+            raise HTTPException(status_code=400, detail="Callbacks are disabled")
+        if not callback_url.startswith(("http://", "https://")):
+            raise HTTPException(status_code=400, detail="Invalid callback_url")
+
+    max_bytes = max_upload_bytes(settings, mime)
+    try:
+        content = await read_upload_limited(file, max_bytes)
+    except UploadTooLarge:
+        log.update({"error": "file_too_large", "max_bytes": max_bytes})
+        raise HTTPException(status_code=400, detail=too_large_detail(mime, max_bytes))
+    log["file_size"] = len(content)
+
+    async def _run() -> list[str]:
+        # nobody is waiting on the connection: a job queues for the megapixel
+        # budget much longer than a parse request before it gives up
+        try:
+            codes, _ = await decode_content(
+                content, mime, decoder, decode_settings, pool, cache, inflight,
+                budget=budget, budget_wait=settings.JOBS_BUDGET_WAIT_SECONDS,
+            )
+        except AdmissionRejected as e:
+            metrics.observe_rejection(e.reason)
+            raise HTTPException(status_code=503, detail=BUSY_DETAIL)
+        except BrokenProcessPool:
+            # the worker died, not the upload's fault: same busy answer as /v1/parse
+            raise HTTPException(status_code=503, detail=BUSY_DETAIL)
+        except Exception:
+            raise HTTPException(status_code=400, detail=decode_error_detail(mime))
+        return codes
+
+    try:
+        job = jobs.submit(_run, file_name=file.filename, callback_url=callback_url)
+    except JobQueueFull:
+        log["error"] = "job_queue_full"
+        raise HTTPException(
+            status_code=503,
+            detail="Job queue is full, retry later",
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+
+    log.update({"job_id": job.id, **jobs.stats()})
+    response.headers["Location"] = f"/v1/jobs/{job.id}"
+    return JobResponse(**job.as_dict())
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    responses={404: {"model": ErrorResponse}},
+    summary="Poll a background decoding job",
+)
+async def get_job(job_id: str, jobs: JobQueue = Depends(get_job_queue)) -> JobResponse:
+    job = jobs.get(job_id)
+    if job is None:
+        # unknown, or finished longer than QR_JOBS_TTL_SECONDS ago
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobResponse(**job.as_dict())
@@ -1,41 +1,87 @@
 from __future__ import annotations
-import os
-import tempfile
-from pathlib import Path
 
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status, Request
+import asyncio
+import json
+import time
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import List
 
-from ...schemas import ParseResponse, ErrorResponse
-from ...dependencies import get_request_id, get_decoder
-from qrparser.core.pdf_decoder import PdfBarcodeDecoder
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query, status, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from ...schemas import BatchItem, BatchParseResponse, ParseResponse, ErrorResponse
+from ...dependencies import (
+    get_request_id, get_decoder, get_decode_settings, get_decode_pool, get_result_cache, get_inflight,
+    get_deadline, get_pixel_budget,
+)
+from qrparser.core.decode_settings import DecodeSettings
+from qrparser.observability import metrics
+from ...uploads import (
+    UploadTooLarge, decode_error_detail, max_upload_bytes, read_upload_limited, too_large_detail,
+)
+from qrparser.services.admission import AdmissionRejected, PixelBudget
+from qrparser.services.decode_pool import DecodePool, stream_pages
+from qrparser.services.decoding import decode_content, estimate_megapixels, page_summary
+from qrparser.services.result_cache import ResultCache, cache_key, content_digest
+from qrparser.services.single_flight import SingleFlight
 
 from qrparser.config.settings import get_settings, Settings
 
 router = APIRouter(prefix="/v1", tags=["parser"])
 
+NDJSON = "application/x-ndjson"
+BUSY_DETAIL = "Server is busy, retry later"
+
+
+def _busy(log: dict, e: AdmissionRejected) -> HTTPException:
+    """503 for a request whose decode did not get into the megapixel budget in time."""
+    log.update({"error": "overloaded", "admission": e.reason})
+    metrics.observe_rejection(e.reason)
+    return HTTPException(status_code=503, detail=BUSY_DETAIL, headers={"Retry-After": str(e.retry_after)})
+
+
+def _pool_broken(log: dict) -> HTTPException:
+    """503 for a decode lost with a crashed worker: the upload is not at fault and the pool is back."""
+    log["error"] = "pool_broken"
+    retry_after = get_settings().ADMISSION_RETRY_AFTER_SECONDS
+    return HTTPException(status_code=503, detail=BUSY_DETAIL, headers={"Retry-After": str(retry_after)})
+
 
 @router.post(
     "/parse",
     response_model=ParseResponse,
-    responses={400: {"model": ErrorResponse}},
+    response_model_exclude_none=True,
+    responses={
+        200: {"content": {NDJSON: {}}, "description": "JSON, or one line per page with Accept: application/x-ndjson"},
+        400: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Parse QR codes from a PDF or image",
 )
 async def parse_image(
     request: Request,
     file: UploadFile = File(..., description="PDF or image to parse"),
+    debug: bool = Query(default=False, description="Include the decode report (only honored with QR_DEBUG=true)"),
     request_id: str = Depends(get_request_id),
     decoder = Depends(get_decoder),  # CompositeDecoder
+    decode_settings: DecodeSettings = Depends(get_decode_settings),
     settings: Settings = Depends(get_settings),
+    pool: DecodePool = Depends(get_decode_pool),
+    cache: ResultCache | None = Depends(get_result_cache),
+    inflight: SingleFlight = Depends(get_inflight),
+    deadline: float = Depends(get_deadline),
+    budget: PixelBudget | None = Depends(get_pixel_budget),
 ) -> ParseResponse:
-    content = await file.read()
-
     if not hasattr(request.state, "extra_log"):
         request.state.extra_log = {}
     request.state.extra_log.update(
         {
             "file_name": file.filename,
             "content_type": file.content_type,
-            "file_size": len(content),
+            "file_size": file.size,
         }
     )
 
@@ -44,43 +90,281 @@ async def parse_image(
         request.state.extra_log["error"] = "unsupported_mime"
         raise HTTPException(status_code=400, detail="Unsupported file type")
 
-    # Size check per family
-    if mime == "application/pdf":
-        max_bytes = settings.MAX_FILE_SIZE_MB_PDF * 1024 * 1024
-    else:
-        max_bytes = settings.MAX_FILE_SIZE_MB_IMG * 1024 * 1024
+    # Size check per family, enforced while reading so oversized uploads are never fully buffered
+    max_bytes = max_upload_bytes(settings, mime)
 
-    if len(content) > max_bytes:
+    try:
+        content = await read_upload_limited(file, max_bytes)
+    except UploadTooLarge:
         request.state.extra_log.update(
             {"error": "file_too_large", "max_bytes": max_bytes}
         )
-        kind = "PDF" if mime == "application/pdf" else "image"
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large for {kind}. Max size is {max_bytes // (1024*1024)} MB",
+        raise HTTPException(status_code=400, detail=too_large_detail(mime, max_bytes))
+    request.state.extra_log["file_size"] = len(content)
+    # per-stage timings of this request in the response, for chasing slow documents
+    with_report = debug and settings.DEBUG
+
+    if NDJSON in (request.headers.get("accept") or ""):
+        return await _stream_parse(
+            request, request_id, file.filename, content, mime, decoder, decode_settings, pool, cache,
+            with_report, deadline, budget,
         )
 
-    tmp_path: Path | None = None
     try:
-        suffix = ".pdf" if mime == "application/pdf" else Path(file.filename or "").suffix or ".bin"
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(content)
-            tmp_path = Path(tmp.name)
-
-        codes = (
-            decoder.extract_from_file(tmp_path, mime)  # note: uses CompositeDecoder
-            if hasattr(decoder, "extract_from_file") and "mime" in decoder.extract_from_file.__code__.co_varnames
-            else decoder.extract_from_pdf(tmp_path)  # backward compatibility if needed
+        codes, log = await decode_content(
+            content, mime, decoder, decode_settings, pool, cache, inflight, deadline, budget
+        )
+        request.state.extra_log.update(log)
+        return ParseResponse(
+            request_id=request_id,
+            file_name=file.filename,
+            codes=codes,
+            partial=log.get("partial", False),
+            pages_total=log.get("pages_total"),
+            pages_skipped=log.get("pages_skipped"),
+            report=log if with_report else None,
         )
 
-        request.state.extra_log["codes_found"] = len(codes)
-        return ParseResponse(request_id=request_id, file_name=file.filename, codes=list(codes))
-
+    except AdmissionRejected as e:
+        raise _busy(request.state.extra_log, e)
+    except BrokenProcessPool:
+        raise _pool_broken(request.state.extra_log)
     except Exception:
         request.state.extra_log["error"] = "decode_failed"
-        detail = "Invalid or unreadable file" if mime != "application/pdf" else "Invalid or unreadable PDF"
-        raise HTTPException(status_code=400, detail=detail)
-    finally:
-        if tmp_path and tmp_path.exists():
-            try: os.unlink(tmp_path)
-            except OSError: pass
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=decode_error_detail(mime))
+
+
+def _ndjson(obj: dict) -> bytes:
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+async def _stream_parse(
+    request: Request,
+    request_id: str,
+    file_name: str | None,
+    content: bytes,
+    mime: str,
+    decoder,
+    decode_settings: DecodeSettings,
+    pool: DecodePool,
+    cache: ResultCache | None,
+    with_report: bool = False,
+    deadline: float | None = None,
+    budget: PixelBudget | None = None,
+) -> StreamingResponse:
+    """
+    NDJSON variant of /v1/parse: one {"type": "page"} line per decoded page as
+    soon as it is ready, then a {"type": "summary"} line with all codes.
+    Failures before the first page are a normal 400; later ones end the
+    stream with a {"type": "error"} line.
+    """
+    log = request.state.extra_log
+    log["stream"] = True
+    t0 = time.perf_counter()
+    key = cache_key(await asyncio.to_thread(content_digest, content), mime, decode_settings)
+    target = decoder.decoder_for(mime) if hasattr(decoder, "decoder_for") else decoder
+    try:
+        pages_info = await page_summary(target, content)
+    except Exception:
+        log["error"] = "decode_failed"
+        raise HTTPException(status_code=400, detail=decode_error_detail(mime))
+    log.update(pages_info)
+
+    def _summary(codes: list[str], pages: int, cached: bool, partial_result: bool = False) -> bytes:
+        summary = {
+            "type": "summary",
+            "request_id": request_id,
+            "file_name": file_name,
+            "codes": codes,
+            "pages": pages,
+            "duration_ms": round((time.perf_counter() - t0) * 1000, 2),
+            "cached": cached,
+            "partial": partial_result,
+            **pages_info,
+        }
+        if with_report:
+            summary["report"] = {k: v for k, v in log.items() if k not in ("file_name", "content_type")}
+        return _ndjson(summary)
+
+    if cache is not None:
+        cached, tier = await cache.get(key)
+        log.update({"cache": tier, **cache.stats()})
+        if cached is not None:
+            log["codes_found"] = len(cached)
+            return StreamingResponse(iter([_summary(cached, 0, True)]), media_type=NDJSON)
+
+    # the reservation lasts until the stream ends (or the response is dropped)
+    granted = 0.0
+    released = budget is None
+
+    def _release() -> None:
+        nonlocal released
+        if not released:
+            released = True
+            budget.release(granted)
+
+    if budget is not None:
+        cost = await estimate_megapixels(target, content)
+        log["megapixels_est"] = round(cost, 1)
+        try:
+            granted = await budget.acquire(cost)
+        except AdmissionRejected as e:
+            raise _busy(log, e)
+
+    events = pool.stream(partial(stream_pages, deadline=deadline), decoder, content, mime)
+    try:
+        first = await events.__anext__()
+    except BrokenProcessPool:
+        await events.aclose()
+        _release()
+        raise _pool_broken(log)
+    except Exception:
+        first = ("error", "worker failed")
+    if first[0] == "error":
+        await events.aclose()
+        _release()
+        log["error"] = "decode_failed"
+        raise HTTPException(status_code=400, detail=decode_error_detail(mime))
+
+    async def _body():
+        codes: list[str] = []
+        pages = 0
+        try:
+            event = first
+            while True:
+                kind, payload = event
+                if kind == "page":
+                    pages += 1
+                    codes.extend(payload.codes)
+                    yield _ndjson({
+                        "type": "page",
+                        "page": payload.index,
+                        "codes": payload.codes,
+                        "duration_ms": payload.duration_ms,
+                    })
+                elif kind == "done":
+                    log.update(payload.as_log())
+                    metrics.observe_report(payload)
+                    if cache is not None and not payload.deadline_exceeded:
+                        await cache.put(key, list(codes))
+                    yield _summary(codes, pages, False, payload.deadline_exceeded)
+                    return
+                else:
+                    yield _ndjson({"type": "error", "detail": decode_error_detail(mime)})
+                    return
+                try:
+                    event = await events.__anext__()
+                except StopAsyncIteration:
+                    return
+                except Exception:
+                    event = ("error", "worker failed")
+        finally:
+            await events.aclose()
+            _release()
+
+    return StreamingResponse(_body(), media_type=NDJSON, background=BackgroundTask(_release))
+
+
+@router.post(
+    "/parse/batch",
+    response_model=BatchParseResponse,
+    responses={400: {"model": ErrorResponse}, 413: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+    summary="Parse QR codes from several PDFs/images in one request",
+)
+async def parse_batch(
+    request: Request,
+    response: Response,
+    files: List[UploadFile] = File(..., description="PDFs or images to parse"),
+    request_id: str = Depends(get_request_id),
+    decoder = Depends(get_decoder),  # CompositeDecoder
+    decode_settings: DecodeSettings = Depends(get_decode_settings),
+    settings: Settings = Depends(get_settings),
+    pool: DecodePool = Depends(get_decode_pool),
+    cache: ResultCache | None = Depends(get_result_cache),
+    inflight: SingleFlight = Depends(get_inflight),
+    deadline: float = Depends(get_deadline),
+    budget: PixelBudget | None = Depends(get_pixel_budget),
+) -> BatchParseResponse:
+    if not hasattr(request.state, "extra_log"):
+        request.state.extra_log = {}
+    log = request.state.extra_log
+    log["files"] = len(files)
+
+    if len(files) > settings.BATCH_MAX_FILES:
+        log["error"] = "too_many_files"
+        raise HTTPException(status_code=400, detail=f"Too many files. Max is {settings.BATCH_MAX_FILES}")
+
+    batch_max_bytes = settings.BATCH_MAX_TOTAL_MB * 1024 * 1024
+    items: list[BatchItem] = [BatchItem(index=i, file_name=f.filename) for i, f in enumerate(files)]
+    jobs: list[tuple[int, bytes, str]] = []
+    total_bytes = 0
+    total_pages = 0
+
+    # validate and read sequentially (cheap), decode in parallel below
+    for i, file in enumerate(files):
+        mime = (file.content_type or "").lower()
+        if mime not in settings.ALL_ALLOWED_MIME:
+            items[i].error = "Unsupported file type"
+            continue
+        max_bytes = max_upload_bytes(settings, mime)
+        try:
+            content = await read_upload_limited(file, max_bytes)
+        except UploadTooLarge:
+            items[i].error = too_large_detail(mime, max_bytes)
+            continue
+
+        total_bytes += len(content)
+        if total_bytes > batch_max_bytes:
+            log.update({"error": "batch_too_large", "max_bytes": batch_max_bytes})
+            raise HTTPException(
+                status_code=400,
+                detail=f"Batch too large. Max total size is {settings.BATCH_MAX_TOTAL_MB} MB",
+            )
+
+        target = decoder.decoder_for(mime) if hasattr(decoder, "decoder_for") else decoder
+        if hasattr(target, "page_summary"):
+            try:
+                info = await page_summary(target, content)
+            except Exception:
+                items[i].error = decode_error_detail(mime)
+                continue
+            # only pages that will actually be decoded count against the batch budget
+            total_pages += info["pages_total"] - info["pages_skipped"]
+            if total_pages > settings.BATCH_MAX_PAGES:
+                log.update({"error": "batch_too_many_pages", "max_pages": settings.BATCH_MAX_PAGES})
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Batch too large. Max total is {settings.BATCH_MAX_PAGES} pages",
+                )
+        jobs.append((i, content, mime))
+
+    async def _one(i: int, content: bytes, mime: str) -> None:
+        try:
+            items[i].codes, item_log = await decode_content(
+                content, mime, decoder, decode_settings, pool, cache, inflight, deadline, budget
+            )
+            items[i].partial = item_log.get("partial", False)
+        except AdmissionRejected as e:
+            metrics.observe_rejection(e.reason)
+            items[i].error = BUSY_DETAIL
+        except BrokenProcessPool:
+            items[i].error = BUSY_DETAIL
+        except Exception:
+            items[i].error = decode_error_detail(mime)
+
+    # the pool bounds real parallelism; extra files simply queue on it
+    await asyncio.gather(*(_one(*job) for job in jobs))
+    if any(it.error == BUSY_DETAIL for it in items):
+        # files turned away or lost with a worker are worth resubmitting
+        response.headers["Retry-After"] = str(settings.ADMISSION_RETRY_AFTER_SECONDS)
+
+    log.update(
+        {
+            "batch_bytes": total_bytes,
+            "batch_pages": total_pages,
+            "files_failed": sum(1 for it in items if it.error),
+            "files_partial": sum(1 for it in items if it.partial),
+            "codes_found": sum(len(it.codes) for it in items),
+        }
+    )
+    return BatchParseResponse(request_id=request_id, results=items)
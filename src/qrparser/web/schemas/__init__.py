@@ -1,6 +1,6 @@
 # src/qrparser/web/schemas/__init__.py
 from __future__ import annotations
-from typing import List, Literal
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 
 class HealthResponse(BaseModel):
@@ -14,6 +14,16 @@ class ParseResponse(BaseModel):
     request_id: str = Field(..., description="Correlation ID of the request")
     file_name: str = Field(..., description="Original uploaded filename")
     codes: List[str] = Field(default_factory=list, description="Decoded QR values")
+    partial: bool = Field(
+        default=False, description="Decoding hit the request deadline; codes are those found until then"
+    )
+    pages_total: Optional[int] = Field(default=None, description="Pages in the PDF (PDFs only)")
+    pages_skipped: Optional[int] = Field(
+        default=None, description="PDF pages not decoded because of the pages selection or QR_MAX_PAGES"
+    )
+    report: Optional[Dict[str, Any]] = Field(
+        default=None, description="Decode report (cache, stage timings, per-page stats); debug only"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -25,6 +35,52 @@ class ParseResponse(BaseModel):
         }
     }
 
+class BatchItem(BaseModel):
+    index: int = Field(..., description="Position of the file in the multipart body")
+    file_name: Optional[str] = Field(default=None, description="Original uploaded filename")
+    codes: List[str] = Field(default_factory=list, description="Decoded QR values")
+    partial: bool = Field(default=False, description="Decoding of this file hit the request deadline")
+    error: Optional[str] = Field(default=None, description="Why this file could not be decoded")
+
+class BatchParseResponse(BaseModel):
+    request_id: str = Field(..., description="Correlation ID of the request")
+    results: List[BatchItem] = Field(default_factory=list, description="One entry per uploaded file, in order")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [{
+                "request_id": "a1b2c3d4-0000-1111-2222-333344445555",
+                "results": [
+                    {"index": 0, "file_name": "a.pdf", "codes": ["QR123"], "partial": False, "error": None},
+                    {"index": 1, "file_name": "b.txt", "codes": [], "partial": False, "error": "Unsupported file type"},
+                ],
+            }]
+        }
+    }
+
+class JobResponse(BaseModel):
+    job_id: str = Field(..., description="Job identifier to poll")
+    status: Literal["queued", "running", "done", "failed"] = Field(..., description="Job state")
+    file_name: Optional[str] = Field(default=None, description="Original uploaded filename")
+    codes: List[str] = Field(default_factory=list, description="Decoded QR values (when done)")
+    error: Optional[str] = Field(default=None, description="Why the job failed")
+    created_at: float = Field(..., description="Submission time, unix seconds")
+    finished_at: Optional[float] = Field(default=None, description="Completion time, unix seconds")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [{
+                "job_id": "0f8fad5bd9cb469fa16570867728950e",
+                "status": "done",
+                "file_name": "big.pdf",
+                "codes": ["QR123"],
+                "error": None,
+                "created_at": 1767225600.0,
+                "finished_at": 1767225612.5,
+            }]
+        }
+    }
+
 class ErrorResponse(BaseModel):
     detail: str
 
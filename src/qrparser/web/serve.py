@@ -1,11 +1,45 @@
 # comments in English only
 from __future__ import annotations
 
+import glob
+import os
+import tempfile
+
 import uvicorn
 from qrparser.config.settings import get_settings
+from qrparser.observability.metrics import MULTIPROC_ENV
+
+JOBS_DIR_ENV = "QR_JOBS_DIR"
+
+
+def _prepare_multiproc_metrics() -> None:
+    """
+    Point prometheus_client at a shared directory before workers start, so
+    /metrics of any worker aggregates the samples of all of them.
+    Stale files from a previous run are removed.
+    """
+    path = os.environ.get(MULTIPROC_ENV) or tempfile.mkdtemp(prefix="qrparser-metrics-")
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.unlink(stale)
+    # inherited by the uvicorn worker processes
+    os.environ[MULTIPROC_ENV] = path
+
+
+def _prepare_jobs_dir() -> None:
+    """
+    Give the workers one job state directory, so a job submitted to one
+    worker can be polled on any other.
+    """
+    os.environ[JOBS_DIR_ENV] = tempfile.mkdtemp(prefix="qrparser-jobs-")
+
 
 def main() -> None:
     s = get_settings()
+    if s.ENABLE_PROMETHEUS and s.HTTP_WORKERS > 1:
+        _prepare_multiproc_metrics()
+    if s.HTTP_WORKERS > 1 and not s.JOBS_DIR:
+        _prepare_jobs_dir()
     # Settings provide host/port/workers and log level
     host = s.HTTP_HOST
     port = s.HTTP_PORT
@@ -0,0 +1,68 @@
+# comments in English only
+# Per-family upload limits and bounded, chunked reading of multipart uploads.
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import UploadFile
+
+# read granularity; peak extra memory per request is about max_bytes + one chunk
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+def max_upload_bytes(settings: Any, mime: str) -> int:
+    """Size limit of one upload of this MIME family."""
+    if mime == "application/pdf":
+        return settings.MAX_FILE_SIZE_MB_PDF * 1024 * 1024
+    return settings.MAX_FILE_SIZE_MB_IMG * 1024 * 1024
+
+
+def too_large_detail(mime: str, max_bytes: int) -> str:
+    kind = "PDF" if mime == "application/pdf" else "image"
+    return f"File too large for {kind}. Max size is {max_bytes // (1024*1024)} MB"
+
+
+def decode_error_detail(mime: str) -> str:
+    return "Invalid or unreadable file" if mime != "application/pdf" else "Invalid or unreadable PDF"
+
+
+class UploadTooLarge(Exception):
+    """Raised as soon as an upload crosses its size limit."""
+
+    def __init__(self, max_bytes: int, seen_bytes: int) -> None:
+        super().__init__(f"upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+        self.seen_bytes = seen_bytes
+
+
+async def read_upload_limited(file: UploadFile, max_bytes: int, chunk_size: int = UPLOAD_CHUNK_BYTES) -> bytes:
+    """
+    Read an upload in chunks, aborting once more than max_bytes were seen.
+
+    Starlette spools the part to a SpooledTemporaryFile while parsing, so when
+    its size is already known the limit is checked without reading anything.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(max_bytes, file.size)
+
+    chunks: list[bytes] = []
+    total = 0
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            raise UploadTooLarge(max_bytes, total)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+__all__ = [
+    "UPLOAD_CHUNK_BYTES",
+    "UploadTooLarge",
+    "decode_error_detail",
+    "max_upload_bytes",
+    "read_upload_limited",
+    "too_large_detail",
+]
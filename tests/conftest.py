@@ -7,6 +7,7 @@ from fastapi.testclient import TestClient
 
 from qrparser.web.main import create_app
 from qrparser.web.dependencies import get_decoder
+from qrparser.config.settings import reset_settings_cache
 
 
 class FakeDecoderOK:
@@ -21,6 +22,13 @@ class FakeDecoderFail:
         raise RuntimeError("decode failed")
 
 
+@pytest.fixture(autouse=True)
+def _fresh_settings():
+    """Drop cached settings after each test so env overrides do not leak."""
+    yield
+    reset_settings_cache()
+
+
 def _build_client(fake_decoder) -> TestClient:
     """Build FastAPI app and override decoder dependency."""
     app = create_app()
@@ -52,9 +60,57 @@ def client_ok_factory():
     return _factory
 
 
+@pytest.fixture
+def make_client():
+    """
+    Factory fixture like client_ok_factory, for tests that need their own fake decoder.
+    Usage:
+        client = make_client(CountingDecoder())   # client.app for extra overrides
+    """
+    def _factory(fake_decoder=None) -> TestClient:
+        return _build_client(fake_decoder if fake_decoder is not None else FakeDecoderOK())
+    return _factory
+
+
 @pytest.fixture
 def make_pdf():
     """Return a small helper to write a minimal-enough PDF file."""
     def _write_minimal_pdf(dst: Path, extra_bytes: int = 0) -> None:
         dst.write_bytes(b"%PDF-1.4\n" + (b"0" * max(0, extra_bytes)))
     return _write_minimal_pdf
+
+
+@pytest.fixture
+def make_multipage_pdf():
+    """Return a helper that repeats the fixture page `copies` times into a new PDF."""
+    import pypdfium2 as pdfium
+
+    fixture = Path(__file__).parent / "fixtures" / "test2.pdf"
+
+    def _write(dst: Path, copies: int) -> Path:
+        if not fixture.exists():
+            pytest.skip("Fixture tests/fixtures/test2.pdf is missing")
+        src = pdfium.PdfDocument(str(fixture))
+        out = pdfium.PdfDocument.new()
+        out.import_pages(src, [0] * copies)
+        out.save(str(dst))
+        return dst
+    return _write
+
+
+@pytest.fixture
+def make_qr_image():
+    """Return a helper that encodes `text` as a QR code image (PNG/JPEG bytes)."""
+    import io
+    import numpy as np
+    import zxingcpp
+    from PIL import Image
+
+    def _encode(text: str, fmt: str = "PNG", scale: int = 4, border: int = 16) -> bytes:
+        qr = zxingcpp.create_barcode(text, zxingcpp.BarcodeFormat.QRCode)
+        arr = np.array(qr.to_image(scale=scale))
+        im = Image.fromarray(np.pad(arr, border, constant_values=255))
+        buf = io.BytesIO()
+        im.save(buf, format=fmt)
+        return buf.getvalue()
+    return _encode
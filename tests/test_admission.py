@@ -0,0 +1,128 @@
+# comments in English only
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from qrparser.services.admission import AdmissionController, AdmissionRejected, PixelBudget
+
+
+def test_waiters_get_slots_in_order_and_overflow_is_rejected():
+    ctl = AdmissionController(capacity=1, max_queued=2, max_wait=5.0, retry_after=3)
+    order: list[int] = []
+
+    async def request(i: int) -> None:
+        await ctl.acquire()
+        try:
+            order.append(i)
+            await asyncio.sleep(0.02)
+        finally:
+            ctl.release()
+
+    async def scenario():
+        tasks = [asyncio.create_task(request(i)) for i in range(3)]
+        await asyncio.sleep(0)  # first runs, two wait
+        with pytest.raises(AdmissionRejected) as exc:
+            await ctl.acquire()
+        await asyncio.gather(*tasks)
+        return exc.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.reason == "queue_full" and rejected.retry_after == 3
+    assert order == [0, 1, 2]
+    assert ctl.running == 0 and ctl.waiting == 0
+
+
+def test_wait_times_out_and_frees_its_place():
+    ctl = AdmissionController(capacity=1, max_queued=1, max_wait=0.02)
+
+    async def scenario():
+        await ctl.acquire()
+        with pytest.raises(AdmissionRejected) as exc:
+            await ctl.acquire()
+        assert ctl.waiting == 0
+        ctl.release()
+        await ctl.acquire()  # the slot is free again
+        ctl.release()
+        return exc.value
+
+    assert asyncio.run(scenario()).reason == "queue_timeout"
+    assert ctl.running == 0
+
+
+def test_cancelled_waiter_leaves_the_line():
+    ctl = AdmissionController(capacity=1, max_queued=1, max_wait=5.0)
+
+    async def scenario():
+        await ctl.acquire()
+        waiter = asyncio.create_task(ctl.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()  # client went away while waiting
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert ctl.waiting == 0
+        ctl.release()
+
+    asyncio.run(scenario())
+    assert ctl.running == 0
+
+
+def test_disabled_by_settings():
+    from qrparser.config.settings import Settings
+
+    assert AdmissionController.from_settings(Settings(ADMISSION_ENABLED=False)) is None
+    ctl = AdmissionController.from_settings(Settings(CONCURRENCY=3, ADMISSION_QUEUE_PER_WORKER=2))
+    assert (ctl.capacity, ctl.max_queued) == (3, 6)
+
+
+def test_budget_is_fifo_so_big_jobs_are_not_starved():
+    budget = PixelBudget(megapixels=100.0, max_wait=5.0)
+    order: list[str] = []
+
+    async def job(name: str, cost: float, hold: float) -> None:
+        async with budget.reserve(cost):
+            order.append(name)
+            await asyncio.sleep(hold)
+
+    async def scenario():
+        first = asyncio.create_task(job("small-1", 60.0, 0.05))
+        await asyncio.sleep(0)
+        big = asyncio.create_task(job("big", 500.0, 0.01))  # over budget: runs alone
+        await asyncio.sleep(0)
+        late = asyncio.create_task(job("small-2", 10.0, 0.01))  # would fit, but queues behind big
+        await asyncio.gather(first, big, late)
+
+    asyncio.run(scenario())
+    assert order == ["small-1", "big", "small-2"]
+    assert budget.in_flight == 0 and budget.waiting == 0
+
+
+def test_budget_wait_times_out_and_lets_others_through():
+    budget = PixelBudget(megapixels=100.0, max_wait=0.02, retry_after=4)
+
+    async def scenario():
+        held = await budget.acquire(80.0)
+        with pytest.raises(AdmissionRejected) as exc:
+            await budget.acquire(50.0)
+        assert budget.waiting == 0
+        assert await budget.acquire(20.0) == 20.0  # still fits next to the held one
+        budget.release(20.0)
+        budget.release(held)
+        return exc.value
+
+    rejected = asyncio.run(scenario())
+    assert (rejected.reason, rejected.retry_after) == ("budget_timeout", 4)
+    assert budget.in_flight == 0
+
+
+def test_budget_wait_can_be_extended_per_call():
+    budget = PixelBudget(megapixels=100.0, max_wait=0.01)
+
+    async def scenario():
+        held = await budget.acquire(100.0)
+        asyncio.get_running_loop().call_later(0.05, budget.release, held)
+        return await budget.acquire(50.0, max_wait=5.0)  # e.g. a background job
+
+    assert asyncio.run(scenario()) == 50.0
+    budget.release(50.0)
+    assert budget.in_flight == 0
@@ -0,0 +1,34 @@
+# comments in English only
+from __future__ import annotations
+
+from pathlib import Path
+
+from benchmarks import corpus
+from benchmarks.stats import percentile
+from qrparser.core import DecodeSettings, PdfBarcodeDecoder
+from qrparser.core.image_decoder import ImageBarcodeDecoder
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 50) == 0.0
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(list(range(1, 101)), 95) == 95
+
+
+def test_corpus_is_deterministic_and_decodable(tmp_path: Path):
+    spec = corpus.PRESETS["tiny"]
+    items = corpus.generate(spec, tmp_path / "a")
+    again = corpus.generate(spec, tmp_path / "b")
+
+    assert [i.path for i in items] == [i.path for i in again]
+    assert (tmp_path / "a" / "image-000.png").read_bytes() == (tmp_path / "b" / "image-000.png").read_bytes()
+    assert corpus.load(tmp_path / "a")[1] == items
+    assert any(not i.expected for i in items)  # blank inputs are part of the corpus
+
+    for item in items:
+        data = (tmp_path / "a" / item.path).read_bytes()
+        if item.mime == "application/pdf":
+            codes = PdfBarcodeDecoder(DecodeSettings()).extract_from_bytes(data)
+        else:
+            codes = ImageBarcodeDecoder(DecodeSettings()).extract_from_bytes(data)
+        assert sorted(codes) == sorted(item.expected), item.path
@@ -1,6 +1,9 @@
 # comments in English only
 from __future__ import annotations
 import os
+
+import pytest
+
 import qrparser.config.settings as conf
 
 
@@ -61,3 +64,24 @@ def test_types_and_bounds(monkeypatch):
 
     assert s.DECODE_SCALE == 4.5
     assert s.MAX_PAGES == 10
+
+
+def test_scale_ladder(monkeypatch):
+    _clean_env(monkeypatch)
+    s = conf.get_settings()
+    assert s.DECODE_SCALES == (1.5, 3.0, 5.0)
+    assert s.SCALE_LADDER == (1.5, 3.0, 5.0)
+
+    monkeypatch.setenv("QR_DECODE_SCALES", "[]")
+    conf.reset_settings_cache()
+    assert conf.get_settings().SCALE_LADDER == (3.0, 5.0)
+
+
+def test_decode_formats(monkeypatch):
+    _clean_env(monkeypatch)
+    assert conf.get_settings().DECODE_FORMATS == ("QRCode", "MicroQRCode", "DataMatrix")
+
+    monkeypatch.setenv("QR_DECODE_FORMATS", '["NotAFormat"]')
+    conf.reset_settings_cache()
+    with pytest.raises(ValueError):
+        conf.get_settings()
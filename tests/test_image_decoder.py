@@ -0,0 +1,116 @@
+# comments in English only
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from qrparser.core.image_decoder import ImageBarcodeDecoder
+
+
+@pytest.mark.parametrize("fmt", ["PNG", "JPEG"])
+def test_extract_from_bytes(make_qr_image, fmt):
+    data = make_qr_image("IMG-QR-1", fmt=fmt)
+    assert ImageBarcodeDecoder().extract_from_bytes(data) == ["IMG-QR-1"]
+
+
+def test_extract_from_file_matches_bytes(make_qr_image, tmp_path: Path):
+    data = make_qr_image("IMG-QR-2")
+    path = tmp_path / "code.png"
+    path.write_bytes(data)
+
+    dec = ImageBarcodeDecoder()
+    assert dec.extract_from_file(path) == dec.extract_from_bytes(data) == ["IMG-QR-2"]
+
+
+def test_cost_estimate_reads_header_dimensions(make_qr_image):
+    import io
+
+    from PIL import Image
+
+    from qrparser.core import DecodeSettings
+
+    data = make_qr_image("COST")
+    with Image.open(io.BytesIO(data)) as im:
+        w, h = im.size
+    est = ImageBarcodeDecoder.estimate_megapixels(data, DecodeSettings(scales=(1.5, 3.0)))
+    assert est == pytest.approx(w * h * 9 / 1e6)
+
+
+def test_max_megapixels_clamps_upscaling(make_qr_image):
+    from qrparser.core import DecodeReport, DecodeSettings
+
+    data = make_qr_image("CLAMPED")
+    report = DecodeReport()
+    dec = ImageBarcodeDecoder(DecodeSettings(scales=(10.0,), max_megapixels=0.5))
+    assert dec.extract_from_bytes(data, report=report) == ["CLAMPED"]
+    assert report.bitmap_bytes <= 0.5e6
+
+
+def test_small_images_go_native_first_and_large_ones_are_never_upscaled():
+    from qrparser.core import DecodeSettings
+
+    settings = DecodeSettings(scales=(1.5, 3.0), large_image_megapixels=2.0)
+    assert ImageBarcodeDecoder.plan_steps(400, 300, settings) == ((1.0, 1.0), (1.5, 1.5), (3.0, 3.0))
+    steps = ImageBarcodeDecoder.plan_steps(4000, 3000, settings)  # 12 MP phone photo
+    assert [label for label, _ in steps] == [0.408, 1.0]
+    assert 4000 * 3000 * steps[0][1] ** 2 <= 2e6
+    assert ImageBarcodeDecoder.plan_steps(4000, 3000, DecodeSettings(large_image_megapixels=None))[0] == (1.0, 1.0)
+
+
+@pytest.mark.parametrize("fmt", ["JPEG", "PNG"])
+def test_large_photo_is_decoded_reduced_first(fmt):
+    import io
+
+    import numpy as np
+    import zxingcpp
+    from PIL import Image
+
+    from qrparser.core import DecodeReport, DecodeSettings
+
+    code = np.array(zxingcpp.create_barcode("PHOTO", zxingcpp.BarcodeFormat.QRCode).to_image(scale=12))
+    photo = np.full((1200, 1600), 230, dtype=np.uint8)
+    photo[300:300 + code.shape[0], 500:500 + code.shape[1]] = code
+    buf = io.BytesIO()
+    Image.fromarray(photo).convert("RGB").save(buf, format=fmt)
+
+    report = DecodeReport()
+    dec = ImageBarcodeDecoder(DecodeSettings(large_image_megapixels=0.5))
+    assert dec.extract_from_bytes(buf.getvalue(), report=report) == ["PHOTO"]
+    # one grayscale bitmap at the reduced size, no upscaled frame
+    assert report.bitmap_bytes <= 0.5e6
+    assert [s for s in report.scale_hits] == [0.51]
+    assert report.fallback_pages == 0
+
+
+def test_extract_from_bytes_rejects_garbage():
+    with pytest.raises(Exception):
+        ImageBarcodeDecoder().extract_from_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 32)
+
+
+def test_jpeg_decodes_to_luminance_without_rgb_frame(make_qr_image):
+    import io
+    from PIL import Image
+
+    from qrparser.core import DecodeSettings
+
+    dec = ImageBarcodeDecoder(DecodeSettings(scales=(1.0,)))
+    with Image.open(io.BytesIO(make_qr_image("GRAY", fmt="JPEG"))) as im:
+        loaded = dec._load(im)
+        assert loaded.mode == "L"
+    assert dec.extract_from_bytes(make_qr_image("GRAY", fmt="JPEG")) == ["GRAY"]
+
+
+def test_exif_orientation_is_applied(make_qr_image):
+    import io
+    from PIL import Image
+
+    # store the code rotated and let the EXIF tag undo it
+    with Image.open(io.BytesIO(make_qr_image("ROTATED", fmt="PNG"))) as im:
+        rotated = im.rotate(90, expand=True)
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotate 90 CW on display
+    buf = io.BytesIO()
+    rotated.save(buf, format="JPEG", exif=exif.tobytes())
+
+    assert ImageBarcodeDecoder().extract_from_bytes(buf.getvalue()) == ["ROTATED"]
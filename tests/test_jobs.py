@@ -0,0 +1,120 @@
+# comments in English only
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import qrparser.services.jobs as jobs_mod
+from qrparser.services.jobs import JobQueue, JobQueueFull
+
+
+def test_jobs_run_and_report_results():
+    async def scenario():
+        q = JobQueue(max_queued=4, workers=2)
+        q.start()
+
+        async def ok():
+            await asyncio.sleep(0.01)
+            return ["A"]
+
+        async def bad():
+            raise RuntimeError("boom")
+
+        j1, j2 = q.submit(ok, file_name="a.pdf"), q.submit(bad)
+        assert j1.status == "queued"
+        while q.get(j1.id).finished_at is None or q.get(j2.id).finished_at is None:
+            await asyncio.sleep(0.01)
+        await q.stop()
+        return q.get(j1.id), q.get(j2.id)
+
+    done, failed = asyncio.run(scenario())
+    assert (done.status, done.codes, done.file_name) == ("done", ["A"], "a.pdf")
+    assert (failed.status, failed.error) == ("failed", "Invalid or unreadable file")
+
+
+def test_queue_is_bounded_and_results_expire():
+    async def scenario():
+        q = JobQueue(max_queued=1, workers=1, ttl_seconds=0.05)
+        q.start()
+        gate = asyncio.Event()
+
+        async def blocked():
+            await gate.wait()
+            return []
+
+        first = q.submit(blocked)
+        await asyncio.sleep(0.01)  # consumer picks it up, queue is empty again
+        q.submit(blocked)
+        with pytest.raises(JobQueueFull):
+            q.submit(blocked)
+
+        gate.set()
+        while q.get(first.id).finished_at is None:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+        gone = q.get(first.id)
+        await q.stop()
+        return gone
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_callback_receives_finished_job(monkeypatch):
+    posted = []
+    monkeypatch.setattr(jobs_mod, "_post_json", lambda url, payload: posted.append((url, payload)))
+
+    async def scenario():
+        q = JobQueue()
+        q.start()
+
+        async def ok():
+            return ["X"]
+
+        job = q.submit(ok, callback_url="http://hook.local/done")
+        while not posted:
+            await asyncio.sleep(0.01)
+        await q.stop()
+        return job
+
+    job = asyncio.run(scenario())
+    url, payload = posted[0]
+    assert url == "http://hook.local/done"
+    assert payload["job_id"] == job.id
+    assert payload["status"] == "done"
+    assert payload["codes"] == ["X"]
+    assert "callback_url" not in payload
+
+
+def test_job_state_is_shared_through_jobs_dir(tmp_path):
+    async def scenario():
+        worker_a = JobQueue(jobs_dir=tmp_path)
+        worker_b = JobQueue(jobs_dir=tmp_path)  # e.g. another uvicorn worker, never started
+        worker_a.start()
+
+        async def ok():
+            return ["SHARED"]
+
+        job = worker_a.submit(ok, file_name="a.pdf")
+        assert worker_b.get(job.id).status == "queued"
+        while worker_a.get(job.id).finished_at is None:
+            await asyncio.sleep(0.01)
+        await worker_a.stop()
+        return job.id, worker_b.get(job.id)
+
+    job_id, seen = asyncio.run(scenario())
+    assert (seen.id, seen.status, seen.codes, seen.file_name) == (job_id, "done", ["SHARED"], "a.pdf")
+    assert JobQueue(jobs_dir=tmp_path).get("../" + job_id) is None
+
+
+def test_expired_job_files_are_swept(tmp_path):
+    import os
+    import time
+
+    q = JobQueue(ttl_seconds=60.0, jobs_dir=tmp_path, sweep_interval=0.0)
+    stale = tmp_path / ("0" * 32 + ".json")
+    stale.write_text('{"id": "' + "0" * 32 + '", "status": "done", "finished_at": 1.0}')
+    os.utime(stale, (time.time() - 120, time.time() - 120))
+
+    assert q.get("0" * 32) is None
+    assert list(tmp_path.iterdir()) == []
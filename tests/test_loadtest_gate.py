@@ -0,0 +1,46 @@
+# comments in English only
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from benchmarks import loadtest
+
+
+def _run(p95: float, rps: float) -> dict:
+    return {"latency_ms": {"p95": p95}, "throughput_rps": rps}
+
+
+def test_compare_passes_within_thresholds():
+    assert loadtest.compare(_run(100, 50), _run(115, 46), 20, 10) == []
+
+
+def test_compare_flags_p95_and_throughput_regressions():
+    failures = loadtest.compare(_run(100, 50), _run(130, 40), 20, 10)
+    assert len(failures) == 2
+    assert failures[0].startswith("p95")
+    assert failures[1].startswith("throughput")
+
+
+def test_compare_command_exit_code(tmp_path: Path):
+    base, cur = tmp_path / "base.json", tmp_path / "cur.json"
+    base.write_text(json.dumps(_run(100, 50)))
+    cur.write_text(json.dumps(_run(200, 50)))
+    assert loadtest.main(["compare", str(base), str(base)]) == 0
+    assert loadtest.main(["compare", str(base), str(cur)]) == 1
+
+
+def test_parse_mix():
+    assert loadtest._parse_mix("pdf=3, image=1") == {"pdf": 3.0, "image": 1.0}
+
+
+def test_retry_after_header():
+    import httpx
+
+    assert loadtest._retry_after(httpx.Response(503, headers={"Retry-After": "2"})) == 2.0
+    assert loadtest._retry_after(httpx.Response(503)) == 1.0
+    assert loadtest._retry_after(httpx.Response(503, headers={"Retry-After": "Wed, 21 Oct 2026"})) == 1.0
@@ -0,0 +1,29 @@
+# comments in English only
+from __future__ import annotations
+
+import pytest
+
+from qrparser.core.pages import LAST, parse_page_spec, select_pages
+
+
+def test_parse_page_spec():
+    assert parse_page_spec("1-3,5,last") == ((1, 3), (5, 5), (LAST, LAST))
+    assert parse_page_spec("2-, 4-last") == ((2, LAST), (4, LAST))
+
+
+@pytest.mark.parametrize("spec", ["", "0", "3-1", "last-2", "a", "1-x", ","])
+def test_parse_page_spec_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_page_spec(spec)
+
+
+def test_select_pages_orders_dedupes_and_clamps():
+    assert select_pages(10, "last,1-3,2") == [0, 1, 2, 9]
+    assert select_pages(4, "3-99") == [2, 3]
+    assert select_pages(2, "5") == []
+    assert select_pages(5) == [0, 1, 2, 3, 4]
+
+
+def test_max_pages_applies_after_selection():
+    assert select_pages(100, max_pages=3) == [0, 1, 2]
+    assert select_pages(100, "50-,1", max_pages=2) == [0, 49]
@@ -21,3 +21,320 @@ def test_extract_from_pdf_smoke():
     assert isinstance(vals, list)
     assert all(isinstance(v, str) for v in vals)
     assert len(vals) == 1
+
+
+def test_plan_page_ranges_is_contiguous_and_complete():
+    dec = PdfBarcodeDecoder(DecodeSettings(page_workers=3))
+    assert dec.plan_page_ranges(7) == [(0, 3), (3, 5), (5, 7)]
+    assert dec.plan_page_ranges(2) == [(0, 1), (1, 2)]
+    assert dec.plan_page_ranges(0) == [(0, 0)]
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+def test_parallel_pages_match_sequential(tmp_path: Path, make_multipage_pdf):
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=3)
+
+    seq = PdfBarcodeDecoder(DecodeSettings()).extract_from_file(pdf)
+    par = PdfBarcodeDecoder(DecodeSettings(page_workers=2)).extract_from_file(pdf)
+
+    assert len(seq) == 3
+    assert par == seq
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_extract_from_bytes_matches_file(wrap):
+    dec = PdfBarcodeDecoder(DecodeSettings(scale=3.5, fallback_scale=5.0))
+    data = wrap(TEST_PDF.read_bytes())
+
+    assert dec.extract_from_bytes(data) == dec.extract_from_file(TEST_PDF)
+
+
+def test_ladder_defaults_to_scale_and_fallback():
+    assert DecodeSettings().ladder() == (3.5, 5.0)
+    assert DecodeSettings(scale=2.0, fallback_scale=2.0).ladder() == (2.0,)
+    assert DecodeSettings(scales=(1.5, 3.0, 1.5, 5.0)).ladder() == (1.5, 3.0, 5.0)
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+def test_ladder_escalates_and_reports_successful_rung():
+    from qrparser.core import DecodeReport
+
+    report = DecodeReport()
+    # 1.0x is too small for the fixture QR, 1.5x is enough; 5.0x must never run
+    dec = PdfBarcodeDecoder(DecodeSettings(scales=(1.0, 1.5, 5.0)))
+    vals = dec.extract_from_file(TEST_PDF, report=report)
+
+    assert len(vals) == 1
+    assert report.scale_hits == {1.5: 1}
+    assert report.misses == 0
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+def test_report_has_per_page_stage_stats():
+    from qrparser.core import DecodeReport
+
+    report = DecodeReport()
+    PdfBarcodeDecoder(DecodeSettings(scales=(1.0, 1.5), embedded_images=False)).extract_from_file(
+        TEST_PDF, report=report
+    )
+
+    [page] = report.page_stats
+    assert page.index == 0
+    assert page.scale == 1.5 and page.fallback and not page.embedded
+    assert page.render_ms > 0 and page.decode_ms > 0
+    assert page.bitmap_bytes == report.bitmap_bytes > 0
+    assert (report.fallback_pages, report.fallback_hits) == (1, 1)
+    assert report.as_log()["page_stats"][0]["scale"] == 1.5
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+def test_grayscale_render_is_one_byte_per_pixel_and_decodes_the_same():
+    import pypdfium2 as pdfium
+
+    page = pdfium.PdfDocument(str(TEST_PDF))[0]
+    gray = PdfBarcodeDecoder._render_page_gray(page, 1.5)
+    rgb = PdfBarcodeDecoder._render_page_rgb(page, 1.5)
+    assert gray.ndim == 2 and gray.dtype.name == "uint8"
+    assert gray.nbytes * 3 == rgb.nbytes
+
+    as_gray = PdfBarcodeDecoder(DecodeSettings(grayscale=True)).extract_from_file(TEST_PDF)
+    as_rgb = PdfBarcodeDecoder(DecodeSettings(grayscale=False)).extract_from_file(TEST_PDF)
+    assert as_gray == as_rgb and len(as_gray) == 1
+
+
+def _scan_pdf(text: str) -> bytes:
+    """One A4 page that is a single embedded 200 dpi JPEG with a QR on it."""
+    import io
+
+    import numpy as np
+    import zxingcpp
+    from PIL import Image
+
+    qr = np.array(zxingcpp.create_barcode(text, zxingcpp.BarcodeFormat.QRCode).to_image(scale=6))
+    page = Image.new("RGB", (1654, 2339), "white")
+    page.paste(Image.fromarray(qr).convert("RGB"), (200, 200))
+    buf = io.BytesIO()
+    page.save(buf, format="PDF", resolution=200)
+    return buf.getvalue()
+
+
+def test_scanned_page_is_decoded_from_embedded_image():
+    from qrparser.core import DecodeReport
+
+    report = DecodeReport()
+    vals = PdfBarcodeDecoder(DecodeSettings()).extract_from_bytes(_scan_pdf("SCAN-1"), report=report)
+
+    assert vals == ["SCAN-1"]
+    assert report.embedded_hits == 1
+    assert report.scale_hits == {}  # the page was never rendered
+
+
+def _picture_and_vector_pdf(picture: str, vector: str) -> bytes:
+    """A4 page with one QR as an embedded image and another drawn as filled rectangles."""
+    import io
+
+    import numpy as np
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
+    import zxingcpp
+    from PIL import Image
+
+    pdf = pdfium.PdfDocument.new()
+    page = pdf.new_page(595, 842)
+
+    qr = np.array(zxingcpp.create_barcode(picture, zxingcpp.BarcodeFormat.QRCode).to_image(scale=4))
+    img = pdfium.PdfImage.new(pdf)
+    img.set_bitmap(pdfium.PdfBitmap.from_pil(Image.fromarray(qr).convert("RGB")))
+    img.set_matrix(pdfium.PdfMatrix().scale(100, 100).translate(60, 680))
+    page.insert_obj(img)
+
+    modules = np.array(zxingcpp.create_barcode(vector, zxingcpp.BarcodeFormat.QRCode).to_image(scale=1)) < 128
+    unit, x0, y0 = 4.0, 300.0, 300.0
+    for r, c in zip(*np.nonzero(modules)):
+        y = y0 + (modules.shape[0] - r) * unit
+        rect = pdfium_c.FPDFPageObj_CreateNewRect(x0 + c * unit, y, unit, unit)
+        pdfium_c.FPDFPageObj_SetFillColor(rect, 0, 0, 0, 255)
+        pdfium_c.FPDFPath_SetDrawMode(rect, pdfium_c.FPDF_FILLMODE_WINDING, False)
+        pdfium_c.FPDFPage_InsertObject(page.raw, rect)
+    page.gen_content()
+
+    buf = io.BytesIO()
+    pdf.save(buf)
+    return buf.getvalue()
+
+
+def test_page_with_picture_and_vector_codes_gets_both(monkeypatch):
+    from qrparser.core import DecodeReport
+
+    dec = PdfBarcodeDecoder(DecodeSettings(grayscale=True))
+    shapes: list[tuple[int, ...]] = []
+    decode_all = dec._decode_all
+    monkeypatch.setattr(dec, "_decode_all", lambda img: shapes.append(img.shape) or decode_all(img))
+    report = DecodeReport()
+
+    vals = dec.extract_from_bytes(_picture_and_vector_pdf("PICTURE", "VECTOR"), report=report)
+
+    # the picture alone does not cover the page, so it is rendered as well
+    assert vals == ["PICTURE", "VECTOR"]
+    assert report.embedded_hits == 1 and sum(report.scale_hits.values()) == 1
+    assert report.misses == 0
+    assert all(len(shape) == 2 for shape in shapes)  # embedded BGR was converted to L too
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+def test_vector_page_falls_back_to_rendering():
+    from qrparser.core import DecodeReport
+
+    report = DecodeReport()
+    vals = PdfBarcodeDecoder(DecodeSettings()).extract_from_file(TEST_PDF, report=report)
+
+    assert len(vals) == 1
+    assert report.embedded_hits == 0
+    assert sum(report.scale_hits.values()) == 1
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+@pytest.mark.parametrize(
+    "opts, expected",
+    [({"stop_after_first": True}, 1), ({"max_codes": 2}, 2), ({"max_codes": 10}, 4)],
+)
+def test_early_exit_stops_rendering(tmp_path: Path, make_multipage_pdf, opts, expected):
+    from qrparser.core import DecodeReport
+
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=4)
+    report = DecodeReport()
+    vals = PdfBarcodeDecoder(DecodeSettings(**opts)).extract_from_file(pdf, report=report)
+
+    assert len(vals) == expected
+    assert report.pages == expected  # one code per page: no page past the target is rendered
+    assert report.stopped_early is (expected < 4)
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+def test_early_exit_in_parallel_mode(tmp_path: Path, make_multipage_pdf):
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=4)
+    vals = PdfBarcodeDecoder(DecodeSettings(page_workers=2, max_codes=1)).extract_from_file(pdf)
+    assert len(vals) == 1
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+@pytest.mark.parametrize("formats, expected", [(("QRCode",), 0), (("DataMatrix",), 1), (None, 1)])
+def test_format_filter(formats, expected):
+    dec = PdfBarcodeDecoder(DecodeSettings(formats=formats, embedded_images=False))
+    assert len(dec.extract_from_file(TEST_PDF)) == expected
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+def test_iter_pages_is_lazy(tmp_path: Path, make_multipage_pdf):
+    from qrparser.core import DecodeReport
+
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=3)
+    report = DecodeReport()
+    pages = PdfBarcodeDecoder(DecodeSettings()).iter_pages(pdf, report=report)
+
+    first = next(pages)
+    assert (first.index, len(first.codes)) == (0, 1)
+    assert report.pages == 1  # nothing past the first page was touched yet
+    pages.close()
+    assert report.pages == 1
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+@pytest.mark.parametrize("workers", [1, 2])
+def test_page_selection_and_max_pages(tmp_path: Path, make_multipage_pdf, workers):
+    from qrparser.core import DecodeReport
+
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=5)
+    report = DecodeReport()
+    dec = PdfBarcodeDecoder(DecodeSettings(pages="1,4-last", max_pages=2, page_workers=workers))
+
+    assert len(dec.extract_from_file(pdf, report=report)) == 2
+    assert [p.index for p in report.page_stats] == [0, 3]
+    assert PdfBarcodeDecoder.page_summary(pdf, dec.settings) == {"pages_total": 5, "pages_skipped": 3}
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+def test_expired_deadline_returns_partial_result(tmp_path: Path, make_multipage_pdf):
+    import time
+
+    from qrparser.core import DecodeReport
+
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=3)
+    report = DecodeReport()
+    vals = PdfBarcodeDecoder(DecodeSettings()).extract_from_file(pdf, report=report, deadline=time.time() - 1)
+
+    assert vals == []
+    assert report.deadline_exceeded and report.pages == 0
+
+    report = DecodeReport()
+    vals = PdfBarcodeDecoder(DecodeSettings()).extract_from_file(pdf, report=report, deadline=time.time() + 60)
+    assert len(vals) == 3 and not report.deadline_exceeded
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+def test_cost_estimate_follows_selection_and_largest_rung(tmp_path: Path, make_multipage_pdf):
+    import pypdfium2 as pdfium
+
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=4)
+    doc = pdfium.PdfDocument(str(pdf))
+    w, h = doc.get_page_size(0)
+    doc.close()
+
+    opts = {"embedded_images": False}
+    all_pages = PdfBarcodeDecoder.estimate_megapixels(pdf, DecodeSettings(scales=(1.0, 2.0), **opts))
+    assert all_pages == pytest.approx(4 * w * h * 4 / 1e6)
+    two_pages = PdfBarcodeDecoder.estimate_megapixels(
+        pdf.read_bytes(), DecodeSettings(scales=(2.0,), pages="1-2", **opts)
+    )
+    assert two_pages == pytest.approx(all_pages / 2)
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test2.pdf not found at repo root")
+def test_max_megapixels_clamps_each_render():
+    from qrparser.core import DecodeReport
+
+    report = DecodeReport()
+    dec = PdfBarcodeDecoder(DecodeSettings(scales=(5.0,), embedded_images=False, max_megapixels=2.0))
+    assert len(dec.extract_from_file(TEST_PDF, report=report)) == 1
+    # one grayscale render, one byte per pixel
+    assert 1.5e6 < report.bitmap_bytes <= 2e6
+    assert report.scale_hits == {5.0: 1}  # the hit is reported against the ladder rung
+
+
+def test_executor_is_keyword_only():
+    import inspect
+
+    for name in ("extract_from_file", "extract_from_bytes"):
+        params = inspect.signature(getattr(PdfBarcodeDecoder, name)).parameters
+        assert list(params)[2] == "report"
+        assert params["executor"].kind is inspect.Parameter.KEYWORD_ONLY
+
+
+def test_embedded_images_over_the_bitmap_cap_are_left_to_the_render():
+    from qrparser.core import DecodeReport
+
+    data = _scan_pdf("BIG-SCAN")  # one 1654x2339 px (3.9 MP) image
+    report = DecodeReport()
+    vals = PdfBarcodeDecoder(DecodeSettings(max_megapixels=2.0)).extract_from_bytes(data, report=report)
+
+    assert vals == ["BIG-SCAN"]
+    assert report.embedded_hits == 0 and sum(report.scale_hits.values()) == 1
+
+    # embedded images are charged as much again as the render, at most max_megapixels per page
+    rendered_only = PdfBarcodeDecoder.estimate_megapixels(data, DecodeSettings(embedded_images=False))
+    assert PdfBarcodeDecoder.estimate_megapixels(data, DecodeSettings()) == pytest.approx(2 * rendered_only)
+    capped = PdfBarcodeDecoder.estimate_megapixels(data, DecodeSettings(max_megapixels=2.0))
+    render = PdfBarcodeDecoder.estimate_megapixels(data, DecodeSettings(max_megapixels=2.0, embedded_images=False))
+    assert capped == pytest.approx(render + min(render, 2.0))
+
+
+def test_pdfium_buffer_avoids_copies():
+    from qrparser.core.pdf_decoder import _as_pdfium_buffer
+
+    data = b"%PDF-1.4\nbody"
+    assert _as_pdfium_buffer(data) is data
+    assert _as_pdfium_buffer(memoryview(data)) is data  # read-only view of whole bytes
+    assert _as_pdfium_buffer(memoryview(data)[1:]) == data[1:]  # partial view: copied
+    writable = bytearray(data)
+    assert bytes(_as_pdfium_buffer(writable)) == data
@@ -0,0 +1,80 @@
+# comments in English only
+from __future__ import annotations
+
+import io
+
+import numpy as np
+import pypdfium2 as pdfium
+import pytest
+import zxingcpp
+from PIL import Image, ImageDraw
+
+from qrparser.core import DecodeReport, DecodeSettings, PdfBarcodeDecoder
+from qrparser.core.regions import find_candidate_regions, texture_regions
+
+
+@pytest.fixture
+def text_page_with_small_qr() -> bytes:
+    """A4 page (144 dpi raster) full of text with one small QR near the bottom right."""
+    page = Image.new("L", (1190, 1684), 255)
+    draw = ImageDraw.Draw(page)
+    for i in range(40):
+        draw.text((80, 100 + i * 30), f"Lorem ipsum dolor sit amet, consectetur adipiscing elit {i}", fill=0)
+    qr = zxingcpp.create_barcode("ROI-TEST", zxingcpp.BarcodeFormat.QRCode).to_image(scale=3)
+    page.paste(Image.fromarray(np.array(qr)), (900, 1400))
+    buf = io.BytesIO()
+    page.save(buf, format="PDF", resolution=144)
+    return buf.getvalue()
+
+
+def _render_gray(data: bytes, scale: float) -> np.ndarray:
+    page = pdfium.PdfDocument(data)[0]
+    return np.array(page.render(scale=scale).to_pil().convert("L"))
+
+
+def test_texture_heuristic_finds_code_and_ignores_text(text_page_with_small_qr):
+    img = _render_gray(text_page_with_small_qr, 0.5)
+    boxes = texture_regions(img, max_regions=8)
+
+    assert len(boxes) == 1
+    x0, y0, x1, y1 = boxes[0]
+    # the 87 px QR image is pasted at (900, 1400) px of a 144 dpi page: at 0.5x
+    # one page pixel is 0.25 render pixels, so its centre lands near (236, 361)
+    assert x0 <= 236 < x1 and y0 <= 361 < y1
+    assert (x1 - x0) * (y1 - y0) < 64 * 64
+
+
+def test_find_candidate_regions_on_blank_page_is_empty():
+    assert find_candidate_regions(np.full((400, 300), 255, dtype=np.uint8)) == []
+
+
+def test_roi_mode_decodes_from_cropped_rerender(text_page_with_small_qr):
+    report = DecodeReport()
+    # 0.5x cannot decode the code, the full page is never rendered at 3x
+    # (the page is a raster scan, so skip the embedded-image fast path here)
+    dec = PdfBarcodeDecoder(DecodeSettings(scales=(0.5, 3.0), roi=True, embedded_images=False))
+
+    assert dec.extract_from_bytes(text_page_with_small_qr, report=report) == ["ROI-TEST"]
+    assert report.roi_hits == 1
+    assert report.scale_hits == {3.0: 1}
+
+
+def test_box_to_crop_maps_pixels_to_canvas_units():
+    # 100x200 pt page rendered at 2x -> 200x400 px; box (20..60, 40..80) px
+    crop = PdfBarcodeDecoder._box_to_crop((20, 40, 60, 80), 2.0, (400, 200))
+    left, bottom, right, top = crop
+    assert left == pytest.approx(10 - 4)
+    assert top == pytest.approx(20 - 4)
+    assert right == pytest.approx(100 - 30 - 4)
+    assert bottom == pytest.approx(200 - 40 - 4)
+
+
+def test_roi_miss_falls_back_to_full_page_rungs(text_page_with_small_qr, monkeypatch):
+    report = DecodeReport()
+    dec = PdfBarcodeDecoder(DecodeSettings(scales=(0.5, 3.0), roi=True, embedded_images=False))
+    # candidate regions that hold nothing decodable (false positives)
+    monkeypatch.setattr(dec, "_decode_regions", lambda *args, **kwargs: [])
+
+    assert dec.extract_from_bytes(text_page_with_small_qr, report=report) == ["ROI-TEST"]
+    assert report.roi_hits == 0
+    assert report.scale_hits == {3.0: 1} and report.misses == 0
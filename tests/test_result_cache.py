@@ -0,0 +1,71 @@
+# comments in English only
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from qrparser.core import DecodeSettings
+from qrparser.services.result_cache import ResultCache, cache_key, content_digest
+
+
+def test_key_depends_on_content_mime_and_settings():
+    d = content_digest(b"same bytes")
+    base = cache_key(d, "application/pdf", DecodeSettings())
+    assert base == cache_key(d, "application/pdf", DecodeSettings())
+    assert base != cache_key(d, "image/png", DecodeSettings())
+    assert base != cache_key(d, "application/pdf", DecodeSettings(scale=2.0))
+    assert base != cache_key(content_digest(b"other"), "application/pdf", DecodeSettings())
+
+
+def test_memory_lru_evicts_oldest_and_counts():
+    cache = ResultCache(max_entries=2)
+
+    async def scenario():
+        await cache.put("a", ["A"])
+        await cache.put("b", ["B"])
+        assert (await cache.get("a"))[0] == ["A"]  # touch a -> b is now oldest
+        await cache.put("c", ["C"])
+        return await cache.get("b"), await cache.get("a")
+
+    miss_b, hit_a = asyncio.run(scenario())
+    assert miss_b == (None, "miss")
+    assert hit_a == (["A"], "memory")
+    assert cache.stats()["cache_hits"] == 2
+    assert cache.stats()["cache_misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = ResultCache(ttl_seconds=0.01)
+
+    async def scenario():
+        await cache.put("k", ["V"])
+        await asyncio.sleep(0.05)
+        return await cache.get("k")
+
+    assert asyncio.run(scenario()) == (None, "miss")
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path: Path):
+    writer = ResultCache(cache_dir=tmp_path)
+    reader = ResultCache(cache_dir=tmp_path)  # e.g. another uvicorn worker
+
+    asyncio.run(writer.put("shared-key", ["X", "Y"]))
+    assert asyncio.run(reader.get("shared-key")) == (["X", "Y"], "disk")
+    # promoted into the reader's memory tier
+    assert asyncio.run(reader.get("shared-key")) == (["X", "Y"], "memory")
+
+
+def test_disk_tier_sweeps_expired_files(tmp_path: Path):
+    import os
+    import time
+
+    cache = ResultCache(ttl_seconds=60.0, cache_dir=tmp_path, sweep_interval=0.0)
+    asyncio.run(cache.put("old-key", ["OLD"]))
+    stale = time.time() - 120
+    for path in tmp_path.glob("*/*"):
+        os.utime(path, (stale, stale))
+    (tmp_path / "ol" / "crashed.tmp").write_text("[")
+    os.utime(tmp_path / "ol" / "crashed.tmp", (stale, stale))
+
+    asyncio.run(cache.put("new-key", ["NEW"]))  # old-key is never read again; this write sweeps it
+    assert sorted(p.name for p in tmp_path.glob("*/*")) == ["new-key.json"]
@@ -0,0 +1,38 @@
+# comments in English only
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from qrparser.core import DecodeSettings
+from qrparser.core.scaling import base_scale_image, base_scale_pdf, clamp_scale, rung_scales
+
+
+def test_clamp_keeps_rounded_bitmaps_under_the_cap():
+    # A0 at 5x would be ~200 MP
+    s = clamp_scale(5.0, 2384, 3370, 64.0)
+    assert s < 5.0
+    assert math.ceil(2384 * s) * math.ceil(3370 * s) <= 64e6
+    assert clamp_scale(5.0, 200, 300, 64.0) == 5.0  # small pages are left alone
+    assert clamp_scale(5.0, 2384, 3370, None) == 5.0
+
+
+def test_rungs_clamped_onto_each_other_are_dropped():
+    settings = DecodeSettings(scales=(1.5, 3.0, 5.0), max_megapixels=8.0)
+    # A3 (842 x 1191 pt): 1.5x fits, 3x and 5x both clamp to the same ~2.8x
+    steps = rung_scales(842, 1191, settings)
+    assert [rung for rung, _ in steps] == [1.5, 3.0]
+    assert steps[0][1] == 1.5 and 2.7 < steps[1][1] < 2.9
+
+    assert rung_scales(595, 842, DecodeSettings(scales=(1.5, 3.0, 5.0))) == ((1.5, 1.5), (3.0, 3.0), (5.0, 5.0))
+
+
+def test_target_dpi_sets_the_base_scale():
+    settings = DecodeSettings(target_dpi=144)
+    assert base_scale_pdf(settings) == 2.0
+    assert base_scale_pdf(DecodeSettings()) == 1.0
+    # a tiny image grows and a 12 MP photo shrinks towards an A4 page at 144 dpi
+    assert base_scale_image(300, 400, settings) > 3
+    assert base_scale_image(3000, 4000, settings) == pytest.approx(math.sqrt(8.27 * 11.69 * 144 ** 2 / 12e6))
+    assert base_scale_image(3000, 4000, DecodeSettings()) == 1.0
@@ -0,0 +1,63 @@
+# comments in English only
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from qrparser.services.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_run():
+    sf: SingleFlight[str] = SingleFlight()
+    calls = 0
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        return await asyncio.gather(*(sf.do("k", work) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert calls == 1
+    assert [r[0] for r in results] == ["done"] * 5
+    assert sorted(r[1] for r in results) == [False, True, True, True, True]
+    assert len(sf) == 0
+
+
+def test_errors_reach_every_waiter_and_key_is_released():
+    sf: SingleFlight[str] = SingleFlight()
+
+    async def boom() -> str:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("decode failed")
+
+    async def scenario():
+        return await asyncio.gather(sf.do("k", boom), sf.do("k", boom), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(sf) == 0
+
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    sf: SingleFlight[str] = SingleFlight()
+
+    async def work() -> str:
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def scenario():
+        leader = asyncio.ensure_future(sf.do("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(sf.do("k", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == ("ok", True)
@@ -0,0 +1,165 @@
+# comments in English only
+from __future__ import annotations
+
+import asyncio
+import operator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from qrparser.config.settings import reset_settings_cache
+from qrparser.services.decode_pool import DecodePool
+from qrparser.web.main import create_app
+
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "test2.pdf"
+
+
+def test_pool_falls_back_to_thread_when_not_started():
+    pool = DecodePool(max_workers=1)
+    assert not pool.started
+    assert asyncio.run(pool.run(operator.add, 2, 3)) == 5
+
+
+def test_pool_runs_jobs_in_worker_process():
+    pool = DecodePool(max_workers=1)
+    pool.start()
+    try:
+        assert pool.started
+        assert asyncio.run(pool.run(operator.mul, 6, 7)) == 42
+    finally:
+        pool.shutdown()
+    assert not pool.started
+
+
+@pytest.mark.integration
+def test_lifespan_starts_and_stops_pool():
+    if not FIXTURE.exists():
+        pytest.skip("Fixture tests/fixtures/test2.pdf is missing")
+
+    app = create_app()
+    with TestClient(app) as client:
+        assert app.state.decode_pool.started
+        files = {"file": ("test2.pdf", FIXTURE.read_bytes(), "application/pdf")}
+        resp = client.post("/v1/parse", files=files)
+        assert resp.status_code == 200, resp.text
+        assert len(resp.json()["codes"]) == 1
+
+    assert not app.state.decode_pool.started
+
+
+@pytest.mark.integration
+def test_pdf_page_ranges_fan_out_over_pool(tmp_path: Path, monkeypatch, make_multipage_pdf):
+    monkeypatch.setenv("QR_PDF_PAGE_WORKERS", "2")
+    reset_settings_cache()
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=3)
+
+    app = create_app()
+    with TestClient(app) as client:
+        files = {"file": ("multi.pdf", pdf.read_bytes(), "application/pdf")}
+        resp = client.post("/v1/parse", files=files)
+
+    assert resp.status_code == 200, resp.text
+    codes = resp.json()["codes"]
+    assert len(codes) == 3 and len(set(codes)) == 1
+
+
+class _BrokenExecutor:
+    """Executor stand-in whose jobs all fail as if a worker had died."""
+
+    def __init__(self) -> None:
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        from concurrent.futures import Future
+        from concurrent.futures.process import BrokenProcessPool
+
+        fut: Future = Future()
+        fut.set_exception(BrokenProcessPool("worker died"))
+        return fut
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def test_broken_pool_is_replaced_once():
+    from concurrent.futures.process import BrokenProcessPool
+
+    pool = DecodePool(max_workers=1)
+    broken = pool._executor = _BrokenExecutor()
+    replacements: list[object] = []
+
+    def _new_executor():
+        replacements.append(object())
+        return replacements[-1]
+
+    pool._new_executor = _new_executor
+
+    async def scenario():
+        return await asyncio.gather(*(pool.run(operator.add, 1, 2) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, BrokenProcessPool) for r in results)
+    # three jobs failed with the same pool: one replacement, and the dead pool is shut down
+    assert len(replacements) == 1 and pool._executor is replacements[0]
+    assert broken.shut_down
+
+
+class _RangeDecoder:
+    """Page-range decoder stand-in that must not be asked to count pages."""
+
+    class settings:
+        @staticmethod
+        def code_limit():
+            return None
+
+    def count_pages(self, source):
+        raise AssertionError("page count was already known")
+
+    def plan_page_ranges(self, n_pages):
+        return [(0, 2), (2, n_pages)]
+
+    def extract_page_range(self, source, start, stop=None, report=None, deadline=None):
+        return [f"p{i}" for i in range(start, stop)]
+
+
+def test_page_ranges_reuse_a_known_page_count():
+    pool = DecodePool(max_workers=1)
+    codes, _ = asyncio.run(pool.run_page_ranges(_RangeDecoder(), b"%PDF", n_pages=3))
+    assert codes == ["p0", "p1", "p2"]
+
+
+def test_in_process_pdfium_calls_are_serialized_with_fallback_jobs():
+    import threading
+    import time
+
+    from qrparser.services.decoding import page_summary
+
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def pdfium_call(*_args):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return {"pages_total": 1, "pages_skipped": 0}
+
+    class Target:
+        settings = None
+        page_summary = staticmethod(pdfium_call)
+
+    pool = DecodePool(max_workers=1)  # not started: jobs run in threads of this process
+
+    async def scenario():
+        await asyncio.gather(
+            *(page_summary(Target(), b"%PDF") for _ in range(4)),
+            *(pool.run(pdfium_call) for _ in range(4)),
+        )
+
+    asyncio.run(scenario())
+    assert peak == 1
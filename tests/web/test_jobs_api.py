@@ -0,0 +1,146 @@
+# comments in English only
+from __future__ import annotations
+
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from qrparser.config.settings import reset_settings_cache
+from qrparser.core.decode_settings import DecodeSettings
+from qrparser.web.main import create_app
+from qrparser.web.dependencies import get_job_queue, get_pixel_budget
+from qrparser.services.jobs import JobQueueFull
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "test2.pdf"
+
+
+def _wait(client: TestClient, job_id: str) -> dict:
+    for _ in range(200):
+        data = client.get(f"/v1/jobs/{job_id}").json()
+        if data["status"] in ("done", "failed"):
+            return data
+        time.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+
+def test_submit_and_poll(client_ok):
+    with client_ok as client:
+        resp = client.post("/v1/jobs", files={"file": ("a.pdf", b"%PDF-1.4\nok", "application/pdf")})
+        assert resp.status_code == 202, resp.text
+        job = resp.json()
+        assert job["status"] in ("queued", "running", "done")
+        assert resp.headers["Location"] == f"/v1/jobs/{job['job_id']}"
+
+        data = _wait(client, job["job_id"])
+        assert data["status"] == "done"
+        assert data["codes"] == ["QR123", "https://example.com/x"]
+        assert data["file_name"] == "a.pdf"
+        assert data["finished_at"] >= data["created_at"]
+
+
+def test_failed_job_reports_error(client_fail):
+    with client_fail as client:
+        resp = client.post("/v1/jobs", files={"file": ("a.pdf", b"%PDF-1.4\nbad", "application/pdf")})
+        data = _wait(client, resp.json()["job_id"])
+        assert data["status"] == "failed"
+        assert data["error"] == "Invalid or unreadable PDF"
+
+
+def test_unknown_job_is_404(client_ok):
+    with client_ok as client:
+        resp = client.get("/v1/jobs/nope")
+        assert resp.status_code == 404
+        assert resp.json()["detail"] == "Job not found"
+
+
+def test_submit_validation(client_ok):
+    with client_ok as client:
+        resp = client.post("/v1/jobs", files={"file": ("n.txt", b"hi", "text/plain")})
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Unsupported file type"
+
+        resp = client.post(
+            "/v1/jobs",
+            files={"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")},
+            data={"callback_url": "http://hook.local/x"},
+        )
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Callbacks are disabled"
+
+
+class FullQueue:
+    def submit(self, *args, **kwargs):
+        raise JobQueueFull()
+
+
+def test_full_queue_returns_503(client_ok):
+    with client_ok as client:
+        client.app.dependency_overrides[get_job_queue] = lambda: FullQueue()
+        resp = client.post("/v1/jobs", files={"file": ("a.pdf", b"%PDF-1.4\nok", "application/pdf")})
+        assert resp.status_code == 503
+        assert resp.headers["Retry-After"] == "2"  # QR_ADMISSION_RETRY_AFTER_SECONDS
+        assert resp.json()["detail"] == "Job queue is full, retry later"
+
+
+@pytest.mark.integration
+def test_job_with_real_decoder():
+    if not FIXTURE.exists():
+        pytest.skip("Fixture tests/fixtures/test2.pdf is missing")
+    with TestClient(create_app()) as client:
+        resp = client.post("/v1/jobs", files={"file": ("test2.pdf", FIXTURE.read_bytes(), "application/pdf")})
+        data = _wait(client, resp.json()["job_id"])
+        assert data["status"] == "done"
+        assert len(data["codes"]) == 1
+
+
+class RecordingBudget:
+    """Pixel budget stand-in that records how long callers are willing to wait."""
+
+    def __init__(self) -> None:
+        self.waits: list[float | None] = []
+
+    @asynccontextmanager
+    async def reserve(self, cost, max_wait=None):
+        self.waits.append(max_wait)
+        yield cost
+
+
+class EstimatingDecoder:
+    settings = DecodeSettings()
+
+    def extract_from_bytes(self, data, mime):
+        return ["JOB-QR"]
+
+    @staticmethod
+    def estimate_megapixels(source, settings):
+        return 10.0
+
+
+def test_jobs_go_through_the_pixel_budget_with_a_long_wait(monkeypatch, make_client):
+    monkeypatch.setenv("QR_JOBS_BUDGET_WAIT_SECONDS", "120")
+    reset_settings_cache()
+    budget = RecordingBudget()
+    client = make_client(EstimatingDecoder())
+    client.app.dependency_overrides[get_pixel_budget] = lambda: budget
+    with client:
+        resp = client.post("/v1/jobs", files={"file": ("a.pdf", b"%PDF-1.4\nok", "application/pdf")})
+        assert _wait(client, resp.json()["job_id"])["status"] == "done"
+
+    assert budget.waits == [120.0]
+
+
+class CrashedPoolDecoder:
+    def extract_from_bytes(self, data, mime):
+        from concurrent.futures.process import BrokenProcessPool
+        raise BrokenProcessPool("worker died")
+
+
+def test_lost_worker_fails_the_job_as_busy_not_unreadable(make_client):
+    with make_client(CrashedPoolDecoder()) as client:
+        resp = client.post("/v1/jobs", files={"file": ("a.pdf", b"%PDF-1.4\nok", "application/pdf")})
+        data = _wait(client, resp.json()["job_id"])
+    assert data["status"] == "failed"
+    assert data["error"] == "Server is busy, retry later"
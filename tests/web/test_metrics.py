@@ -0,0 +1,66 @@
+# comments in English only
+from __future__ import annotations
+
+import pytest
+
+from qrparser.config.settings import reset_settings_cache
+from qrparser.core.report import DecodeReport
+
+pytest.importorskip("prometheus_client")
+
+
+class ReportingDecoder:
+    """Fake decoder that fills the report like the real ones do."""
+
+    def extract_from_bytes(self, data, mime, report=None):
+        report.pages += 2
+        report.render_ms += 5.0
+        report.decode_ms += 3.0
+        report.fallback_pages += 1
+        report.fallback_hits += 1
+        report.fallback_ms += 4.0
+        return [f"CODE-{len(data)}"]
+
+
+def _sample(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_metrics_endpoint_is_off_by_default(make_client):
+    client = make_client(ReportingDecoder())
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_count_requests_and_stages(monkeypatch, make_client):
+    monkeypatch.setenv("QR_ENABLE_PROMETHEUS", "true")
+    monkeypatch.setenv("QR_CACHE_ENABLED", "false")
+    reset_settings_cache()
+    client = make_client(ReportingDecoder())
+    ok = 'qrparser_requests_total{endpoint="/v1/parse",mime="application/pdf",status="200"}'
+    bad = 'qrparser_requests_total{endpoint="/v1/parse",mime="other",status="400"}'
+    before = client.get("/metrics").text
+
+    assert client.post("/v1/parse", files={"file": ("a.pdf", b"%PDF-1.4\nx", "application/pdf")}).status_code == 200
+    assert client.post("/v1/parse", files={"file": ("a.txt", b"x", "text/plain")}).status_code == 400
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    after = res.text
+    assert _sample(after, ok) == _sample(before, ok) + 1
+    assert _sample(after, bad) == _sample(before, bad) + 1
+    for name in ("qrparser_pages_processed_total", "qrparser_fallback_hits_total"):
+        assert _sample(after, name) >= _sample(before, name) + 1
+    for name in ("render", "zxing_decode", "fallback", "upload_read"):
+        assert f"qrparser_{name}_seconds_count" in after
+    assert "qrparser_pool_queue_depth" in after
+    assert "qrparser_decodes_in_flight" in after
+
+
+def test_report_merge_sums_stage_timings():
+    a = DecodeReport(pages=1, render_ms=2.0, decode_ms=1.0, fallback_pages=1, fallback_ms=3.0)
+    a.merge(DecodeReport(pages=1, render_ms=1.0, fallback_pages=1, fallback_hits=1))
+    assert (a.pages, a.render_ms, a.decode_ms) == (2, 3.0, 1.0)
+    assert (a.fallback_pages, a.fallback_hits, a.fallback_ms) == (2, 1, 3.0)
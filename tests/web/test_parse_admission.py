@@ -0,0 +1,93 @@
+# comments in English only
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+
+from qrparser.config.settings import reset_settings_cache
+from qrparser.core.decode_settings import DecodeSettings
+from qrparser.services.decode_pool import DecodePool
+from qrparser.web.dependencies import get_decode_pool
+
+
+class SlowDecoder:
+    """Fake decoder that keeps its admission slot busy for a while."""
+
+    def extract_from_bytes(self, data, mime):
+        time.sleep(0.3)
+        return ["SLOW-QR"]
+
+
+class HeavyDecoder(SlowDecoder):
+    """Fake decoder whose every upload is estimated at 100 megapixels."""
+    settings = DecodeSettings()
+
+    @staticmethod
+    def estimate_megapixels(source, settings):
+        return 100.0
+
+
+class OffProcessPool(DecodePool):
+    """Decodes in plain threads: like worker processes, they hold no pdfium lock of this process."""
+
+    async def run(self, fn, /, *args):
+        return await asyncio.to_thread(fn, *args)
+
+
+def _burst(app, n: int) -> list[httpx.Response]:
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post(
+                    "/v1/parse",
+                    # distinct bytes, so in-flight coalescing does not merge them
+                    files={"file": (f"{i}.pdf", f"%PDF-1.4\n{i}".encode(), "application/pdf")},
+                )
+                for i in range(n)
+            ))
+
+    return asyncio.run(scenario())
+
+
+def test_overflow_gets_503_with_retry_after(monkeypatch, make_client):
+    monkeypatch.setenv("QR_CONCURRENCY", "1")
+    monkeypatch.setenv("QR_ADMISSION_QUEUE_PER_WORKER", "0")
+    monkeypatch.setenv("QR_ADMISSION_RETRY_AFTER_SECONDS", "7")
+    reset_settings_cache()
+
+    app = make_client(SlowDecoder()).app
+    responses = _burst(app, 3)
+
+    assert sorted(r.status_code for r in responses) == [200, 503, 503]
+    busy = [r for r in responses if r.status_code == 503]
+    assert all(r.headers["Retry-After"] == "7" for r in busy)
+    assert all(r.json()["detail"] == "Server is busy, retry later" for r in busy)
+    assert app.state.admission.running == 0
+
+
+def test_queued_requests_are_served_when_admission_disabled(monkeypatch, make_client):
+    monkeypatch.setenv("QR_CONCURRENCY", "1")
+    monkeypatch.setenv("QR_ADMISSION_ENABLED", "false")
+    reset_settings_cache()
+
+    app = make_client(SlowDecoder()).app
+    assert app.state.admission is None
+    assert [r.status_code for r in _burst(app, 3)] == [200] * 3
+
+
+def test_megapixel_budget_rejects_what_does_not_fit_in_time(monkeypatch, make_client):
+    monkeypatch.setenv("QR_ADMISSION_MEGAPIXELS", "150")
+    monkeypatch.setenv("QR_ADMISSION_MAX_WAIT_SECONDS", "0.05")
+    reset_settings_cache()
+
+    app = make_client(HeavyDecoder()).app
+    app.dependency_overrides[get_decode_pool] = lambda: OffProcessPool(max_workers=2)
+    responses = _burst(app, 2)  # both pass the request gate, only one fits the budget
+
+    assert sorted(r.status_code for r in responses) == [200, 503]
+    busy = next(r for r in responses if r.status_code == 503)
+    assert busy.headers["Retry-After"] == "2"
+    assert app.state.pixel_budget.in_flight == 0
@@ -0,0 +1,105 @@
+# comments in English only
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from qrparser.config.settings import reset_settings_cache
+from qrparser.web.main import create_app
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "test2.pdf"
+
+
+def test_batch_reports_per_file_results_and_errors(client_ok: TestClient):
+    files = [
+        ("files", ("a.pdf", b"%PDF-1.4\na", "application/pdf")),
+        ("files", ("note.txt", b"hello", "text/plain")),
+        ("files", ("b.pdf", b"%PDF-1.4\nb", "application/pdf")),
+    ]
+    resp = client_ok.post("/v1/parse/batch", files=files, headers={"X-Request-ID": "batch-1"})
+
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert data["request_id"] == "batch-1"
+    assert [r["index"] for r in data["results"]] == [0, 1, 2]
+    assert [r["file_name"] for r in data["results"]] == ["a.pdf", "note.txt", "b.pdf"]
+    assert data["results"][0]["codes"] == ["QR123", "https://example.com/x"]
+    assert data["results"][1] == {
+        "index": 1, "file_name": "note.txt", "codes": [], "error": "Unsupported file type", "partial": False,
+    }
+    assert data["results"][2]["error"] is None
+
+
+def test_batch_decode_failure_is_per_file(client_fail: TestClient):
+    files = [("files", ("a.pdf", b"%PDF-1.4\na", "application/pdf"))]
+    resp = client_fail.post("/v1/parse/batch", files=files)
+
+    assert resp.status_code == 200
+    assert resp.json()["results"][0]["error"] == "Invalid or unreadable PDF"
+
+
+def test_batch_per_file_size_limit(monkeypatch, client_ok_factory):
+    monkeypatch.setenv("QR_MAX_FILE_SIZE_MB_IMG", "1")
+    reset_settings_cache()
+    client = client_ok_factory()
+
+    files = [
+        ("files", ("big.png", b"0" * (1024 * 1024 + 1), "image/png")),
+        ("files", ("a.pdf", b"%PDF-1.4\na", "application/pdf")),
+    ]
+    resp = client.post("/v1/parse/batch", files=files)
+
+    assert resp.status_code == 200
+    big, ok = resp.json()["results"]
+    assert big["error"] == "File too large for image. Max size is 1 MB"
+    assert ok["error"] is None
+
+
+def test_batch_rejects_too_many_files(monkeypatch, client_ok_factory):
+    monkeypatch.setenv("QR_BATCH_MAX_FILES", "2")
+    reset_settings_cache()
+    client = client_ok_factory()
+
+    files = [("files", (f"{i}.pdf", b"%PDF-1.4\n", "application/pdf")) for i in range(3)]
+    resp = client.post("/v1/parse/batch", files=files)
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Too many files. Max is 2"
+
+
+def test_batch_total_size_cap(monkeypatch, client_ok_factory):
+    monkeypatch.setenv("QR_BATCH_MAX_TOTAL_MB", "1")
+    reset_settings_cache()
+    client = client_ok_factory()
+
+    half = b"%PDF-1.4\n" + b"0" * (600 * 1024)
+    files = [("files", (f"{i}.pdf", half, "application/pdf")) for i in range(2)]
+    resp = client.post("/v1/parse/batch", files=files)
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Batch too large. Max total size is 1 MB"
+
+
+@pytest.mark.integration
+def test_batch_page_cap_and_real_decode(monkeypatch, tmp_path: Path, make_multipage_pdf):
+    if not FIXTURE.exists():
+        pytest.skip("Fixture tests/fixtures/test2.pdf is missing")
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=3).read_bytes()
+
+    with TestClient(create_app()) as client:
+        files = [
+            ("files", ("one.pdf", FIXTURE.read_bytes(), "application/pdf")),
+            ("files", ("three.pdf", pdf, "application/pdf")),
+        ]
+        resp = client.post("/v1/parse/batch", files=files)
+        assert resp.status_code == 200, resp.text
+        assert [len(r["codes"]) for r in resp.json()["results"]] == [1, 3]
+
+    monkeypatch.setenv("QR_BATCH_MAX_PAGES", "3")
+    reset_settings_cache()
+    with TestClient(create_app()) as client:
+        resp = client.post("/v1/parse/batch", files=files)
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Batch too large. Max total is 3 pages"
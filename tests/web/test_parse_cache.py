@@ -0,0 +1,45 @@
+# comments in English only
+from __future__ import annotations
+
+import json
+
+from qrparser.config.settings import reset_settings_cache
+
+
+class CountingDecoder:
+    """Fake decoder that counts how often it actually decodes."""
+    calls = 0
+
+    def extract_from_bytes(self, data, mime):
+        CountingDecoder.calls += 1
+        return [f"CODE-{len(data)}"]
+
+
+def test_repeated_upload_is_served_from_cache(capsys, make_client):
+    CountingDecoder.calls = 0
+    client = make_client(CountingDecoder())
+    files = {"file": ("a.pdf", b"%PDF-1.4\nsame", "application/pdf")}
+
+    first = client.post("/v1/parse", files=files)
+    second = client.post("/v1/parse", files=files, headers={"X-Request-ID": "again"})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["codes"] == second.json()["codes"]
+    assert second.json()["request_id"] == "again"
+    assert CountingDecoder.calls == 1
+
+    lines = [json.loads(ln) for ln in capsys.readouterr().out.splitlines() if ln.startswith("{")]
+    ends = [e for e in lines if e.get("event") == "request_end"]
+    assert [e.get("cache") for e in ends[-2:]] == ["miss", "memory"]
+
+
+def test_cache_can_be_disabled(monkeypatch, make_client):
+    monkeypatch.setenv("QR_CACHE_ENABLED", "false")
+    reset_settings_cache()
+    CountingDecoder.calls = 0
+    client = make_client(CountingDecoder())
+    files = {"file": ("a.pdf", b"%PDF-1.4\nsame", "application/pdf")}
+
+    client.post("/v1/parse", files=files)
+    client.post("/v1/parse", files=files)
+    assert CountingDecoder.calls == 2
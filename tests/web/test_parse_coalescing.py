@@ -0,0 +1,46 @@
+# comments in English only
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+
+from qrparser.config.settings import reset_settings_cache
+
+
+class SlowDecoder:
+    """Fake decoder that takes a while and counts real decodes."""
+    calls = 0
+
+    def extract_from_bytes(self, data, mime):
+        SlowDecoder.calls += 1
+        time.sleep(0.2)
+        return ["SLOW-QR"]
+
+
+def test_concurrent_identical_uploads_decode_once(monkeypatch, make_client):
+    # disable the result cache so only in-flight coalescing can dedupe
+    monkeypatch.setenv("QR_CACHE_ENABLED", "false")
+    reset_settings_cache()
+    SlowDecoder.calls = 0
+
+    app = make_client(SlowDecoder()).app
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post(
+                    "/v1/parse",
+                    files={"file": ("dup.pdf", b"%PDF-1.4\ndup", "application/pdf")},
+                    headers={"X-Request-ID": f"dup-{i}"},
+                )
+                for i in range(4)
+            ))
+
+    responses = asyncio.run(scenario())
+    assert [r.status_code for r in responses] == [200] * 4
+    assert [r.json()["request_id"] for r in responses] == [f"dup-{i}" for i in range(4)]
+    assert all(r.json()["codes"] == ["SLOW-QR"] for r in responses)
+    assert SlowDecoder.calls == 1
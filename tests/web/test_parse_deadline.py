@@ -0,0 +1,97 @@
+# comments in English only
+from __future__ import annotations
+
+import time
+
+from qrparser.config.settings import reset_settings_cache
+
+
+class DeadlineDecoder:
+    """Fake decoder that records the deadline it got and reports a cut-short run when told to."""
+    calls = 0
+    last_deadline = None
+    expire = True
+
+    def extract_from_bytes(self, data, mime, report=None, deadline=None):
+        DeadlineDecoder.calls += 1
+        DeadlineDecoder.last_deadline = deadline
+        if DeadlineDecoder.expire:
+            report.deadline_exceeded = True
+        return ["FIRST"]
+
+
+def test_partial_result_is_flagged_and_not_cached(make_client):
+    DeadlineDecoder.calls, DeadlineDecoder.expire = 0, True
+    client = make_client(DeadlineDecoder())
+    files = {"file": ("a.pdf", b"%PDF-1.4\npartial", "application/pdf")}
+
+    for _ in range(2):
+        res = client.post("/v1/parse", files=files)
+        assert res.status_code == 200
+        assert res.json()["codes"] == ["FIRST"]
+        assert res.json()["partial"] is True
+    assert DeadlineDecoder.calls == 2  # partial results never come from the cache
+
+
+def test_deadline_from_query_header_and_cap(monkeypatch, make_client):
+    monkeypatch.setenv("QR_DEADLINE_MAX_SECONDS", "10")
+    reset_settings_cache()
+    DeadlineDecoder.expire = False
+    client = make_client(DeadlineDecoder())
+
+    def deadline_for(**kwargs) -> float:
+        files = {"file": ("a.pdf", f"%PDF-1.4\n{time.time()}".encode(), "application/pdf")}
+        t0 = time.time()
+        res = client.post("/v1/parse", files=files, **kwargs)
+        assert res.status_code == 200 and res.json()["partial"] is False
+        return DeadlineDecoder.last_deadline - t0
+
+    assert 1 < deadline_for(params={"timeout": "2"}) <= 2.5
+    assert 2 < deadline_for(headers={"X-Request-Timeout": "3"}) <= 3.5
+    assert 9 < deadline_for(params={"timeout": "500"}) <= 10.5
+    assert client.post(
+        "/v1/parse", params={"timeout": "-1"}, files={"file": ("a.pdf", b"%PDF", "application/pdf")}
+    ).status_code == 422
+
+
+class SlowDeadlineDecoder:
+    """Fake decoder that takes 0.1 s and reports a cut-short run past its deadline."""
+    calls = 0
+
+    def extract_from_bytes(self, data, mime, report=None, deadline=None):
+        SlowDeadlineDecoder.calls += 1
+        time.sleep(0.1)
+        if deadline is not None and time.time() > deadline:
+            report.deadline_exceeded = True
+        return ["SLOW"]
+
+
+def test_waiter_with_time_left_does_not_inherit_a_partial_result():
+    import asyncio
+
+    from qrparser.core.decode_settings import DecodeSettings
+    from qrparser.services.decode_pool import DecodePool
+    from qrparser.services.decoding import decode_content
+    from qrparser.services.result_cache import ResultCache
+    from qrparser.services.single_flight import SingleFlight
+
+    SlowDeadlineDecoder.calls = 0
+    cache, inflight, pool = ResultCache(), SingleFlight(), DecodePool(max_workers=1)
+
+    def call(deadline: float):
+        return decode_content(
+            b"%PDF-1.4\nshared", "application/pdf", SlowDeadlineDecoder(), DecodeSettings(),
+            pool, cache, inflight, deadline,
+        )
+
+    async def scenario():
+        leader = asyncio.create_task(call(time.time() + 0.05))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(call(time.time() + 60))
+        return await leader, await waiter
+
+    (_, leader_log), (codes, waiter_log) = asyncio.run(scenario())
+    assert leader_log["partial"] is True
+    assert waiter_log["partial"] is False and codes == ["SLOW"]
+    assert SlowDeadlineDecoder.calls == 2
+    assert cache.stats()["cache_entries"] == 1  # only the complete run was stored
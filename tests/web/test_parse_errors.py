@@ -18,3 +18,32 @@ def test_parse_handles_decoder_failure_as_400(client_fail: TestClient, tmp_path:
         "Invalid PDF",
         "Invalid or unreadable file",
     }
+
+
+class CrashedPoolDecoder:
+    """Fake decoder whose worker process dies mid-decode."""
+    def extract_from_pdf(self, path: Path | str):
+        from concurrent.futures.process import BrokenProcessPool
+        raise BrokenProcessPool("worker died")
+
+
+def test_crashed_worker_is_503_not_400(monkeypatch):
+    from qrparser.config.settings import reset_settings_cache
+    from qrparser.web.dependencies import get_decoder
+    from qrparser.web.main import create_app
+
+    monkeypatch.setenv("QR_ADMISSION_RETRY_AFTER_SECONDS", "3")
+    reset_settings_cache()
+    app = create_app()
+    app.dependency_overrides[get_decoder] = lambda: CrashedPoolDecoder()
+    client = TestClient(app)
+    files = {"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")}
+
+    resp = client.post("/v1/parse", files=files)
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "3"
+
+    resp = client.post("/v1/parse/batch", files=[("files", ("a.pdf", b"%PDF-1.4\n", "application/pdf"))])
+    assert resp.status_code == 200
+    assert resp.json()["results"][0]["error"] == "Server is busy, retry later"
+    assert resp.headers["Retry-After"] == "3"
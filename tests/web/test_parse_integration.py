@@ -60,3 +60,38 @@ def test_parse_integration_with_corrupted_pdf_returns_400():
 
     # Server must still supply a request id in the response headers
     assert "X-Request-ID" in resp.headers and resp.headers["X-Request-ID"]
+
+
+@pytest.mark.integration
+def test_parse_integration_stop_after_first(tmp_path: Path, make_multipage_pdf):
+    """Early exit: a 3-page PDF with a code on every page yields exactly one code."""
+    client = make_client()
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=3)
+
+    files = {"file": ("multi.pdf", pdf.read_bytes(), "application/pdf")}
+    resp = client.post("/v1/parse", params={"stop_after_first": "true"}, files=files)
+
+    assert resp.status_code == 200, resp.text
+    assert len(resp.json()["codes"]) == 1
+
+
+@pytest.mark.integration
+def test_parse_integration_pages_and_max_pages(tmp_path: Path, make_multipage_pdf, monkeypatch):
+    """Page selection and QR_MAX_PAGES: skipped pages are reported, not decoded."""
+    from qrparser.config.settings import reset_settings_cache
+
+    monkeypatch.setenv("QR_MAX_PAGES", "2")
+    reset_settings_cache()
+    client = make_client()
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=4)
+    files = {"file": ("multi.pdf", pdf.read_bytes(), "application/pdf")}
+
+    capped = client.post("/v1/parse", files=files).json()
+    assert len(capped["codes"]) == 2
+    assert (capped["pages_total"], capped["pages_skipped"]) == (4, 2)
+
+    picked = client.post("/v1/parse", params={"pages": "last"}, files=files).json()
+    assert len(picked["codes"]) == 1
+    assert picked["pages_skipped"] == 3
+
+    assert client.post("/v1/parse", params={"pages": "3-1"}, files=files).status_code == 400
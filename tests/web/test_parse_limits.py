@@ -38,3 +38,49 @@ def test_parse_allows_file_at_size_limit(tmp_path: Path, monkeypatch, client_ok_
     body = resp.json()
     assert resp.headers.get("X-Request-ID")
     assert "codes" in body
+
+
+def _multipart(content: bytes, boundary: str = "qrboundary") -> bytes:
+    head = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="big.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode()
+    return head + content + f"\r\n--{boundary}--\r\n".encode()
+
+
+def test_parse_rejects_by_content_length_before_reading(monkeypatch, client_ok_factory):
+    monkeypatch.setenv("QR_MAX_FILE_SIZE_MB_PDF", "1")
+    monkeypatch.setenv("QR_MAX_FILE_SIZE_MB_IMG", "1")
+    reset_settings_cache()
+
+    client: TestClient = client_ok_factory()
+    content = b"%PDF-1.7\n" + b"0" * (2 * 1024 * 1024)
+    files = {"file": ("big.pdf", content, "application/pdf")}
+
+    resp = client.post("/v1/parse", files=files)
+    assert resp.status_code == 413
+    assert resp.json()["detail"] == "Request body too large. Max size is 1 MB"
+    assert resp.headers.get("X-Request-ID")
+
+
+def test_parse_rejects_chunked_body_over_limit(monkeypatch, client_ok_factory):
+    monkeypatch.setenv("QR_MAX_FILE_SIZE_MB_PDF", "1")
+    monkeypatch.setenv("QR_MAX_FILE_SIZE_MB_IMG", "1")
+    reset_settings_cache()
+
+    client: TestClient = client_ok_factory()
+    body = _multipart(b"%PDF-1.7\n" + b"0" * (2 * 1024 * 1024))
+
+    def stream():
+        # no Content-Length: the body arrives in pieces
+        for i in range(0, len(body), 256 * 1024):
+            yield body[i:i + 256 * 1024]
+
+    resp = client.post(
+        "/v1/parse",
+        content=stream(),
+        headers={"Content-Type": "multipart/form-data; boundary=qrboundary"},
+    )
+    assert resp.status_code == 413
+    assert resp.json()["detail"] == "Request body too large. Max size is 1 MB"
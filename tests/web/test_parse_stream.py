@@ -0,0 +1,78 @@
+# comments in English only
+from __future__ import annotations
+
+import json
+from contextlib import nullcontext
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from qrparser.config.settings import reset_settings_cache
+from qrparser.web.main import create_app
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+def _lines(resp) -> list[dict]:
+    return [json.loads(line) for line in resp.text.splitlines() if line]
+
+
+@pytest.mark.parametrize("lifespan", [False, True], ids=["thread", "pool"])
+def test_stream_emits_one_line_per_page_then_summary(tmp_path: Path, make_multipage_pdf, lifespan):
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=3).read_bytes()
+    client = TestClient(create_app())
+    # with lifespan the pool runs worker processes; without it jobs run in a thread
+    with client if lifespan else nullcontext():
+        resp = client.post(
+            "/v1/parse", files={"file": ("multi.pdf", pdf, "application/pdf")},
+            headers={**NDJSON, "X-Request-ID": "s-1"},
+        )
+
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = _lines(resp)
+    pages, summary = lines[:-1], lines[-1]
+    assert [p["type"] for p in pages] == ["page"] * 3
+    assert [p["page"] for p in pages] == [0, 1, 2]
+    assert all(len(p["codes"]) == 1 and p["duration_ms"] >= 0 for p in pages)
+    assert summary["type"] == "summary"
+    assert summary["request_id"] == "s-1"
+    assert summary["pages"] == 3
+    assert summary["codes"] == [c for p in pages for c in p["codes"]]
+    assert summary["cached"] is False
+
+
+def test_stream_honours_max_codes_and_cache(tmp_path: Path, make_multipage_pdf):
+    pdf = make_multipage_pdf(tmp_path / "multi.pdf", copies=4).read_bytes()
+    client = TestClient(create_app())
+    files = {"file": ("multi.pdf", pdf, "application/pdf")}
+
+    lines = _lines(client.post("/v1/parse", params={"max_codes": 1}, files=files, headers=NDJSON))
+    assert [line["type"] for line in lines] == ["page", "summary"]
+    assert len(lines[-1]["codes"]) == 1
+
+    again = _lines(client.post("/v1/parse", params={"max_codes": 1}, files=files, headers=NDJSON))
+    assert again == [{**again[0], "type": "summary", "cached": True}]
+    assert again[0]["codes"] == lines[-1]["codes"]
+
+
+def test_stream_invalid_pdf_is_400(monkeypatch):
+    monkeypatch.setenv("QR_CACHE_ENABLED", "false")
+    reset_settings_cache()
+    client = TestClient(create_app())
+    resp = client.post(
+        "/v1/parse", files={"file": ("bad.pdf", b"%PDF-1.4\nnot really", "application/pdf")}, headers=NDJSON
+    )
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Invalid or unreadable PDF"
+
+
+def test_stream_image_is_a_single_page(make_qr_image):
+    client = TestClient(create_app())
+    resp = client.post(
+        "/v1/parse", files={"file": ("qr.png", make_qr_image("STREAM-IMG"), "image/png")}, headers=NDJSON
+    )
+    lines = _lines(resp)
+    assert [line["type"] for line in lines] == ["page", "summary"]
+    assert lines[0]["codes"] == ["STREAM-IMG"]
@@ -30,3 +30,22 @@ def test_parse_generates_request_id_when_header_missing(client_ok: TestClient, t
     assert resp.status_code == 200
     assert "X-Request-ID" in resp.headers
     assert resp.json()["request_id"] == resp.headers["X-Request-ID"]
+
+
+def test_decode_report_only_with_debug_enabled(client_ok_factory, monkeypatch, tmp_path: Path, make_pdf):
+    from qrparser.config.settings import reset_settings_cache
+
+    pdf_path = tmp_path / "dbg.pdf"
+    make_pdf(pdf_path, extra_bytes=7)
+    files = {"file": ("dbg.pdf", pdf_path.read_bytes(), "application/pdf")}
+
+    client = client_ok_factory()
+    assert "report" not in client.post("/v1/parse?debug=true", files=files).json()
+
+    monkeypatch.setenv("QR_DEBUG", "true")
+    reset_settings_cache()
+    client = client_ok_factory()
+    assert "report" not in client.post("/v1/parse", files=files).json()
+    report = client.post("/v1/parse?debug=true", files=files).json()["report"]
+    assert report["codes_found"] == 2
+    assert "cache" in report
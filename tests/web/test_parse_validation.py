@@ -10,3 +10,19 @@ def test_parse_rejects_unsupported_content_type(client_ok: TestClient):
 
     assert resp.status_code == 400
     assert resp.json()["detail"] == "Unsupported file type"
+
+
+def test_parse_rejects_invalid_scales(client_ok: TestClient):
+    files = {"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")}
+    for bad in ("abc", "0.01", "1,,99"):
+        resp = client_ok.post("/v1/parse", params={"scales": bad}, files=files)
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Invalid scales"
+
+
+def test_parse_rejects_invalid_formats(client_ok: TestClient):
+    files = {"file": ("a.pdf", b"%PDF-1.4\n", "application/pdf")}
+    resp = client_ok.post("/v1/parse", params={"formats": "QRCode,NotAFormat"}, files=files)
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Invalid formats"
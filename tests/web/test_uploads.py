@@ -0,0 +1,35 @@
+# comments in English only
+from __future__ import annotations
+
+import asyncio
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from qrparser.web.uploads import UploadTooLarge, read_upload_limited
+
+
+def _upload(data: bytes, size: int | None) -> UploadFile:
+    return UploadFile(io.BytesIO(data), size=size, filename="x.bin")
+
+
+def test_reads_in_chunks_up_to_limit():
+    data = b"a" * 1000
+    out = asyncio.run(read_upload_limited(_upload(data, None), max_bytes=1000, chunk_size=64))
+    assert out == data
+
+
+def test_stops_as_soon_as_limit_is_crossed():
+    up = _upload(b"a" * 1000, None)
+    with pytest.raises(UploadTooLarge) as exc:
+        asyncio.run(read_upload_limited(up, max_bytes=100, chunk_size=64))
+    # aborted after the second chunk, not after reading everything
+    assert exc.value.seen_bytes == 128
+
+
+def test_known_size_rejects_without_reading():
+    up = _upload(b"a" * 1000, 1000)
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(read_upload_limited(up, max_bytes=100))
+    assert up.file.tell() == 0